@@ -5,7 +5,10 @@ from enum import Enum
 
 class WorkloadGeneratorAction(Enum):
     FIX_PAGE = 1,
-    UNFIX_PAGE = 2
+    UNFIX_PAGE = 2,
+    # The page id of batch actions is a list of page ids
+    FIX_PAGES = 3,
+    UNFIX_PAGES = 4
 
 
 class RequestType(Enum):
@@ -0,0 +1,132 @@
+import sys
+import os
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+
+import asyncio
+import pandas as pd
+from typing import Dict
+
+from src.benchmark.abstract_benchmark import AbstractBenchmark
+from src.buffer.buffer_manager import BufferManager
+from src.buffer.buffer_frame import BufferFrame
+from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
+from src.buffer.dummy_file_manager import DummyFileManager
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.random_replacer import RandomReplacer
+from src.buffer.replacement.two_q_replacer import TwoQReplacer
+from src.buffer.replacement.lru_replacer import LRUReplacer
+from src.buffer.replacement.cfdc_replacer import CFDCReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
+from src.buffer.metric_collector import Metric, MetricCollector
+from src.util.constants import BENCHMARK_DATA_FOLDER
+from src.benchmark.abstract_workload_generator import WorkloadGeneratorAction
+from src.benchmark.eva_trace_workload_generator import EvaTraceWorkloadGenerator
+
+VIDEO_PAGE_SIZE = 4 * 2 ** 20
+DATA_FOLDER = "data/eva_benchmark/"
+# Video files grow by this many bytes at a time
+EXTENT_SIZE = 64 * 2 ** 20
+WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
+TOTAL_REQUESTS = 100000
+
+"""EVA trace benchmark where every worker is a coroutine on one event loop
+using the async fix/unfix API, instead of interleaving the workers on one
+thread. Run trace_benchmark.setup() once to create the data files.
+"""
+class AsyncEvaBenchmark(AbstractBenchmark):
+    def __init__(self, repetitions, frame_count, replacer, metric_collector, read_ratio, num_workers):
+        super().__init__(repetitions=repetitions)
+        self._metric_collector = metric_collector
+        self._frame_count = frame_count
+        self._replacer = replacer
+        self._frame_size = VIDEO_PAGE_SIZE
+        self._num_workers = num_workers
+        self._read_ratio = read_ratio
+
+    def _setUp(self):
+        self._metric_collector.reset()
+        if WITH_TIMING:
+            self._file_manager = FILE_MANAGER(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER, extent_size = EXTENT_SIZE)
+        else:
+            self._file_manager = DummyFileManager(page_size=VIDEO_PAGE_SIZE)
+        self._buffer_manager = BufferManager(self._frame_count,
+                                             self._frame_size,
+                                             self._replacer(),
+                                             self._file_manager,
+                                             self._metric_collector)
+        self._workload_generator = EvaTraceWorkloadGenerator(total_requests=TOTAL_REQUESTS,
+                                                             read_ratio=self._read_ratio,
+                                                             num_workers=self._num_workers)
+
+    def _tearDown(self):
+        self._buffer_manager.close()
+
+    async def _fix_page(self, page_id: int, exclusive: bool) -> BufferFrame:
+        while True:
+            try:
+                return await self._buffer_manager.fix_page_async(page_id, exclusive)
+            except BufferFullError:
+                # All frames are pinned by other workers, wait for one of them
+                await asyncio.sleep(0)
+
+    async def _run_worker(self, worker_num: int):
+        frames: Dict[int, BufferFrame] = {}
+        while not self._workload_generator.trace_done():
+            action = self._workload_generator.peek_action(worker_num)
+            self._workload_generator.consume_action(worker_num)
+            if action[0] == WorkloadGeneratorAction.FIX_PAGE:
+                frames[action[1]] = await self._fix_page(action[1], action[2])
+            else:
+                await self._buffer_manager.unfix_page_async(frames.pop(action[1]), action[2])
+        # The trace may end in the middle of a scan
+        for frame in frames.values():
+            await self._buffer_manager.unfix_page_async(frame, False)
+
+    async def _run_workers(self):
+        await asyncio.gather(*[self._run_worker(i) for i in range(self._num_workers)])
+
+    def _run(self):
+        asyncio.run(self._run_workers())
+
+if __name__ == '__main__':
+    total_pages_needed = 4 * 212
+    relative_buffer_pool_size = 30
+    frame_count = int(total_pages_needed * relative_buffer_pool_size/100)
+    for read_ratio in [0.9]:
+        metrics_df = pd.DataFrame(columns=['algorithm', 'num_workers', 'num_hits', 'num_misses', 'num_accesses', 'num_dirty_evictions', 'num_evictions'])
+        for num_workers in [8, 32, 128, 512]:
+            print(f"Workers: {num_workers}")
+            replacers = [("Random", lambda: RandomReplacer(frame_count)),
+                        ("2Q", lambda: TwoQReplacer(frame_count)),
+                        ("LRU", lambda: LRUReplacer(frame_count)),
+                        ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=2)),
+                        ("ARC", lambda: ARCReplacer(frame_count)),
+                        ("CFLRU", lambda: CFLRUReplacer(frame_count)),
+                        ("LRU-WSR", lambda: LRUWSRReplacer(frame_count))]
+            for replacer in replacers:
+                metric_collector = MetricCollector()
+                benchmark = AsyncEvaBenchmark(2 if WITH_TIMING else 1, frame_count, replacer[1], metric_collector, read_ratio, num_workers)
+                benchmark.run_benchmark()
+
+                for measurement in benchmark.time_measurements:
+                    metrics_df = metrics_df.append({'algorithm': replacer[0],
+                                                    'num_workers': num_workers,
+                                                    'relative_buffer_pool_size': relative_buffer_pool_size,
+                                                    'num_hits': metric_collector.get_metric(Metric.BUFFER_MANAGER_HITS),
+                                                    'num_misses': metric_collector.get_metric(Metric.BUFFER_MANAGER_MISSES),
+                                                    'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
+                                                    'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
+                                                    'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                                                    'time': measurement,
+                                                    'throughput': TOTAL_REQUESTS / measurement,
+                                                    'fix_latency_p50': metric_collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 50),
+                                                    'fix_latency_p99': metric_collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 99),
+                                                    'fix_latency_p999': metric_collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 99.9)
+                                                    },
+                                                    ignore_index=True)
+                metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/async_trace.csv')
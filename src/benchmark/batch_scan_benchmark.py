@@ -0,0 +1,129 @@
+import sys
+import os
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+
+import pandas as pd
+from typing import Dict, List
+
+from src.benchmark.abstract_benchmark import AbstractBenchmark
+from src.buffer.buffer_manager import BufferManager
+from src.buffer.buffer_frame import BufferFrame
+from src.buffer.dummy_file_manager import DummyFileManager
+from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
+from src.buffer.replacement.two_q_replacer import TwoQReplacer
+from src.buffer.replacement.lru_replacer import LRUReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
+from src.buffer.metric_collector import Metric, MetricCollector
+from src.util.constants import BENCHMARK_DATA_FOLDER
+from src.benchmark.abstract_workload_generator import WorkloadGeneratorAction
+from src.benchmark.workload_generators import OHJWorkloadGenerator
+
+PAGE_SIZE = 4 * 2 ** 10
+DATA_FOLDER = "data/synthetic_benchmark/"
+WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
+
+"""Counts the acquisitions of the lock wrapped around a buffer pool's frame lock
+"""
+class CountingLock():
+    def __init__(self, lock):
+        self._lock = lock
+        self.acquisitions = 0
+
+    def __enter__(self):
+        self.acquisitions += 1
+        return self._lock.__enter__()
+
+    def __exit__(self, *args):
+        return self._lock.__exit__(*args)
+
+def count_file_manager_calls(file_manager: FileManager, calls: Dict[str, int]):
+    for name in ['read_block', 'read_blocks', 'write_block', 'write_blocks']:
+        method = getattr(file_manager, name)
+        def counted(*args, name=name, method=method):
+            calls[name] += 1
+            return method(*args)
+        setattr(file_manager, name, counted)
+
+"""Runs the OHJ workload with its 200 page scans fixed one page at a time or
+as one batch, and counts frame lock acquisitions and file manager calls.
+Run synthetic_benchmark.setup() once to create the data file.
+"""
+class BatchScanBenchmark(AbstractBenchmark):
+    def __init__(self, repetitions, frame_count, replacer, metric_collector, batch_scans):
+        super().__init__(repetitions=repetitions)
+        self._metric_collector = metric_collector
+        self._frame_count = frame_count
+        self._frame_size = PAGE_SIZE
+        self._replacer = replacer
+        self._batch_scans = batch_scans
+
+    def _setUp(self):
+        self._metric_collector.reset()
+        if WITH_TIMING:
+            self._file_manager = FILE_MANAGER(page_size=PAGE_SIZE, directory = DATA_FOLDER)
+        else:
+            self._file_manager = DummyFileManager(page_size=PAGE_SIZE)
+        self.file_manager_calls = {'read_block': 0, 'read_blocks': 0, 'write_block': 0, 'write_blocks': 0}
+        count_file_manager_calls(self._file_manager, self.file_manager_calls)
+        self._buffer_manager = BufferManager(self._frame_count,
+                                             self._frame_size,
+                                             self._replacer(),
+                                             self._file_manager,
+                                             self._metric_collector)
+        self.frames_lock = CountingLock(self._buffer_manager._frames_lock)
+        self._buffer_manager._frames_lock = self.frames_lock
+        self._frames: Dict[int, BufferFrame] = {}
+        self._batches: Dict[int, List[BufferFrame]] = {}
+        self._workload_generator = OHJWorkloadGenerator(batch_scans=self._batch_scans)
+
+    def _tearDown(self):
+        self._buffer_manager.close()
+
+    def _run(self):
+        for action in self._workload_generator.get_actions():
+            if action[0] == WorkloadGeneratorAction.FIX_PAGE:
+                self._frames[action[1]] = self._buffer_manager.fix_page(action[1], action[2])
+            elif action[0] == WorkloadGeneratorAction.UNFIX_PAGE:
+                self._buffer_manager.unfix_page(self._frames[action[1]], action[2])
+            elif action[0] == WorkloadGeneratorAction.FIX_PAGES:
+                self._batches[action[1][0]] = self._buffer_manager.fix_pages(action[1], action[2])
+            else:
+                self._buffer_manager.unfix_pages(self._batches.pop(action[1][0]), action[2])
+
+if __name__ == '__main__':
+    metrics_df = pd.DataFrame(columns=['algorithm', 'batch_scans', 'relative_buffer_pool_size', 'num_hits', 'num_misses', 'num_accesses'])
+
+    total_pages_needed = 100000
+    for i in [10, 30, 50]:
+        frame_count = int(total_pages_needed * i/100)
+        print(f"Frame count: {frame_count}")
+        replacers = [("2Q", lambda: TwoQReplacer(frame_count)),
+                     ("LRU", lambda: LRUReplacer(frame_count)),
+                     ("ARC", lambda: ARCReplacer(frame_count)),
+                     ("CFLRU", lambda: CFLRUReplacer(frame_count)),
+                     ("LRU-WSR", lambda: LRUWSRReplacer(frame_count))]
+        for replacer in replacers:
+            for batch_scans in [False, True]:
+                metric_collector = MetricCollector()
+                benchmark = BatchScanBenchmark(2 if WITH_TIMING else 1, frame_count, replacer[1], metric_collector, batch_scans)
+                benchmark.run_benchmark()
+
+                for measurement in benchmark.time_measurements:
+                    metrics_df = metrics_df.append({'algorithm': replacer[0],
+                                                    'batch_scans': batch_scans,
+                                                    'relative_buffer_pool_size': i,
+                                                    'num_hits': metric_collector.get_metric(Metric.BUFFER_MANAGER_HITS),
+                                                    'num_misses': metric_collector.get_metric(Metric.BUFFER_MANAGER_MISSES),
+                                                    'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
+                                                    'frame_lock_acquisitions': benchmark.frames_lock.acquisitions,
+                                                    'read_calls': benchmark.file_manager_calls['read_block'] + benchmark.file_manager_calls['read_blocks'],
+                                                    'write_calls': benchmark.file_manager_calls['write_block'] + benchmark.file_manager_calls['write_blocks'],
+                                                    'time': measurement
+                                                    },
+                                                    ignore_index=True)
+                metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/batch_scan.csv')
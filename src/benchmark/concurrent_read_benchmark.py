@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+
+import mmap
+import shutil
+import threading
+import pandas as pd
+from numpy.random import default_rng
+
+from src.benchmark.abstract_benchmark import AbstractBenchmark
+from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
+from src.util.constants import BENCHMARK_DATA_FOLDER
+
+PAGE_SIZE = 4 * 2 ** 10
+DATA_FOLDER = "data/concurrent_read_benchmark/"
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
+NUM_PAGES = 25000
+READS_PER_READER = 20000
+
+"""Measures read throughput of one segment file as the number of threads
+reading random pages of it concurrently grows
+"""
+class ConcurrentReadBenchmark(AbstractBenchmark):
+    def __init__(self, repetitions, num_readers):
+        super().__init__(repetitions=repetitions)
+        self._num_readers = num_readers
+
+    def _setUp(self):
+        self._file_manager = FILE_MANAGER(page_size=PAGE_SIZE, directory = DATA_FOLDER)
+        random_generator = default_rng(seed=12345)
+        self._requests = random_generator.integers(0, NUM_PAGES, (self._num_readers, READS_PER_READER)).tolist()
+
+    def _reader(self, reader_num: int):
+        with mmap.mmap(-1, PAGE_SIZE) as mm:
+            for page_id in self._requests[reader_num]:
+                self._file_manager.read_block("0", page_id, mm)
+
+    def _run(self):
+        readers = [threading.Thread(target=self._reader, args=(i,)) for i in range(self._num_readers)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+
+def setup():
+    # Create the segment file read by all readers
+    shutil.rmtree(DATA_FOLDER, ignore_errors=True)
+    file_manager = FILE_MANAGER(directory=DATA_FOLDER, page_size=PAGE_SIZE)
+    file_manager.create_file("0")
+    with mmap.mmap(-1, PAGE_SIZE) as mm:
+        file_manager.write_block("0", NUM_PAGES - 1, mm)
+
+if __name__ == '__main__':
+    setup()
+
+    metrics_df = pd.DataFrame(columns=['num_readers', 'time', 'throughput'])
+    for num_readers in [1, 2, 4, 8, 16, 32]:
+        print(f"Readers: {num_readers}")
+        benchmark = ConcurrentReadBenchmark(3, num_readers)
+        benchmark.run_benchmark()
+
+        for measurement in benchmark.time_measurements:
+            metrics_df = metrics_df.append({'num_readers': num_readers,
+                                            'time': measurement,
+                                            'throughput': num_readers * READS_PER_READER / measurement
+                                            },
+                                            ignore_index=True)
+        metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/concurrent_read.csv')
+
+    # Drop the segment file, it is only needed while the benchmark runs
+    shutil.rmtree(DATA_FOLDER, ignore_errors=True)
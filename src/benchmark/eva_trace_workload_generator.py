@@ -6,14 +6,21 @@ from numpy.random import default_rng
 from src.benchmark.abstract_workload_generator import AbstractWorkloadGenerator, WorkloadGeneratorAction
 from src.util.page_id_utils import make_page_id
 
+class QueryType(Enum):
+    FULL_SCAN = 1,
+    PARTIAL_SCAN = 2,
+    POINT_QUERY = 3
+
 class TraceRecord():
-    def __init__(self, action: WorkloadGeneratorAction, page_id: int, is_read: bool = True):
+    def __init__(self, action: WorkloadGeneratorAction, page_id: int, is_read: bool = True,
+                 query_type: QueryType = None):
         self.action = action
         self.page_id = page_id
         self.is_read = is_read
+        self.query_type = query_type
 
 class EvaTraceWorkloadGenerator(AbstractWorkloadGenerator):
-    def __init__(self, total_requests = 100000, read_ratio = 0.9):
+    def __init__(self, total_requests = 100000, read_ratio = 0.9, num_workers = 8):
         super().__init__()
         self._trace_file = "traces/seq_scan.log"
         self._trace = self._parse_log()
@@ -24,7 +31,7 @@ class EvaTraceWorkloadGenerator(AbstractWorkloadGenerator):
         self._read_ratio = read_ratio
         self._num_total_requests = total_requests
         self._num_videos = 4
-        self._num_workers = 8
+        self._num_workers = num_workers
         self._worker_requests: List[List[TraceRecord]] = []
         self._worker_curr_request = []
         for i in range(self._num_workers):
@@ -56,6 +63,13 @@ class EvaTraceWorkloadGenerator(AbstractWorkloadGenerator):
                 self._worker_requests[worker_num][self._worker_curr_request[worker_num]].page_id,
                 not self._worker_requests[worker_num][self._worker_curr_request[worker_num]].is_read)
     
+    """ Returns the type of the query the next action of a worker belongs to
+    """
+    def peek_query_type(self, worker_num: int) -> QueryType:
+        if self._num_total_requests == 0:
+            return None
+        return self._worker_requests[worker_num][self._worker_curr_request[worker_num]].query_type
+
     def consume_action(self, worker_num: int) -> None:
         if self._num_total_requests == 0:
             return None
@@ -103,7 +117,7 @@ class EvaTraceWorkloadGenerator(AbstractWorkloadGenerator):
         if(query_type <= 20):
             # whole sequential scan
             for trace in self._trace:
-                self._worker_requests[worker_num].append(TraceRecord(trace.action, make_page_id(file, trace.page_id), is_read))
+                self._worker_requests[worker_num].append(TraceRecord(trace.action, make_page_id(file, trace.page_id), is_read, QueryType.FULL_SCAN))
         elif(query_type <= 70):
             # Partial sequential scan
             starting_page = self._num_pages - int(self._random_generator.geometric(0.05))
@@ -114,7 +128,7 @@ class EvaTraceWorkloadGenerator(AbstractWorkloadGenerator):
             for i in range(starting_record_num, len(self._trace)):
                 if self._trace[i].page_id >= starting_page:
                     record = self._trace[i]
-                    self._worker_requests[worker_num].append(TraceRecord(record.action, make_page_id(file, record.page_id), record.is_read))
+                    self._worker_requests[worker_num].append(TraceRecord(record.action, make_page_id(file, record.page_id), record.is_read, QueryType.PARTIAL_SCAN))
         else:
             # Point query
             starting_page = int(self._random_generator.uniform(0, self._num_pages))
@@ -129,6 +143,6 @@ class EvaTraceWorkloadGenerator(AbstractWorkloadGenerator):
             for i in range(starting_record_num, len(self._trace)):
                 if self._trace[i].page_id >= starting_page and self._trace[i].page_id <= ending_page:
                     record = self._trace[i]
-                    self._worker_requests[worker_num].append(TraceRecord(record.action, make_page_id(file, record.page_id), record.is_read))
+                    self._worker_requests[worker_num].append(TraceRecord(record.action, make_page_id(file, record.page_id), record.is_read, QueryType.POINT_QUERY))
                 if self._trace[i].page_id == ending_page and self._trace[i].action == WorkloadGeneratorAction.UNFIX_PAGE:
                     break
@@ -0,0 +1,147 @@
+import sys
+import os
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+
+import mmap
+import shutil
+import pandas as pd
+from typing import Dict
+from numpy.random import default_rng
+
+from src.benchmark.abstract_benchmark import AbstractBenchmark
+from src.buffer.buffer_manager import BufferManager
+from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
+from src.buffer.replacement.random_replacer import RandomReplacer
+from src.buffer.metric_collector import Metric, MetricCollector
+from src.util.constants import BENCHMARK_DATA_FOLDER
+
+PAGE_SIZE = 4 * 2 ** 10
+DATA_FOLDER = "data/file_manager_benchmark/"
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
+NUM_PAGES = 10000
+NUM_REQUESTS = 50000
+WRITE_RATIO = 0.2
+
+_counted_os_functions = ['open', 'close', 'lseek', 'read', 'write', 'stat', 'fstat',
+                         'pread', 'pwrite', 'preadv', 'pwritev', 'ftruncate', 'posix_fallocate']
+
+"""Counts the system calls made through the os module, including those of
+file objects returned by os.fdopen
+"""
+class SyscallCounter():
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self._originals = {}
+
+    def _count(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def _wrap(self, name: str, function):
+        def counted(*args, **kwargs):
+            self._count(name)
+            return function(*args, **kwargs)
+        return counted
+
+    def __enter__(self):
+        for name in _counted_os_functions + ['fdopen']:
+            if hasattr(os, name):
+                self._originals[name] = getattr(os, name)
+        for name in _counted_os_functions:
+            if name in self._originals:
+                setattr(os, name, self._wrap(name, self._originals[name]))
+        counter = self
+        original_fdopen = self._originals['fdopen']
+        class CountedFile():
+            def __init__(self, file_obj):
+                self._file_obj = file_obj
+            def __enter__(self):
+                return self
+            def __exit__(self, *args):
+                counter._count('close')
+                return self._file_obj.__exit__(*args)
+            def seek(self, *args):
+                counter._count('lseek')
+                return self._file_obj.seek(*args)
+            def readinto(self, *args):
+                counter._count('read')
+                return self._file_obj.readinto(*args)
+        def fdopen(*args, **kwargs):
+            # Opening a file object checks the descriptor with fstat
+            counter._count('fstat')
+            return CountedFile(original_fdopen(*args, **kwargs))
+        os.fdopen = fdopen
+        return self
+
+    def __exit__(self, *args):
+        for name, function in self._originals.items():
+            setattr(os, name, function)
+
+"""Random fixes of 4KB pages from one segment file through a buffer pool of
+a tenth of the file's size, counting the system calls of the file manager
+per miss.
+"""
+class FileManagerBenchmark(AbstractBenchmark):
+    def __init__(self, repetitions, frame_count, metric_collector):
+        super().__init__(repetitions=repetitions)
+        self._metric_collector = metric_collector
+        self._frame_count = frame_count
+
+    def _setUp(self):
+        self._metric_collector.reset()
+        self._file_manager = FILE_MANAGER(page_size=PAGE_SIZE, directory = DATA_FOLDER)
+        self._buffer_manager = BufferManager(self._frame_count,
+                                             PAGE_SIZE,
+                                             RandomReplacer(self._frame_count),
+                                             self._file_manager,
+                                             self._metric_collector)
+        random_generator = default_rng(seed=12345)
+        self._requests = random_generator.integers(0, NUM_PAGES, NUM_REQUESTS).tolist()
+        self._writes = (random_generator.uniform(0.0, 1.0, NUM_REQUESTS) < WRITE_RATIO).tolist()
+        self.syscalls = SyscallCounter()
+
+    def _tearDown(self):
+        self._buffer_manager.close()
+
+    def _run(self):
+        with self.syscalls:
+            for page_id, is_write in zip(self._requests, self._writes):
+                frame = self._buffer_manager.fix_page(page_id, is_write)
+                self._buffer_manager.unfix_page(frame, is_write)
+
+def setup():
+    # Create the segment file for later reads/writes
+    shutil.rmtree(DATA_FOLDER, ignore_errors=True)
+    file_manager = FILE_MANAGER(directory=DATA_FOLDER, page_size=PAGE_SIZE)
+    file_manager.create_file("0")
+    with mmap.mmap(-1, PAGE_SIZE) as mm:
+        file_manager.write_block("0", NUM_PAGES - 1, mm)
+
+if __name__ == '__main__':
+    setup()
+
+    metrics_df = pd.DataFrame(columns=['num_misses', 'num_dirty_evictions', 'syscalls', 'syscalls_per_miss', 'time', 'throughput'])
+    metric_collector = MetricCollector()
+    benchmark = FileManagerBenchmark(3, NUM_PAGES // 10, metric_collector)
+    benchmark.run_benchmark()
+
+    num_misses = metric_collector.get_metric(Metric.BUFFER_MANAGER_MISSES)
+    print(f"System calls of last run: {benchmark.syscalls.calls}")
+    for measurement in benchmark.time_measurements:
+        metrics_df = metrics_df.append({'num_misses': num_misses,
+                                        'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
+                                        'syscalls': benchmark.syscalls.total(),
+                                        'syscalls_per_miss': benchmark.syscalls.total() / num_misses,
+                                        'time': measurement,
+                                        'throughput': NUM_REQUESTS / measurement
+                                        },
+                                        ignore_index=True)
+    print(metrics_df)
+    os.makedirs(BENCHMARK_DATA_FOLDER, exist_ok=True)
+    metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/file_manager.csv')
+    # Drop the segment file, it is only needed while the benchmark runs
+    shutil.rmtree(DATA_FOLDER, ignore_errors=True)
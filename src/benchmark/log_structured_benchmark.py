@@ -0,0 +1,132 @@
+import sys
+import os
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+
+import shutil
+import time
+import pandas as pd
+from threading import local
+from typing import Dict
+from numpy.random import default_rng
+
+from src.benchmark.abstract_benchmark import AbstractBenchmark
+from src.buffer.buffer_manager import BufferManager
+from src.buffer.buffer_frame import BufferFrame
+from src.buffer.file_manager import FileManager
+from src.buffer.log_structured_file_manager import LogStructuredFileManager
+from src.buffer.replacement.lru_replacer import LRUReplacer
+from src.buffer.metric_collector import Metric, MetricCollector
+from src.util.constants import BENCHMARK_DATA_FOLDER
+from src.benchmark.abstract_workload_generator import WorkloadGeneratorAction
+from src.benchmark.eva_trace_workload_generator import EvaTraceWorkloadGenerator
+
+VIDEO_PAGE_SIZE = 4 * 2 ** 20
+DATA_FOLDER = "data/log_structured_benchmark/"
+# Video files grow by this many bytes at a time
+EXTENT_SIZE = 64 * 2 ** 20
+# Pages per log file of the log-structured mode
+LOG_PAGES = 16
+READ_RATIO = 0.2
+
+"""Adds the bytes and the time of the writes of a file manager to stats.
+Writes issued by other writes of the file manager are not counted twice.
+"""
+def count_writes(file_manager: FileManager, stats: Dict[str, float]):
+    nesting = local()
+    for name in ['write_block', 'write_blocks']:
+        method = getattr(file_manager, name)
+        def timed(file_name, page_id, srcs, name=name, method=method):
+            depth = getattr(nesting, 'depth', 0)
+            nesting.depth = depth + 1
+            start = time.perf_counter()
+            try:
+                return method(file_name, page_id, srcs)
+            finally:
+                nesting.depth = depth
+                if depth == 0:
+                    stats['write_time'] += time.perf_counter() - start
+                    stats['bytes_requested'] += sum(len(src) for src in srcs) if name == 'write_blocks' else len(srcs)
+        setattr(file_manager, name, timed)
+
+"""Runs the trace workload with 20% reads on a buffer pool whose dirty
+evictions are written in place or appended to logs, and measures the bytes
+written to the device and the write throughput.
+"""
+class LogStructuredBenchmark(AbstractBenchmark):
+    def __init__(self, repetitions, frame_count, metric_collector, log_structured):
+        super().__init__(repetitions=repetitions)
+        self._metric_collector = metric_collector
+        self._frame_count = frame_count
+        self._frame_size = VIDEO_PAGE_SIZE
+        self._num_workers = 8
+        self._log_structured = log_structured
+
+    def _setUp(self):
+        self._metric_collector.reset()
+        shutil.rmtree(DATA_FOLDER, ignore_errors=True)
+        if self._log_structured:
+            self._file_manager = LogStructuredFileManager(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER,
+                                                          extent_size = EXTENT_SIZE, log_pages = LOG_PAGES)
+        else:
+            self._file_manager = FileManager(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER, extent_size = EXTENT_SIZE)
+        self.write_stats = {'bytes_requested': 0, 'write_time': 0.0}
+        count_writes(self._file_manager, self.write_stats)
+        self._buffer_manager = BufferManager(self._frame_count,
+                                             self._frame_size,
+                                             LRUReplacer(self._frame_count),
+                                             self._file_manager,
+                                             self._metric_collector)
+        self._frames: Dict[int, BufferFrame] = {}
+        self._workload_generator = EvaTraceWorkloadGenerator(total_requests=100000, read_ratio=READ_RATIO)
+        self._random_generator = default_rng(seed=12345)
+
+    def _tearDown(self):
+        self._buffer_manager.close()
+        if self._log_structured:
+            self._file_manager.close()
+            self.device_bytes_written = self._file_manager.bytes_written
+        else:
+            self.device_bytes_written = self.write_stats['bytes_requested']
+
+    def _run(self):
+        while not self._workload_generator.trace_done():
+            worker_num = int(self._random_generator.uniform(0, self._num_workers))
+            action = self._workload_generator.peek_action(worker_num)
+            while action[0] == WorkloadGeneratorAction.FIX_PAGE \
+                and not self._buffer_manager.safe_to_fix_page(action[1], action[2]):
+                    worker_num = int(self._random_generator.uniform(0, self._num_workers))
+                    action = self._workload_generator.peek_action(worker_num)
+
+            self._workload_generator.consume_action(worker_num)
+            if action[0] == WorkloadGeneratorAction.FIX_PAGE:
+                self._frames[action[1]] = self._buffer_manager.fix_page(action[1], action[2])
+            else:
+                self._buffer_manager.unfix_page(self._frames[action[1]], action[2])
+
+if __name__ == '__main__':
+    metrics_df = pd.DataFrame(columns=['algorithm', 'relative_buffer_pool_size', 'num_hits', 'num_misses', 'num_accesses', 'num_dirty_evictions', 'num_evictions'])
+
+    total_pages_needed = 4 * 212
+    for i in range(10, 101, 10):
+        frame_count = int(total_pages_needed * i/100)
+        print(f"Frame count: {frame_count}")
+        for mode in [("In-place", False), ("Log-structured", True)]:
+            metric_collector = MetricCollector()
+            benchmark = LogStructuredBenchmark(2, frame_count, metric_collector, mode[1])
+            benchmark.run_benchmark()
+
+            for measurement in benchmark.time_measurements:
+                metrics_df = metrics_df.append({'algorithm': mode[0],
+                                                'relative_buffer_pool_size': i,
+                                                'num_hits': metric_collector.get_metric(Metric.BUFFER_MANAGER_HITS),
+                                                'num_misses': metric_collector.get_metric(Metric.BUFFER_MANAGER_MISSES),
+                                                'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
+                                                'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
+                                                'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                                                'bytes_requested': benchmark.write_stats['bytes_requested'],
+                                                'device_bytes_written': benchmark.device_bytes_written,
+                                                'write_throughput': benchmark.write_stats['bytes_requested'] / 2**20 / max(benchmark.write_stats['write_time'], 1e-9),
+                                                'time': measurement
+                                                },
+                                                ignore_index=True)
+            metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/log_structured_20p_reads.csv')
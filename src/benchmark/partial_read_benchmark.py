@@ -0,0 +1,114 @@
+import sys
+import os
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+
+import pandas as pd
+from typing import Dict
+from numpy.random import default_rng
+
+from src.benchmark.abstract_benchmark import AbstractBenchmark
+from src.buffer.buffer_manager import BufferManager
+from src.buffer.buffer_frame import BufferFrame
+from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
+from src.buffer.dummy_file_manager import DummyFileManager
+from src.buffer.replacement.lru_replacer import LRUReplacer
+from src.buffer.metric_collector import Metric, MetricCollector
+from src.util.constants import BENCHMARK_DATA_FOLDER
+from src.benchmark.abstract_workload_generator import WorkloadGeneratorAction
+from src.benchmark.eva_trace_workload_generator import EvaTraceWorkloadGenerator, QueryType
+
+VIDEO_PAGE_SIZE = 4 * 2 ** 20
+DATA_FOLDER = "data/eva_benchmark/"
+# Video files grow by this many bytes at a time
+EXTENT_SIZE = 64 * 2 ** 20
+WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
+SECTOR_SIZE = 64 * 2 ** 10
+# Bytes at the start of a page that a point query looks at, e.g. the
+# keyframe of a video chunk
+POINT_QUERY_BYTES = 256 * 2 ** 10
+
+"""EVA trace benchmark that reports the bytes read from the device for every
+query type, with and without point queries fixing only the byte range they
+need. Scans fix whole pages either way.
+Run trace_benchmark.setup() once to create the data files.
+"""
+class PartialReadBenchmark(AbstractBenchmark):
+    def __init__(self, repetitions, frame_count, metric_collector, read_ratio, partial_reads):
+        super().__init__(repetitions=repetitions)
+        self._metric_collector = metric_collector
+        self._frame_count = frame_count
+        self._frame_size = VIDEO_PAGE_SIZE
+        self._num_workers = 8
+        self._read_ratio = read_ratio
+        self._partial_reads = partial_reads
+
+    def _setUp(self):
+        self._metric_collector.reset()
+        if WITH_TIMING:
+            self._file_manager = FILE_MANAGER(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER, extent_size = EXTENT_SIZE)
+        else:
+            self._file_manager = DummyFileManager(page_size=VIDEO_PAGE_SIZE)
+        self._buffer_manager = BufferManager(self._frame_count,
+                                             self._frame_size,
+                                             LRUReplacer(self._frame_count),
+                                             self._file_manager,
+                                             self._metric_collector,
+                                             sector_size=SECTOR_SIZE if self._partial_reads else 0)
+        self._frames: Dict[int, BufferFrame] = {}
+        self.bytes_read = {query_type: 0 for query_type in QueryType}
+        self._workload_generator = EvaTraceWorkloadGenerator(total_requests=100000, read_ratio=self._read_ratio)
+        self._random_generator = default_rng(seed=12345)
+
+    def _tearDown(self):
+        self._buffer_manager.close()
+
+    def _run(self):
+        while not self._workload_generator.trace_done():
+            worker_num = int(self._random_generator.uniform(0, self._num_workers))
+            action = self._workload_generator.peek_action(worker_num)
+            while action[0] == WorkloadGeneratorAction.FIX_PAGE \
+                and not self._buffer_manager.safe_to_fix_page(action[1], action[2]):
+                    worker_num = int(self._random_generator.uniform(0, self._num_workers))
+                    action = self._workload_generator.peek_action(worker_num)
+
+            query_type = self._workload_generator.peek_query_type(worker_num)
+            self._workload_generator.consume_action(worker_num)
+            if action[0] == WorkloadGeneratorAction.FIX_PAGE:
+                byte_range = None
+                if self._partial_reads and query_type == QueryType.POINT_QUERY:
+                    byte_range = (0, POINT_QUERY_BYTES)
+                bytes_read = self._metric_collector.get_metric(Metric.BUFFER_MANAGER_BYTES_READ)
+                self._frames[action[1]] = self._buffer_manager.fix_page(action[1], action[2], byte_range=byte_range)
+                self.bytes_read[query_type] += self._metric_collector.get_metric(Metric.BUFFER_MANAGER_BYTES_READ) - bytes_read
+            else:
+                self._buffer_manager.unfix_page(self._frames[action[1]], action[2])
+
+if __name__ == '__main__':
+    total_pages_needed = 4 * 212
+    for read_ratio in [0.9]:
+        metrics_df = pd.DataFrame(columns=['algorithm', 'relative_buffer_pool_size', 'num_hits', 'num_misses', 'num_accesses'])
+        for i in range(10, 101, 10):
+            frame_count = int(total_pages_needed * i/100)
+            print(f"Frame count: {frame_count}")
+            for mode in [("Whole pages", False), ("Partial reads", True)]:
+                metric_collector = MetricCollector()
+                benchmark = PartialReadBenchmark(2 if WITH_TIMING else 1, frame_count, metric_collector, read_ratio, mode[1])
+                benchmark.run_benchmark()
+
+                for measurement in benchmark.time_measurements:
+                    row = {'algorithm': mode[0],
+                           'relative_buffer_pool_size': i,
+                           'num_hits': metric_collector.get_metric(Metric.BUFFER_MANAGER_HITS),
+                           'num_misses': metric_collector.get_metric(Metric.BUFFER_MANAGER_MISSES),
+                           'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
+                           'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
+                           'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                           'bytes_read': metric_collector.get_metric(Metric.BUFFER_MANAGER_BYTES_READ),
+                           'time': measurement}
+                    for query_type in QueryType:
+                        row[f'{query_type.name.lower()}_bytes_read'] = benchmark.bytes_read[query_type]
+                    metrics_df = metrics_df.append(row, ignore_index=True)
+                metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/partial_read_{int(read_ratio*100)}p_reads.csv')
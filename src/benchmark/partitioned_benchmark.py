@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+
+import threading
+import pandas as pd
+import numpy as np
+from numpy.random import default_rng
+
+from src.benchmark.abstract_benchmark import AbstractBenchmark
+from src.buffer.partitioned_buffer_manager import PartitionedBufferManager
+from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
+from src.buffer.dummy_file_manager import DummyFileManager
+from src.buffer.replacement.lru_replacer import LRUReplacer
+from src.buffer.replacement.two_q_replacer import TwoQReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.metric_collector import MetricCollector
+from src.util.constants import BENCHMARK_DATA_FOLDER
+
+PAGE_SIZE = 4 * 2 ** 10
+DATA_FOLDER = "data/partitioned_benchmark/"
+WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
+NUM_PAGES = 20000
+REQUESTS_PER_WORKER = 20000
+
+"""Measures fix/unfix throughput of a multi-threaded workload as the
+buffer pool is split into more shards.
+"""
+class PartitionedBenchmark(AbstractBenchmark):
+    def __init__(self, repetitions, frame_count, replacer, metric_collector, shard_count, num_workers):
+        super().__init__(repetitions=repetitions)
+        self._metric_collector = metric_collector
+        self._frame_count = frame_count
+        self._frame_size = PAGE_SIZE
+        self._replacer = replacer
+        self._shard_count = shard_count
+        self._num_workers = num_workers
+
+    def _setUp(self):
+        self._metric_collector.reset()
+        if WITH_TIMING:
+            self._file_manager = FILE_MANAGER(page_size=PAGE_SIZE, directory = DATA_FOLDER)
+        else:
+            self._file_manager = DummyFileManager(page_size=PAGE_SIZE)
+        self._buffer_manager = PartitionedBufferManager(self._frame_count,
+                                                        self._frame_size,
+                                                        self._replacer,
+                                                        self._file_manager,
+                                                        self._metric_collector,
+                                                        shard_count=self._shard_count)
+        random_generator = default_rng(seed=12345)
+        # 80-20 self-similar distribution, same as the OHJ workload
+        skew = 0.2
+        s = random_generator.uniform(0.0, 1.0, (self._num_workers, REQUESTS_PER_WORKER))
+        self._requests = (NUM_PAGES * s ** (np.log(skew) / np.log(1 - skew))).astype(np.int64).tolist()
+        self._writes = (random_generator.uniform(0.0, 1.0, (self._num_workers, REQUESTS_PER_WORKER)) < 0.2).tolist()
+
+    def _worker(self, worker_num: int):
+        for page_id, is_write in zip(self._requests[worker_num], self._writes[worker_num]):
+            frame = self._buffer_manager.fix_page(page_id, is_write)
+            self._buffer_manager.unfix_page(frame, is_write)
+
+    def _run(self):
+        workers = [threading.Thread(target=self._worker, args=(i,)) for i in range(self._num_workers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+if __name__ == '__main__':
+    metrics_df = pd.DataFrame(columns=['algorithm', 'shard_count', 'num_workers', 'time', 'throughput'])
+
+    frame_count = int(NUM_PAGES * 0.3)
+    num_workers = 8
+    replacers = [("LRU", LRUReplacer),
+                 ("2Q", TwoQReplacer),
+                 ("ARC", ARCReplacer)]
+    for shard_count in [1, 2, 4, 8, 16]:
+        print(f"Shard count: {shard_count}")
+        for replacer in replacers:
+            metric_collector = MetricCollector()
+            benchmark = PartitionedBenchmark(2 if WITH_TIMING else 1, frame_count, replacer[1], metric_collector, shard_count, num_workers)
+            benchmark.run_benchmark()
+
+            for measurement in benchmark.time_measurements:
+                metrics_df = metrics_df.append({'algorithm': replacer[0],
+                                                'shard_count': shard_count,
+                                                'num_workers': num_workers,
+                                                'time': measurement,
+                                                'throughput': num_workers * REQUESTS_PER_WORKER / measurement
+                                                },
+                                                ignore_index=True)
+            metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/partitioned.csv')
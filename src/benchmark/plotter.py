@@ -42,7 +42,7 @@ def do_plot(benchmark_name: str,
                             markers=True,
                             ci=None,
                             data=df,
-                            palette=sns.color_palette('tab10', n_colors=4))
+                            palette=sns.color_palette('tab10', n_colors=df['Algorithm'].nunique()))
     line_plot.set_xlabel(x_label)
     line_plot.set_ylabel(y_label)
     legend_title = 'Algorithm' if 'Prefetching' not in df.columns else None
@@ -71,6 +71,20 @@ def plot(benchmark_name: str):
     elif benchmark_name == 'prefetching_synthetic':
         csv_file_name = f'{BENCHMARK_DATA_FOLDER}/prefetching_synthetic.csv'
         non_prefetching_csv_file_name = f'{BENCHMARK_DATA_FOLDER}/synthetic_timing.csv'
+    elif benchmark_name == 'partitioned':
+        csv_file_name = f'{BENCHMARK_DATA_FOLDER}/partitioned.csv'
+        x_column = 'shard_count'
+        x_label = 'Number of buffer pool shards'
+    elif benchmark_name == 'scan_resistance':
+        csv_file_name = f'{BENCHMARK_DATA_FOLDER}/scan_resistance_90p_reads.csv'
+    elif benchmark_name == 'async_trace':
+        csv_file_name = f'{BENCHMARK_DATA_FOLDER}/async_trace.csv'
+        x_column = 'num_workers'
+        x_label = 'Number of concurrent workers'
+    elif benchmark_name == 'log_structured':
+        csv_file_name = f'{BENCHMARK_DATA_FOLDER}/log_structured_20p_reads.csv'
+    elif benchmark_name == 'partial_read':
+        csv_file_name = f'{BENCHMARK_DATA_FOLDER}/partial_read_90p_reads.csv'
     else:
         raise ValueError("benchmark_name must be 'trace' or 'synthetic'")
     df = pd.read_csv(csv_file_name)
@@ -81,8 +95,9 @@ def plot(benchmark_name: str):
         non_prefetching_df = pd.read_csv(non_prefetching_csv_file_name)
         non_prefetching_df['Prefetching'] = 'No Prefetching'
         df = df.append(non_prefetching_df, ignore_index=True)
-    df['hit_rate'] = df['num_hits']/df['num_accesses']*100
-    df['miss_rate'] = df['num_misses']/df['num_accesses']*100
+    if 'num_accesses' in df.columns:
+        df['hit_rate'] = df['num_hits']/df['num_accesses']*100
+        df['miss_rate'] = df['num_misses']/df['num_accesses']*100
     # df['ratio_dirty_evictions'] = df['num_dirty_evictions']/df['num_evictions']
     # df.loc[df['num_dirty_evictions'] == 0, 'ratio_dirty_evictions'] = 0
 
@@ -92,8 +107,16 @@ def plot(benchmark_name: str):
     for context in ['talk', 'poster']:
         for graph_info in [
             ['hit_rate', 'Hit Rate (%)'],
+            ['point_query_hit_rate', 'Point Query Hit Rate (%)'],
             ['num_dirty_evictions', 'Dirty Evictions'],
-            ['time', 'Execution Time (s)']
+            ['time', 'Execution Time (s)'],
+            ['throughput', 'Throughput (fixes/s)'],
+            ['device_bytes_written', 'Bytes Written to Device'],
+            ['write_throughput', 'Write Throughput (MB/s)'],
+            ['bytes_read', 'Bytes Read from Device'],
+            ['point_query_bytes_read', 'Point Query Bytes Read'],
+            ['fix_latency_p99', 'p99 Fix Latency (s)'],
+            ['fix_latency_p999', 'p99.9 Fix Latency (s)']
         ]:
             if graph_info[0] in df.columns:
                 do_plot(benchmark_name, df, context, x_column, graph_info[0], x_label, graph_info[1])
@@ -12,11 +12,15 @@ from src.benchmark.abstract_benchmark import AbstractBenchmark
 from src.buffer.buffer_manager import BufferManager
 from src.buffer.buffer_frame import BufferFrame
 from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
 from src.buffer.dummy_file_manager import DummyFileManager
 from src.buffer.replacement.random_replacer import RandomReplacer
 from src.buffer.replacement.two_q_replacer import TwoQReplacer
 from src.buffer.replacement.lru_replacer import LRUReplacer
 from src.buffer.replacement.cfdc_replacer import CFDCReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
 from src.buffer.metric_collector import Metric, MetricCollector
 from src.util.constants import BENCHMARK_DATA_FOLDER, PAGE_SIZE
 from src.benchmark.abstract_workload_generator import AbstractWorkloadGenerator, WorkloadGeneratorAction
@@ -24,7 +28,11 @@ from src.benchmark.eva_trace_workload_generator import EvaTraceWorkloadGenerator
 
 VIDEO_PAGE_SIZE = 4 * 2 ** 20
 DATA_FOLDER = "data/eva_benchmark/"
+# Video files grow by this many bytes at a time
+EXTENT_SIZE = 64 * 2 ** 20
 WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
 PREFETCHING_DEPTH = 2
 
 class EvaBenchmark(AbstractBenchmark):
@@ -41,20 +49,25 @@ class EvaBenchmark(AbstractBenchmark):
     def _setUp(self):
         self._metric_collector.reset()
         if WITH_TIMING:
-            self._file_manager = FileManager(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER)
+            self._file_manager = FILE_MANAGER(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER, extent_size = EXTENT_SIZE)
         else:
             self._file_manager = DummyFileManager(page_size=VIDEO_PAGE_SIZE)
         self._buffer_manager = BufferManager(self._frame_count,
                                              self._frame_size,
                                              self._replacer(),
                                              self._file_manager,
-                                             self._metric_collector)
+                                             self._metric_collector,
+                                             prefetch_max_depth=PREFETCHING_DEPTH)
         self._frames: Dict[int, BufferFrame] = {}
         total_requests = 100000 if WITH_TIMING else 100000
         self._workload_generator = EvaTraceWorkloadGenerator(total_requests=total_requests, read_ratio=self._read_ratio)
         
         self._random_generator = default_rng(seed=12345)
 
+    def _tearDown(self):
+        # Waits for outstanding prefetches
+        self._buffer_manager.close()
+
     def _run(self):
         while not self._workload_generator.trace_done():
             worker_num = int(self._random_generator.uniform(0, self._num_workers))
@@ -69,19 +82,13 @@ class EvaBenchmark(AbstractBenchmark):
             if action[0] == WorkloadGeneratorAction.FIX_PAGE:
                 # print(f"Fix page   {action[1]:15} exclusive: {action[2]}")
                 self._frames[action[1]] = self._buffer_manager.fix_page(action[1], action[2])
-                for i in range(1, PREFETCHING_DEPTH+1):
-                    prefetched_page_id = action[1] + i
-                    if not self._buffer_manager.page_present(prefetched_page_id) and self._buffer_manager.safe_to_fix_page(prefetched_page_id, False):
-                        # print(f"Prefetch Fix page   {prefetched_page_id:15} exclusive: False")
-                        self._frames[prefetched_page_id] = self._buffer_manager.fix_page(prefetched_page_id, False, is_prefetch=True)
-                        self._buffer_manager.unfix_page(self._frames[prefetched_page_id], False, is_prefetch=True)
             else:
                 # print(f"Unfix page {action[1]:15} dirty:     {action[2]}")
                 self._buffer_manager.unfix_page(self._frames[action[1]], action[2])
 
 def setup():
     # Create empty files for later reads/writes
-    file_manager = FileManager(directory=DATA_FOLDER)
+    file_manager = FILE_MANAGER(directory=DATA_FOLDER)
     os.makedirs(DATA_FOLDER, exist_ok=True)
     for i in range(0, 4):
         file_name = f"{i}"
@@ -104,7 +111,10 @@ if __name__ == '__main__':
             replacers = [("Random", lambda: RandomReplacer(frame_count)),
                         ("2Q", lambda: TwoQReplacer(frame_count)),
                         ("LRU", lambda: LRUReplacer(frame_count)),
-                        ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=2))]
+                        ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=2)),
+                        ("ARC", lambda: ARCReplacer(frame_count)),
+                        ("CFLRU", lambda: CFLRUReplacer(frame_count)),
+                        ("LRU-WSR", lambda: LRUWSRReplacer(frame_count))]
             for replacer in replacers:
                 metric_collector = MetricCollector()
                 benchmark = EvaBenchmark(2 if WITH_TIMING else 1, frame_count, replacer[1], metric_collector, read_ratio)
@@ -119,6 +129,8 @@ if __name__ == '__main__':
                                                     'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
                                                     'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
                                                     'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                                                    'prefetch_accuracy': metric_collector.get_prefetch_accuracy(),
+                                                    'prefetch_coverage': metric_collector.get_prefetch_coverage(),
                                                     'time': measurement
                                                     },
                                                     ignore_index=True)
@@ -130,6 +142,8 @@ if __name__ == '__main__':
                                                     'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
                                                     'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
                                                     'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                                                    'prefetch_accuracy': metric_collector.get_prefetch_accuracy(),
+                                                    'prefetch_coverage': metric_collector.get_prefetch_coverage(),
                                                     },
                                                     ignore_index=True)
                 metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/prefetching_trace.csv')
@@ -11,10 +11,14 @@ from src.buffer.buffer_manager import BufferManager
 from src.buffer.buffer_frame import BufferFrame
 from src.buffer.dummy_file_manager import DummyFileManager
 from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
 from src.buffer.replacement.random_replacer import RandomReplacer
 from src.buffer.replacement.two_q_replacer import TwoQReplacer
 from src.buffer.replacement.lru_replacer import LRUReplacer
 from src.buffer.replacement.cfdc_replacer import CFDCReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
 from src.buffer.metric_collector import Metric, MetricCollector
 from src.util.constants import BENCHMARK_DATA_FOLDER
 from src.benchmark.abstract_workload_generator import AbstractWorkloadGenerator, WorkloadGeneratorAction
@@ -23,6 +27,8 @@ from src.benchmark.workload_generators import DummyWorkloadGenerator, OHJWorkloa
 PAGE_SIZE = 4 * 2 ** 10
 DATA_FOLDER = "data/synthetic_benchmark/"
 WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
 PREFETCHING_DEPTH = 3
 
 class SyntheticBenchmark(AbstractBenchmark):
@@ -36,30 +42,28 @@ class SyntheticBenchmark(AbstractBenchmark):
     def _setUp(self):
         self._metric_collector.reset()
         if WITH_TIMING:
-            self._file_manager = FileManager(page_size=PAGE_SIZE, directory = DATA_FOLDER)
+            self._file_manager = FILE_MANAGER(page_size=PAGE_SIZE, directory = DATA_FOLDER)
         else:
             self._file_manager = DummyFileManager(page_size=PAGE_SIZE)
         self._buffer_manager = BufferManager(self._frame_count,
                                              self._frame_size,
                                              self._replacer(),
                                              self._file_manager,
-                                             self._metric_collector)
+                                             self._metric_collector,
+                                             prefetch_max_depth=PREFETCHING_DEPTH)
         self._frames: Dict[int, BufferFrame] = {}
         self._workload_generator = OHJWorkloadGenerator()
 
+    def _tearDown(self):
+        # Waits for outstanding prefetches
+        self._buffer_manager.close()
+
     def _run(self):
         for action in self._workload_generator.get_actions():
             if action[0] == WorkloadGeneratorAction.FIX_PAGE:
                 if action[1] // 10 == 685:
                     print(f"Fix page   {action[1]:15} exclusive: {action[2]}")
                 self._frames[action[1]] = self._buffer_manager.fix_page(action[1], action[2])
-                for i in range(1, PREFETCHING_DEPTH+1):
-                    prefetched_page_id = action[1] + i
-                    if not self._buffer_manager.page_present(prefetched_page_id) and self._buffer_manager.safe_to_fix_page(prefetched_page_id, False):
-                        if prefetched_page_id // 10 == 685:
-                            print(f"Prefetch Fix page   {prefetched_page_id:15} exclusive: False")
-                        self._frames[prefetched_page_id] = self._buffer_manager.fix_page(prefetched_page_id, False, is_prefetch=True)
-                        self._buffer_manager.unfix_page(self._frames[prefetched_page_id], False, is_prefetch=True)
             else:
                 if action[1] // 10 == 685:
                     print(f"Unfix page {action[1]:15} dirty:     {action[2]}")
@@ -67,7 +71,7 @@ class SyntheticBenchmark(AbstractBenchmark):
 
 def setup():
     # Create empty files for later reads/writes
-    file_manager = FileManager(directory=DATA_FOLDER)
+    file_manager = FILE_MANAGER(directory=DATA_FOLDER)
     os.makedirs(DATA_FOLDER, exist_ok=True)
     file_name = "0"
     file_manager.create_file(file_name)
@@ -88,7 +92,10 @@ if __name__ == '__main__':
         replacers = [("Random", lambda: RandomReplacer(frame_count)),
                      ("2Q", lambda: TwoQReplacer(frame_count)),
                      ("LRU", lambda: LRUReplacer(frame_count)),
-                     ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=8))
+                     ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=8)),
+                     ("ARC", lambda: ARCReplacer(frame_count)),
+                     ("CFLRU", lambda: CFLRUReplacer(frame_count)),
+                     ("LRU-WSR", lambda: LRUWSRReplacer(frame_count))
                      ]
         for replacer in replacers:
             metric_collector = MetricCollector()
@@ -104,6 +111,8 @@ if __name__ == '__main__':
                                                 'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
                                                 'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
                                                 'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                                                'prefetch_accuracy': metric_collector.get_prefetch_accuracy(),
+                                                'prefetch_coverage': metric_collector.get_prefetch_coverage(),
                                                 'time': measurement
                                                 },
                                                 ignore_index=True)
@@ -115,6 +124,8 @@ if __name__ == '__main__':
                                                 'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
                                                 'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
                                                 'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                                                'prefetch_accuracy': metric_collector.get_prefetch_accuracy(),
+                                                'prefetch_coverage': metric_collector.get_prefetch_coverage(),
                                                 },
                                                 ignore_index=True)
             metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/prefetching_synthetic.csv')
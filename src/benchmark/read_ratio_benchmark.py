@@ -12,12 +12,16 @@ from src.benchmark.abstract_benchmark import AbstractBenchmark
 from src.buffer.buffer_manager import BufferManager
 from src.buffer.buffer_frame import BufferFrame
 from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
 from src.buffer.dummy_file_manager import DummyFileManager
 from src.buffer.replacement.random_replacer import RandomReplacer
 from src.buffer.replacement.two_q_replacer import TwoQReplacer
 from src.buffer.replacement.lru_replacer import LRUReplacer
 from src.buffer.replacement.cfdc_replacer import CFDCReplacer
 from src.buffer.replacement.acr_replacer import ACRReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
 from src.buffer.metric_collector import Metric, MetricCollector
 from src.util.constants import BENCHMARK_DATA_FOLDER, PAGE_SIZE
 from src.benchmark.abstract_workload_generator import AbstractWorkloadGenerator, WorkloadGeneratorAction
@@ -25,7 +29,11 @@ from src.benchmark.eva_trace_workload_generator import EvaTraceWorkloadGenerator
 
 VIDEO_PAGE_SIZE = 4 * 2 ** 20
 DATA_FOLDER = "data/eva_benchmark/"
+# Video files grow by this many bytes at a time
+EXTENT_SIZE = 64 * 2 ** 20
 WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
 
 class EvaBenchmark(AbstractBenchmark):
     def __init__(self, repetitions, frame_count, replacer, metric_collector, read_ratio):
@@ -41,7 +49,7 @@ class EvaBenchmark(AbstractBenchmark):
     def _setUp(self):
         self._metric_collector.reset()
         if WITH_TIMING:
-            self._file_manager = FileManager(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER)
+            self._file_manager = FILE_MANAGER(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER, extent_size = EXTENT_SIZE)
         else:
             self._file_manager = DummyFileManager(page_size=VIDEO_PAGE_SIZE)
         self._buffer_manager = BufferManager(self._frame_count,
@@ -75,7 +83,7 @@ class EvaBenchmark(AbstractBenchmark):
 
 def setup():
     # Create empty files for later reads/writes
-    file_manager = FileManager(directory=DATA_FOLDER)
+    file_manager = FILE_MANAGER(directory=DATA_FOLDER)
     os.makedirs(DATA_FOLDER, exist_ok=True)
     for i in range(0, 4):
         file_name = f"{i}"
@@ -98,7 +106,10 @@ if __name__ == '__main__':
         replacers = [("Random", lambda: RandomReplacer(frame_count)),
                     ("2Q", lambda: TwoQReplacer(frame_count)),
                     ("LRU", lambda: LRUReplacer(frame_count)),
-                    ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=2))]
+                    ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=2)),
+                    ("ARC", lambda: ARCReplacer(frame_count)),
+                    ("CFLRU", lambda: CFLRUReplacer(frame_count)),
+                    ("LRU-WSR", lambda: LRUWSRReplacer(frame_count))]
         for replacer in replacers:
             metric_collector = MetricCollector()
             benchmark = EvaBenchmark(2 if WITH_TIMING else 1, frame_count, replacer[1], metric_collector, i / 100)
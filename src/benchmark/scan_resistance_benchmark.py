@@ -0,0 +1,141 @@
+import sys
+import os
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+
+import pandas as pd
+from typing import Dict
+from numpy.random import default_rng
+
+from src.benchmark.abstract_benchmark import AbstractBenchmark
+from src.buffer.buffer_manager import BufferManager
+from src.buffer.buffer_frame import BufferFrame
+from src.buffer.buffer_access_strategy import BufferAccessStrategy
+from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
+from src.buffer.dummy_file_manager import DummyFileManager
+from src.buffer.replacement.random_replacer import RandomReplacer
+from src.buffer.replacement.two_q_replacer import TwoQReplacer
+from src.buffer.replacement.lru_replacer import LRUReplacer
+from src.buffer.replacement.cfdc_replacer import CFDCReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
+from src.buffer.metric_collector import Metric, MetricCollector
+from src.util.constants import BENCHMARK_DATA_FOLDER
+from src.benchmark.abstract_workload_generator import WorkloadGeneratorAction
+from src.benchmark.eva_trace_workload_generator import EvaTraceWorkloadGenerator, QueryType
+
+VIDEO_PAGE_SIZE = 4 * 2 ** 20
+DATA_FOLDER = "data/eva_benchmark/"
+# Video files grow by this many bytes at a time
+EXTENT_SIZE = 64 * 2 ** 20
+WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
+# Frames in the ring of a full scan, the trace keeps two pages of a scan fixed
+RING_SIZE = 4
+
+"""EVA trace benchmark that reports the hit rate of every query type, with
+and without giving full sequential scans a ring of frames of their own.
+Run trace_benchmark.setup() once to create the data files.
+"""
+class ScanResistanceBenchmark(AbstractBenchmark):
+    def __init__(self, repetitions, frame_count, replacer, metric_collector, read_ratio, use_strategy):
+        super().__init__(repetitions=repetitions)
+        self._metric_collector = metric_collector
+        self._frame_count = frame_count
+        self._replacer = replacer
+        self._frame_size = VIDEO_PAGE_SIZE
+        self._num_workers = 8
+        self._read_ratio = read_ratio
+        self._use_strategy = use_strategy
+
+    def _setUp(self):
+        self._metric_collector.reset()
+        if WITH_TIMING:
+            self._file_manager = FILE_MANAGER(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER, extent_size = EXTENT_SIZE)
+        else:
+            self._file_manager = DummyFileManager(page_size=VIDEO_PAGE_SIZE)
+        self._buffer_manager = BufferManager(self._frame_count,
+                                             self._frame_size,
+                                             self._replacer(),
+                                             self._file_manager,
+                                             self._metric_collector)
+        self._frames: Dict[int, BufferFrame] = {}
+        self._strategies: Dict[int, BufferAccessStrategy] = {}
+        self.hits = {query_type: 0 for query_type in QueryType}
+        self.accesses = {query_type: 0 for query_type in QueryType}
+        self._workload_generator = EvaTraceWorkloadGenerator(total_requests=100000, read_ratio=self._read_ratio)
+        self._random_generator = default_rng(seed=12345)
+
+    def _tearDown(self):
+        self._buffer_manager.close()
+
+    """ Returns the strategy of a worker's next query, freeing the strategy
+    of its previous query once that has finished
+    """
+    def _get_strategy(self, worker_num: int, query_type: QueryType) -> BufferAccessStrategy:
+        if not self._use_strategy:
+            return None
+        if query_type != QueryType.FULL_SCAN:
+            if worker_num in self._strategies:
+                self._buffer_manager.free_access_strategy(self._strategies.pop(worker_num))
+            return None
+        if worker_num not in self._strategies:
+            self._strategies[worker_num] = BufferAccessStrategy(RING_SIZE)
+        return self._strategies[worker_num]
+
+    def _run(self):
+        while not self._workload_generator.trace_done():
+            worker_num = int(self._random_generator.uniform(0, self._num_workers))
+            action = self._workload_generator.peek_action(worker_num)
+            while action[0] == WorkloadGeneratorAction.FIX_PAGE \
+                and not self._buffer_manager.safe_to_fix_page(action[1], action[2]):
+                    worker_num = int(self._random_generator.uniform(0, self._num_workers))
+                    action = self._workload_generator.peek_action(worker_num)
+
+            query_type = self._workload_generator.peek_query_type(worker_num)
+            self._workload_generator.consume_action(worker_num)
+            if action[0] == WorkloadGeneratorAction.FIX_PAGE:
+                strategy = self._get_strategy(worker_num, query_type)
+                self.accesses[query_type] += 1
+                if self._buffer_manager.page_present(action[1]):
+                    self.hits[query_type] += 1
+                self._frames[action[1]] = self._buffer_manager.fix_page(action[1], action[2], strategy=strategy)
+            else:
+                self._buffer_manager.unfix_page(self._frames[action[1]], action[2])
+
+if __name__ == '__main__':
+    total_pages_needed = 4 * 212
+    for read_ratio in [0.9]:
+        metrics_df = pd.DataFrame(columns=['algorithm', 'relative_buffer_pool_size', 'num_hits', 'num_misses', 'num_accesses'])
+        for i in range(10, 101, 10):
+            frame_count = int(total_pages_needed * i/100)
+            print(f"Frame count: {frame_count}")
+            replacers = [("Random", lambda: RandomReplacer(frame_count)),
+                        ("2Q", lambda: TwoQReplacer(frame_count)),
+                        ("LRU", lambda: LRUReplacer(frame_count)),
+                        ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=2)),
+                        ("ARC", lambda: ARCReplacer(frame_count)),
+                        ("CFLRU", lambda: CFLRUReplacer(frame_count)),
+                        ("LRU-WSR", lambda: LRUWSRReplacer(frame_count))]
+            for replacer in replacers:
+                for use_strategy in [False, True]:
+                    metric_collector = MetricCollector()
+                    benchmark = ScanResistanceBenchmark(2 if WITH_TIMING else 1, frame_count, replacer[1], metric_collector, read_ratio, use_strategy)
+                    benchmark.run_benchmark()
+
+                    for measurement in benchmark.time_measurements:
+                        row = {'algorithm': replacer[0] + (' (Ring)' if use_strategy else ''),
+                               'relative_buffer_pool_size': i,
+                               'num_hits': metric_collector.get_metric(Metric.BUFFER_MANAGER_HITS),
+                               'num_misses': metric_collector.get_metric(Metric.BUFFER_MANAGER_MISSES),
+                               'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
+                               'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
+                               'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                               'time': measurement}
+                        for query_type in QueryType:
+                            name = query_type.name.lower()
+                            row[f'{name}_hit_rate'] = benchmark.hits[query_type] / max(benchmark.accesses[query_type], 1) * 100
+                        metrics_df = metrics_df.append(row, ignore_index=True)
+                    metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/scan_resistance_{int(read_ratio*100)}p_reads.csv')
@@ -11,11 +11,17 @@ from src.buffer.buffer_manager import BufferManager
 from src.buffer.buffer_frame import BufferFrame
 from src.buffer.dummy_file_manager import DummyFileManager
 from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
 from src.buffer.replacement.random_replacer import RandomReplacer
 from src.buffer.replacement.two_q_replacer import TwoQReplacer
 from src.buffer.replacement.lru_replacer import LRUReplacer
 from src.buffer.replacement.cfdc_replacer import CFDCReplacer
+from src.buffer.replacement.clock_replacer import ClockReplacer
+from src.buffer.replacement.clock_pro_replacer import ClockProReplacer
 from src.buffer.replacement.acr_replacer import ACRReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
 from src.buffer.metric_collector import Metric, MetricCollector
 from src.util.constants import BENCHMARK_DATA_FOLDER
 from src.benchmark.abstract_workload_generator import AbstractWorkloadGenerator, WorkloadGeneratorAction
@@ -24,6 +30,8 @@ from src.benchmark.workload_generators import DummyWorkloadGenerator, OHJWorkloa
 PAGE_SIZE = 4 * 2 ** 10
 DATA_FOLDER = "data/synthetic_benchmark/"
 WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
 
 class SyntheticBenchmark(AbstractBenchmark):
     def __init__(self, repetitions, frame_count, replacer, metric_collector):
@@ -36,7 +44,7 @@ class SyntheticBenchmark(AbstractBenchmark):
     def _setUp(self):
         self._metric_collector.reset()
         if WITH_TIMING:
-            self._file_manager = FileManager(page_size=PAGE_SIZE, directory = DATA_FOLDER)
+            self._file_manager = FILE_MANAGER(page_size=PAGE_SIZE, directory = DATA_FOLDER)
         else:
             self._file_manager = DummyFileManager(page_size=PAGE_SIZE)
         self._buffer_manager = BufferManager(self._frame_count,
@@ -58,7 +66,7 @@ class SyntheticBenchmark(AbstractBenchmark):
 
 def setup():
     # Create empty files for later reads/writes
-    file_manager = FileManager(directory=DATA_FOLDER)
+    file_manager = FILE_MANAGER(directory=DATA_FOLDER)
     os.makedirs(DATA_FOLDER, exist_ok=True)
     file_name = "0"
     file_manager.create_file(file_name)
@@ -77,10 +85,15 @@ if __name__ == '__main__':
         frame_count = int(total_pages_needed * i/100)
         print(f"Frame count: {frame_count}")
         replacers = [#("Random", lambda: RandomReplacer(frame_count)),
-                     #("2Q", lambda: TwoQReplacer(frame_count)),
-                     #("LRU", lambda: LRUReplacer(frame_count)),
+                     ("2Q", lambda: TwoQReplacer(frame_count)),
+                     ("LRU", lambda: LRUReplacer(frame_count)),
                      #("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=8))
-                     ("ACR", lambda: ACRReplacer(frame_count))
+                     ("ACR", lambda: ACRReplacer(frame_count)),
+                     ("CLOCK", lambda: ClockReplacer(frame_count)),
+                     ("CLOCK-Pro", lambda: ClockProReplacer(frame_count)),
+                     ("ARC", lambda: ARCReplacer(frame_count)),
+                     ("CFLRU", lambda: CFLRUReplacer(frame_count)),
+                     ("LRU-WSR", lambda: LRUWSRReplacer(frame_count))
                      ]
         for replacer in replacers:
             metric_collector = MetricCollector()
@@ -107,6 +120,8 @@ if __name__ == '__main__':
                                                 'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
                                                 'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
                                                 'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                                                # Without I/O the run time is the CPU cost of the buffer manager
+                                                'time': benchmark.time_measurements[0]
                                                 },
                                                 ignore_index=True)
             metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/synthetic.csv')
@@ -12,11 +12,17 @@ from src.benchmark.abstract_benchmark import AbstractBenchmark
 from src.buffer.buffer_manager import BufferManager
 from src.buffer.buffer_frame import BufferFrame
 from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
 from src.buffer.dummy_file_manager import DummyFileManager
 from src.buffer.replacement.random_replacer import RandomReplacer
 from src.buffer.replacement.two_q_replacer import TwoQReplacer
 from src.buffer.replacement.lru_replacer import LRUReplacer
 from src.buffer.replacement.cfdc_replacer import CFDCReplacer
+from src.buffer.replacement.clock_replacer import ClockReplacer
+from src.buffer.replacement.clock_pro_replacer import ClockProReplacer
+from src.buffer.replacement.arc_replacer import ARCReplacer
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
 from src.buffer.metric_collector import Metric, MetricCollector
 from src.util.constants import BENCHMARK_DATA_FOLDER, PAGE_SIZE
 from src.benchmark.abstract_workload_generator import AbstractWorkloadGenerator, WorkloadGeneratorAction
@@ -24,7 +30,15 @@ from src.benchmark.eva_trace_workload_generator import EvaTraceWorkloadGenerator
 
 VIDEO_PAGE_SIZE = 4 * 2 ** 20
 DATA_FOLDER = "data/eva_benchmark/"
+# Video files grow by this many bytes at a time
+EXTENT_SIZE = 64 * 2 ** 20
 WITH_TIMING = False
+# FileManager for O_DIRECT I/O or MmapFileManager for memory-mapped segment files
+FILE_MANAGER = FileManager
+# Background write-back threads, 0 writes dirty evictions on the fixing thread
+FLUSHER_THREAD_COUNT = 0
+# Frames kept free by the background evictor, 0 disables it
+FREE_FRAMES_HIGH_WATERMARK = 0
 
 class EvaBenchmark(AbstractBenchmark):
     def __init__(self, repetitions, frame_count, replacer, metric_collector, read_ratio):
@@ -40,20 +54,26 @@ class EvaBenchmark(AbstractBenchmark):
     def _setUp(self):
         self._metric_collector.reset()
         if WITH_TIMING:
-            self._file_manager = FileManager(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER)
+            self._file_manager = FILE_MANAGER(page_size=VIDEO_PAGE_SIZE, directory = DATA_FOLDER, extent_size = EXTENT_SIZE)
         else:
             self._file_manager = DummyFileManager(page_size=VIDEO_PAGE_SIZE)
         self._buffer_manager = BufferManager(self._frame_count,
                                              self._frame_size,
                                              self._replacer(),
                                              self._file_manager,
-                                             self._metric_collector)
+                                             self._metric_collector,
+                                             flusher_thread_count=FLUSHER_THREAD_COUNT,
+                                             free_frames_low_watermark=FREE_FRAMES_HIGH_WATERMARK // 2,
+                                             free_frames_high_watermark=FREE_FRAMES_HIGH_WATERMARK)
         self._frames: Dict[int, BufferFrame] = {}
         total_requests = 100000 if WITH_TIMING else 100000
         self._workload_generator = EvaTraceWorkloadGenerator(total_requests=total_requests, read_ratio=self._read_ratio)
         
         self._random_generator = default_rng(seed=12345)
 
+    def _tearDown(self):
+        self._buffer_manager.close()
+
     def _run(self):
         while not self._workload_generator.trace_done():
             worker_num = int(self._random_generator.uniform(0, self._num_workers))
@@ -74,7 +94,7 @@ class EvaBenchmark(AbstractBenchmark):
 
 def setup():
     # Create empty files for later reads/writes
-    file_manager = FileManager(directory=DATA_FOLDER)
+    file_manager = FILE_MANAGER(directory=DATA_FOLDER)
     os.makedirs(DATA_FOLDER, exist_ok=True)
     for i in range(0, 4):
         file_name = f"{i}"
@@ -97,7 +117,12 @@ if __name__ == '__main__':
             replacers = [("Random", lambda: RandomReplacer(frame_count)),
                         ("2Q", lambda: TwoQReplacer(frame_count)),
                         ("LRU", lambda: LRUReplacer(frame_count)),
-                        ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=2))]
+                        ("CFDC", lambda: CFDCReplacer(frame_count, max_cluster_size=2)),
+                        ("CLOCK", lambda: ClockReplacer(frame_count)),
+                        ("CLOCK-Pro", lambda: ClockProReplacer(frame_count)),
+                        ("ARC", lambda: ARCReplacer(frame_count)),
+                        ("CFLRU", lambda: CFLRUReplacer(frame_count)),
+                        ("LRU-WSR", lambda: LRUWSRReplacer(frame_count))]
             for replacer in replacers:
                 metric_collector = MetricCollector()
                 benchmark = EvaBenchmark(2 if WITH_TIMING else 1, frame_count, replacer[1], metric_collector, read_ratio)
@@ -112,7 +137,12 @@ if __name__ == '__main__':
                                                     'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
                                                     'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
                                                     'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
-                                                    'time': measurement
+                                                    'time': measurement,
+                                                    'fix_latency_p50': metric_collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 50),
+                                                    'fix_latency_p99': metric_collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 99),
+                                                    'fix_latency_p999': metric_collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 99.9),
+                                                    'pending_write_wait_p99': metric_collector.get_percentile(Metric.BUFFER_MANAGER_PENDING_WRITE_WAIT, 99),
+                                                    'num_background_cleans': metric_collector.get_metric(Metric.BUFFER_MANAGER_BACKGROUND_CLEANS)
                                                     },
                                                     ignore_index=True)
                 else:
@@ -123,6 +153,8 @@ if __name__ == '__main__':
                                                     'num_accesses': metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES),
                                                     'num_dirty_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS),
                                                     'num_evictions': metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                                                    # Without I/O the run time is the CPU cost of the buffer manager
+                                                    'time': benchmark.time_measurements[0]
                                                     },
                                                     ignore_index=True)
                 metrics_df.to_csv(f'{BENCHMARK_DATA_FOLDER}/trace_{int(read_ratio*100)}p_reads_timing.csv')
@@ -27,10 +27,12 @@ class OHJWorkloadGenerator(AbstractWorkloadGenerator):
     OHJ = Ou, Harder, Jin (research paper's authors)
     Single page requests are randomly generated between 1 and 100,000 (80-20 distribution)
     Starting page numbers of the scans are uniformly distributed between 1 and 100,000
-
+    batch_scans: Yields every scan as one FIX_PAGES and one UNFIX_PAGES action
+        instead of fixing its pages one at a time
     """
-    def __init__(self):
+    def __init__(self, batch_scans = False):
         super().__init__()
+        self.batch_scans = batch_scans
         self.total_pages = 100000
         self.num_single_pages = self.total_pages
         self.num_scans = 100
@@ -90,12 +92,22 @@ class OHJWorkloadGenerator(AbstractWorkloadGenerator):
             elif type == 3 and self._curr_seq_read != self.num_scans - 1: # sequential read
                 start_page = self._seq_reads[self._curr_seq_read]
                 self._curr_seq_read += 1
+                if self.batch_scans:
+                    pages = list(range(start_page, start_page + self.scan_length))
+                    yield (WorkloadGeneratorAction.FIX_PAGES, pages, False)
+                    yield (WorkloadGeneratorAction.UNFIX_PAGES, pages, False)
+                    continue
                 for i in range(0, self.scan_length):
                     yield (WorkloadGeneratorAction.FIX_PAGE, start_page + i, False)
                     yield (WorkloadGeneratorAction.UNFIX_PAGE, start_page + i, False)
             elif type == 4 and self._curr_seq_write != self.num_scans - 1:  # sequential read
                 start_page = self._seq_writes[self._curr_seq_write]
                 self._curr_seq_write += 1
+                if self.batch_scans:
+                    pages = list(range(start_page, start_page + self.scan_length))
+                    yield (WorkloadGeneratorAction.FIX_PAGES, pages, True)
+                    yield (WorkloadGeneratorAction.UNFIX_PAGES, pages, True)
+                    continue
                 for i in range(0, self.scan_length):
                     yield (WorkloadGeneratorAction.FIX_PAGE, start_page + i, True)
                     yield (WorkloadGeneratorAction.UNFIX_PAGE, start_page + i, True)
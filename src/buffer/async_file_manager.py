@@ -0,0 +1,108 @@
+from concurrent.futures import Future
+from enum import Enum
+from queue import PriorityQueue
+from threading import BoundedSemaphore, Lock, Thread
+from typing import Callable, Dict, List
+import itertools
+
+from src.buffer.file_manager import FileManager
+
+class IOPriority(Enum):
+    DEMAND = 0
+    PREFETCH = 1
+    WRITE_BACK = 2
+
+"""Runs the reads and writes of a FileManager on a pool of I/O threads,
+so that a caller can keep several requests in flight and the device can
+work on them in parallel. Each request returns a future.
+
+Requests are served by priority class: demand reads first, then
+prefetches, then write-backs, and in submission order within a class.
+Each class may have at most queue_depth requests outstanding, submitting
+more blocks the caller until one completes. Since the classes are bounded
+separately, demand reads never wait behind a backlog of write-backs.
+"""
+class AsyncFileManager():
+    """
+    Arguments
+        file_manager: The file manager doing the I/O. It must allow
+            concurrent calls, like FileManager does.
+        thread_count: The number of I/O threads
+        queue_depth: The maximum number of outstanding requests per
+            priority class
+    """
+    def __init__(self,
+                 file_manager: FileManager,
+                 thread_count: int = 4,
+                 queue_depth: int = 32):
+        if thread_count < 1 or queue_depth < 1:
+            raise ValueError("thread_count and queue_depth must be at least 1.")
+        self._file_manager = file_manager
+        self._queue = PriorityQueue()
+        # Breaks ties between requests of the same class in submission order
+        self._sequence = itertools.count()
+        self._slots: Dict[IOPriority, BoundedSemaphore] = {priority: BoundedSemaphore(queue_depth)
+                                                            for priority in IOPriority}
+        self._mutex = Lock()
+        self._stopped = False
+        self._threads = [Thread(target=self._io_loop, daemon=True) for i in range(thread_count)]
+        for thread in self._threads:
+            thread.start()
+
+    def read_block(self, file_name: str, page_id: int, dest: bytearray,
+                   priority: IOPriority = IOPriority.DEMAND) -> Future:
+        return self._submit(priority, self._file_manager.read_block, file_name, page_id, dest)
+
+    def read_blocks(self, file_name: str, page_id: int, dests: List[bytearray],
+                    priority: IOPriority = IOPriority.DEMAND) -> Future:
+        return self._submit(priority, self._file_manager.read_blocks, file_name, page_id, dests)
+
+    def write_block(self, file_name: str, page_id: int, src: bytearray,
+                    priority: IOPriority = IOPriority.WRITE_BACK) -> Future:
+        return self._submit(priority, self._file_manager.write_block, file_name, page_id, src)
+
+    def write_blocks(self, file_name: str, page_id: int, srcs: List[bytearray],
+                     priority: IOPriority = IOPriority.WRITE_BACK) -> Future:
+        return self._submit(priority, self._file_manager.write_blocks, file_name, page_id, srcs)
+
+    """ Queues a request and returns its future.
+    Blocks while the priority class has queue_depth outstanding requests.
+    """
+    def _submit(self, priority: IOPriority, io_function: Callable, *args) -> Future:
+        self._slots[priority].acquire()
+        future = Future()
+        with self._mutex:
+            if self._stopped:
+                self._slots[priority].release()
+                raise RuntimeError("Cannot submit I/O after shutdown.")
+            self._queue.put((priority.value, next(self._sequence), priority, future, io_function, args))
+        return future
+
+    """ Completes all queued requests and stops the I/O threads
+    """
+    def shutdown(self):
+        with self._mutex:
+            if self._stopped:
+                return
+            self._stopped = True
+            # Stop requests sort after all requests of every class
+            for thread in self._threads:
+                self._queue.put((len(IOPriority), next(self._sequence), None, None, None, None))
+        for thread in self._threads:
+            thread.join()
+
+    def _io_loop(self):
+        while True:
+            _, _, priority, future, io_function, args = self._queue.get()
+            if future == None:
+                return
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        io_function(*args)
+                    except BaseException as error:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(None)
+            finally:
+                self._slots[priority].release()
@@ -0,0 +1,45 @@
+from threading import Thread, Event
+from typing import Callable
+import traceback
+
+"""Background thread that keeps a number of frames of the buffer pool free,
+so that a miss can take a free frame instead of evicting a page itself.
+"""
+class BackgroundEvictor():
+    _eviction_interval = 0.1 # seconds
+
+    """
+    Arguments
+        evict_frames: Evicts pages until the free frame high watermark is
+            reached. Called whenever eviction is requested and periodically.
+    """
+    def __init__(self, evict_frames: Callable[[], None]):
+        self._evict_frames = evict_frames
+        self._eviction_requested = Event()
+        self._stopped = Event()
+        self._thread = Thread(target=self._evict_loop, daemon=True)
+        self._thread.start()
+
+    """ Wakes up the evictor thread
+    """
+    def request_eviction(self):
+        self._eviction_requested.set()
+
+    def shutdown(self):
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._eviction_requested.set()
+        self._thread.join()
+
+    def _evict_loop(self):
+        while not self._stopped.is_set():
+            self._eviction_requested.wait(BackgroundEvictor._eviction_interval)
+            if self._stopped.is_set():
+                return
+            self._eviction_requested.clear()
+            try:
+                self._evict_frames()
+            except Exception:
+                # Keep evicting, misses fall back to evicting themselves
+                traceback.print_exc()
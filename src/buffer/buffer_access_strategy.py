@@ -0,0 +1,55 @@
+from typing import List
+
+from src.util.constants import INVALID_FRAME_ID
+
+"""Private ring of frames for a bulk sequential read, like the buffer access
+strategies of PostgreSQL. A scan that fixes its pages with a strategy reads
+new pages into the frames of its ring, recycling them round robin, instead
+of evicting the pages of other users through the replacer.
+
+Pages in the ring are not known to the replacer. A page of the ring that is
+fixed without the strategy is adopted by the replacer and leaves the ring.
+The ring should be larger than the number of pages the scan keeps fixed at
+the same time, since a fixed frame cannot be recycled.
+"""
+class BufferAccessStrategy():
+    """
+    Arguments
+        ring_size: The number of frames in the ring
+    """
+    def __init__(self, ring_size: int = 16):
+        if ring_size < 1:
+            raise ValueError("ring_size must be at least 1.")
+        self._ring_size = ring_size
+        self._frame_ids: List[int] = []
+        self._current = 0
+
+    @property
+    def ring_size(self) -> int:
+        return self._ring_size
+
+    @property
+    def frame_ids(self) -> List[int]:
+        return self._frame_ids
+
+    """ Returns the frame to recycle for the next page, or INVALID_FRAME_ID
+    while the ring is not full yet
+    """
+    def get_next_frame(self) -> int:
+        if len(self._frame_ids) < self._ring_size:
+            return INVALID_FRAME_ID
+        return self._frame_ids[self._current]
+
+    """ Puts the frame of the next page into the ring, replacing the frame
+    returned by get_next_frame once the ring is full
+    """
+    def add_frame(self, frame_id: int):
+        if len(self._frame_ids) < self._ring_size:
+            self._frame_ids.append(frame_id)
+        else:
+            self._frame_ids[self._current] = frame_id
+        self._current = (self._current + 1) % self._ring_size
+
+    def clear(self):
+        self._frame_ids = []
+        self._current = 0
@@ -1,71 +1,337 @@
 from __future__ import annotations
-import mmap
+from typing import Callable, List, Tuple
+import math
+
+from src.buffer.frame_arena import FrameArena
+from src.buffer.frame_descriptor_table import FrameDescriptorTable
 
 class BufferFrame():
-    def __init__(self, frame_id: int, page_size: int, data: bytearray = None):
-        self._dirty = False
-        self._page_id = -1
+    __slots__ = ('_frame_id', '_page_size', '_descriptors', '_index', '_data', '_arena', '_slot',
+                 '_sector_size', '_dirty_sectors', '_bytes_dirtied', '_ranges_marked', '_shadow',
+                 '_valid_sectors', '_fault_in')
+
+    """
+    Arguments
+        arena: If given, the frame's data is the slot of the arena with
+            the same id as the frame, unless data is given as well
+        slot: The arena slot backing data
+        descriptors: The descriptor table holding the frame's metadata at
+            index frame_id. A frame without one keeps its metadata in a
+            table of its own.
+        sector_size: The granularity in bytes at which dirty ranges are
+            tracked. 0 tracks only whether the whole page is dirty.
+        fault_in: Reads the given (offset, length) ranges of the frame's page
+            into its data. Called by read and write for sectors of a
+            partially read page that are not valid yet.
+    """
+    def __init__(self, frame_id: int, page_size: int, data: bytearray = None,
+                 arena: FrameArena = None, slot: int = None,
+                 descriptors: FrameDescriptorTable = None, sector_size: int = 0,
+                 fault_in: Callable[[BufferFrame, List[Tuple[int, int]]], None] = None):
         self._frame_id = frame_id
         self._page_size = page_size
-        self._exclusive = False
-        # self._data = mmap.mmap(-1, self._page_size)
-        # Make sure the memory is allocated
-        # self._data.write(bytes(self._page_size))
-        if data != None:
-            self._data = data
+        if descriptors != None:
+            self._descriptors = descriptors
+            self._index = frame_id
         else:
-            self._data = bytearray(self._page_size)
-    
-    def __del__(self):
-        # self._data.close()
-        pass
+            self._descriptors = FrameDescriptorTable(1)
+            self._index = 0
+        self._arena = arena
+        self._slot = slot
+        self._data = data
+        self._sector_size = sector_size
+        self._dirty_sectors = None
+        if sector_size > 0:
+            self._dirty_sectors = bytearray(math.ceil(page_size / sector_size))
+        self._bytes_dirtied = 0
+        self._ranges_marked = False
+        self._shadow = None
+        # None if the whole page is valid
+        self._valid_sectors = None
+        self._fault_in = fault_in
+        if data == None:
+            if self._arena != None:
+                # The memoryview of the slot is created on first access
+                self._slot = frame_id
+            else:
+                self._data = bytearray(self._page_size)
 
     @property
     def dirty(self) -> bool:
-        return self._dirty
+        return self._descriptors.dirty[self._index] != 0
     
+    """ Marking a frame clean also forgets its dirty ranges
+    """
     @dirty.setter
     def dirty(self, is_dirty: bool):
-        self._dirty = is_dirty
+        self._descriptors.dirty[self._index] = is_dirty
+        if not is_dirty:
+            self._bytes_dirtied = 0
+            if self._dirty_sectors != None:
+                self._dirty_sectors[:] = bytes(len(self._dirty_sectors))
+
+    @property
+    def sector_size(self) -> int:
+        return self._sector_size
+
+    """ The number of bytes marked dirty since the frame was last clean
+    """
+    @property
+    def bytes_dirtied(self) -> int:
+        return self._bytes_dirtied
+
+    """ Whether mark_dirty was called since ranges_marked was last reset
+    """
+    @property
+    def ranges_marked(self) -> bool:
+        return self._ranges_marked
+
+    @ranges_marked.setter
+    def ranges_marked(self, ranges_marked: bool):
+        self._ranges_marked = ranges_marked
+
+    """ Marks length bytes starting at offset as modified, and the frame
+    as dirty. Only the sectors covering marked ranges are written back.
+    """
+    def mark_dirty(self, offset: int, length: int):
+        self._check_range(offset, length)
+        self.dirty = True
+        self._ranges_marked = True
+        self._bytes_dirtied += length
+        if self._dirty_sectors != None and length > 0:
+            first_sector, last_sector = self._get_sector_span(offset, length)
+            self._dirty_sectors[first_sector:last_sector + 1] = b'\x01' * (last_sector - first_sector + 1)
+
+    def _check_range(self, offset: int, length: int):
+        if offset < 0 or length < 0 or offset + length > self._page_size:
+            raise ValueError(f"Range [{offset}, {offset + length}) is outside of the page.")
+
+    """ Returns the first and the last sector covering a non-empty range
+    """
+    def _get_sector_span(self, offset: int, length: int) -> Tuple[int, int]:
+        return offset // self._sector_size, (offset + length - 1) // self._sector_size
+
+    """ Returns the runs of sectors of a sector map whose entry equals value
+    as (offset, length) byte ranges, within the sectors from first to last
+    """
+    def _get_sector_runs(self, sectors: bytearray, value: int, first: int, last: int) -> List[Tuple[int, int]]:
+        ranges = []
+        sector = first
+        while sector <= last:
+            if sectors[sector] == value:
+                end = sector
+                while end <= last and sectors[end] == value:
+                    end += 1
+                offset = sector * self._sector_size
+                ranges.append((offset, min(end * self._sector_size, self._page_size) - offset))
+                sector = end
+            else:
+                sector += 1
+        return ranges
+
+    """ Returns the (offset, length) ranges of whole sectors covering a byte
+    range, or the whole page without a sector size
+    """
+    def get_sector_ranges(self, offset: int, length: int) -> List[Tuple[int, int]]:
+        self._check_range(offset, length)
+        if self._sector_size == 0:
+            return [(0, self._page_size)]
+        if length == 0:
+            return []
+        first_sector, last_sector = self._get_sector_span(offset, length)
+        start = first_sector * self._sector_size
+        return [(start, min((last_sector + 1) * self._sector_size, self._page_size) - start)]
+
+    """ Marks the whole page as valid, after it has been read completely
+    """
+    def set_all_valid(self):
+        self._valid_sectors = None
+
+    """ Marks only the sectors of ranges as valid, after they have been
+    read on their own
+    """
+    def set_valid_ranges(self, ranges: List[Tuple[int, int]]):
+        self._valid_sectors = bytearray(math.ceil(self._page_size / self._sector_size))
+        self.mark_valid(ranges)
+
+    """ Marks the sectors of ranges as valid, once they have been read
+    """
+    def mark_valid(self, ranges: List[Tuple[int, int]]):
+        if self._valid_sectors == None:
+            return
+        for offset, length in ranges:
+            if length > 0:
+                first_sector, last_sector = self._get_sector_span(offset, length)
+                self._valid_sectors[first_sector:last_sector + 1] = b'\x01' * (last_sector - first_sector + 1)
+        if all(self._valid_sectors):
+            self._valid_sectors = None
+
+    """ Returns the (offset, length) ranges of the sectors covering a byte
+    range that have not been read yet
+    """
+    def get_missing_ranges(self, offset: int, length: int) -> List[Tuple[int, int]]:
+        self._check_range(offset, length)
+        if self._valid_sectors == None or length == 0:
+            return []
+        first_sector, last_sector = self._get_sector_span(offset, length)
+        return self._get_sector_runs(self._valid_sectors, 0, first_sector, last_sector)
+
+    """ Returns the (offset, length) ranges of the page that have been read
+    """
+    def get_valid_ranges(self) -> List[Tuple[int, int]]:
+        if self._valid_sectors == None:
+            return [(0, self._page_size)]
+        return self._get_sector_runs(self._valid_sectors, 1, 0, len(self._valid_sectors) - 1)
+
+    """ Reads the missing sectors covering a byte range of the page
+    """
+    def ensure_valid(self, offset: int, length: int):
+        missing_ranges = self.get_missing_ranges(offset, length)
+        if len(missing_ranges) > 0:
+            self._fault_in(self, missing_ranges)
+
+    """ Returns a view of length bytes of the page starting at offset,
+    reading sectors of a partially read page that are missing first
+    """
+    def read(self, offset: int, length: int) -> memoryview:
+        self.ensure_valid(offset, length)
+        return memoryview(self.data)[offset:offset + length]
+
+    """ Copies src into the page at offset and marks the range dirty.
+    Sectors of a partially read page that are missing are read first,
+    since the rest of a sector must not be overwritten on write-back.
+    """
+    def write(self, offset: int, src: bytes):
+        self.ensure_valid(offset, len(src))
+        self.data[offset:offset + len(src)] = src
+        self.mark_dirty(offset, len(src))
+
+    """ Returns the (offset, length) byte ranges that must be written back,
+    which are runs of dirty sectors. A dirty frame without tracked sectors
+    returns the whole page.
+    """
+    def get_dirty_ranges(self) -> List[Tuple[int, int]]:
+        if not self.dirty:
+            return []
+        if self._dirty_sectors == None or not any(self._dirty_sectors):
+            return [(0, self._page_size)]
+        return self._get_sector_runs(self._dirty_sectors, 1, 0, len(self._dirty_sectors) - 1)
+
+    """ Keeps a copy of the data, against which mark_changed_sectors
+    compares it later
+    """
+    def save_shadow(self):
+        self._shadow = bytes(self.data)
+
+    """ Marks the sectors that differ from the copy made by save_shadow as
+    dirty and drops the copy.
+    Returns true if any sector has changed.
+    """
+    def mark_changed_sectors(self) -> bool:
+        if self._shadow == None:
+            return False
+        changed = False
+        data = memoryview(self.data)
+        sector_size = self._sector_size if self._sector_size > 0 else self._page_size
+        for offset in range(0, self._page_size, sector_size):
+            end = min(offset + sector_size, self._page_size)
+            if data[offset:end] != self._shadow[offset:end]:
+                self.mark_dirty(offset, end - offset)
+                changed = True
+        data.release()
+        self._shadow = None
+        return changed
+
+    """ Drops the copy made by save_shadow without comparing it
+    """
+    def drop_shadow(self):
+        self._shadow = None
 
     @property
     def page_id(self) -> int:
-        return self._page_id
+        return self._descriptors.page_ids[self._index]
     
     @page_id.setter
-    def page_id(self, page_id: bool):
-        self._page_id = page_id
+    def page_id(self, page_id: int):
+        self._descriptors.page_ids[self._index] = page_id
 
     @property
     def frame_id(self) -> int:
         return self._frame_id
     
     @frame_id.setter
-    def frame_id(self, frame_id: bool):
+    def frame_id(self, frame_id: int):
         self._frame_id = frame_id
     
     @property
     def exclusive(self) -> bool:
-        return self._exclusive
+        return self._descriptors.exclusive[self._index] != 0
     
     @exclusive.setter
     def exclusive(self, is_exclusive: bool):
-        self._exclusive = is_exclusive
+        self._descriptors.exclusive[self._index] = is_exclusive
+
+    @property
+    def slot(self) -> int:
+        return self._slot
 
     @property
     def data(self) -> bytearray:
+        if self._data == None:
+            self._data = self._arena.get_slot(self._slot)
         return self._data
     
     @data.setter
     def data(self, data: bytearray):
         self._data = data
     
+    """ Returns a copy of the frame with its own copy of the data
+    """
+    def snapshot(self) -> BufferFrame:
+        if self._arena != None:
+            slot = self._arena.acquire_spare()
+            copy = BufferFrame(self._frame_id, self._page_size, self._arena.get_slot(slot),
+                               self._arena, slot, sector_size=self._sector_size)
+            copy.data[:] = self.data
+        else:
+            copy = BufferFrame(self._frame_id, self._page_size, bytearray(self.data),
+                               sector_size=self._sector_size)
+        self._copy_dirty_state(copy)
+        copy.page_id = self.page_id
+        return copy
+
+    """ Returns a copy of the frame that takes over its data, and gives the
+    frame new memory for the next page.
+    Frames backed by an arena only give away their slot if they are dirty,
+    since only dirty data is still needed for writing it back. The frame
+    continues with a spare slot then. A clean frame shares its data with
+    the copy and keeps it, so nothing is allocated or copied.
+    """
     def move(self) -> BufferFrame:
-        copy = BufferFrame(self._frame_id, self._page_size, self._data)
-        copy.dirty = self._dirty
-        copy.page_id = self._page_id
-
-        # new_data = mmap.mmap(-1, self._page_size)
-        new_data = bytearray(self._page_size)
-        self._data = new_data
-        return copy
\ No newline at end of file
+        copy = BufferFrame(self._frame_id, self._page_size, self.data, self._arena, self._slot,
+                           sector_size=self._sector_size)
+        self._copy_dirty_state(copy)
+        copy.page_id = self.page_id
+
+        if self._arena == None:
+            self._data = bytearray(self._page_size)
+        elif self.dirty:
+            self._slot = self._arena.acquire_spare()
+            self._data = self._arena.get_slot(self._slot)
+        return copy
+
+    def _copy_dirty_state(self, copy: BufferFrame):
+        copy.dirty = self.dirty
+        copy._bytes_dirtied = self._bytes_dirtied
+        if self._dirty_sectors != None:
+            copy._dirty_sectors[:] = self._dirty_sectors
+
+    """ Returns the slot of a copy made by move or snapshot to the arena,
+    once the copy has been written back
+    """
+    def release(self):
+        if self._arena != None:
+            self._arena.release_spare(self._slot)
+            self._arena = None
+            self._slot = None
+            self._data = None
\ No newline at end of file
@@ -1,24 +1,76 @@
-from threading import Lock
-from typing import Tuple
+from threading import Lock, Event
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+import asyncio
 import time
 
 from src.buffer.metric_collector import MetricCollector, Metric
 from src.buffer.error import BufferFullError
 from src.buffer.buffer_frame import BufferFrame
+from src.buffer.buffer_access_strategy import BufferAccessStrategy
+from src.buffer.frame_arena import FrameArena
+from src.buffer.frame_descriptor_table import FrameDescriptorTable
 from src.buffer.replacement.abstract_replacer import AbstractReplacer
 from src.buffer.file_manager import FileManager
-from src.util.constants import INVALID_FRAME_ID
-from src.util.AtomicInteger import AtomicInteger
+from src.buffer.write_back_flusher import WriteBackFlusher
+from src.buffer.background_evictor import BackgroundEvictor
+from src.buffer.prefetcher import Prefetcher
+from src.util.constants import INVALID_FRAME_ID, INVALID_PAGE_ID
 from src.util.ReaderWriterLock import ReaderWriterLock
 from src.util.page_id_utils import get_segment_id, get_segment_page_id
 
 class BufferManager():
+    # Bounds of the delay between two attempts of a coroutine to take a latch
+    _async_min_backoff = 0.0001 # seconds
+    _async_max_backoff = 0.01 # seconds
+
+    """
+    Arguments
+        flusher_thread_count: The number of background threads writing back
+            dirty frames. 0 writes dirty frames on the fixing thread.
+        flusher_queue_size: The maximum number of queued background writes
+        dirty_high_watermark: Fraction of dirty frames above which the flusher
+            starts cleaning unpinned dirty frames ahead of eviction
+        dirty_low_watermark: Fraction of dirty frames at which cleaning stops
+        free_frames_low_watermark: Number of free frames below which the
+            background evictor starts evicting pages
+        free_frames_high_watermark: Number of free frames the background
+            evictor evicts pages up to. 0 disables the background evictor.
+        spare_frame_count: Number of spare page slots in the frame arena. Each
+            dirty page that is evicted but not yet written back holds one.
+        prefetch_max_depth: The maximum number of pages the prefetcher reads
+            ahead of a sequential run. 0 disables prefetching.
+        prefetch_thread_count: The number of I/O threads of the prefetcher
+        async_executor: The executor running the I/O of fix_page_async.
+            None uses the default executor of the event loop.
+        sector_size: The granularity in bytes at which frames track dirty
+            ranges, so that only dirty sectors are written back. 0 writes
+            back whole pages.
+        diff_on_unfix: Whether the dirty sectors of a page fixed exclusively
+            are found by comparing it with a copy taken when it was fixed,
+            instead of relying on mark_dirty. Without a sector_size, only
+            pages that changed at all are dirty.
+    """
     def __init__(self,
                  frame_count: int,
                  page_size: int,
                  replacer: AbstractReplacer,
                  file_manager: FileManager,
-                 metric_collector: MetricCollector):
+                 metric_collector: MetricCollector,
+                 flusher_thread_count: int = 0,
+                 flusher_queue_size: int = 16,
+                 dirty_high_watermark: float = 0.5,
+                 dirty_low_watermark: float = 0.25,
+                 free_frames_low_watermark: int = 0,
+                 free_frames_high_watermark: int = 0,
+                 spare_frame_count: int = 16,
+                 prefetch_max_depth: int = 0,
+                 prefetch_thread_count: int = 2,
+                 async_executor: Executor = None,
+                 sector_size: int = 0,
+                 diff_on_unfix: bool = False):
         self._frame_count = frame_count
         self._page_size = page_size
         self._replacer = replacer
@@ -26,46 +78,204 @@ class BufferManager():
         self._metric_collector = metric_collector
 
         self._frames_lock = Lock()
-        self._frames = []
-        for i in range(self._frame_count):
-            self._frames.append(BufferFrame(i, self._page_size))
+        self._arena = FrameArena(self._frame_count, self._page_size, spare_frame_count)
+        self._descriptors = FrameDescriptorTable(self._frame_count)
+        # Frames and their latches are created when a frame is used for the first time
+        self._frames = [None] * self._frame_count
         self._page_to_frame = dict()
         self._next_unused_frame = 0
+        # Frames whose page was evicted by the background evictor
+        self._free_frames = deque()
+        # key=frame_id; value=BufferAccessStrategy whose ring holds the frame
+        self._strategy_frames: Dict[int, BufferAccessStrategy] = {}
 
-        self._lock_table = [ReaderWriterLock() for i in range(self._frame_count)]        
-        self._use_counters = [AtomicInteger() for i in range(self._frame_count)]
+        self._lock_table = [None] * self._frame_count
 
         self._pending_writes_lock = Lock()
-        self._pending_writes = set()
+        # key=page_id; value=[<event set when writes complete>, <number of writes>]
+        self._pending_writes: Dict[int, list] = {}
+
+        self._dirty_frame_ids = set()
+        self._dirty_high_watermark = int(dirty_high_watermark * self._frame_count)
+        self._dirty_low_watermark = int(dirty_low_watermark * self._frame_count)
+        self._flusher = None
+        if flusher_thread_count > 0:
+            self._flusher = WriteBackFlusher(self._write_frame,
+                                             self._on_write_complete,
+                                             self._clean_dirty_frames,
+                                             flusher_thread_count,
+                                             flusher_queue_size,
+                                             write_frames=self._write_frames)
+        self._free_frames_low_watermark = free_frames_low_watermark
+        self._free_frames_high_watermark = free_frames_high_watermark
+        self._evictor = None
+        if free_frames_high_watermark > 0:
+            self._evictor = BackgroundEvictor(self._evict_frames)
+        # Pages read by the prefetcher that have not been used yet
+        self._prefetched_pages = set()
+        self._prefetcher = None
+        if prefetch_max_depth > 0:
+            self._prefetcher = Prefetcher(self._prefetch_page,
+                                          max_depth=prefetch_max_depth,
+                                          thread_count=prefetch_thread_count)
+        self._async_executor = async_executor
+        self._sector_size = sector_size
+        self._diff_on_unfix = diff_on_unfix
+        self._fault_in = BufferManager._create_fault_in(file_manager, metric_collector)
+        self._closed = False
 
-    
     def __del__(self):
-        for frame in self._frames:
-            if frame.dirty:
-                self._write_frame(frame)
-    
-    """ Waits for a pending write to complete, if needed.
-    Preconditions: _frames_lock has been acquired by the caller.
+        self.close()
+
+    """ Stops the background threads and writes all dirty frames back.
+    A buffer manager with background threads is kept alive by them,
+    so close must be called explicitly.
     """
-    def _wait_for_pending_write(self, page_id: int):
-        self._pending_writes_lock.acquire()
-        while page_id in self._pending_writes:
-            self._pending_writes_lock.release()
-            time.sleep(0.0001)
-            self._pending_writes_lock.acquire()
-        self._pending_writes_lock.release()
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._prefetcher != None:
+            self._prefetcher.shutdown()
+        if self._evictor != None:
+            self._evictor.shutdown()
+        if self._flusher != None:
+            self._flusher.shutdown()
+        dirty_frames = [frame for frame in self._frames if frame != None and frame.dirty]
+        self._write_frames(dirty_frames)
+        for frame in dirty_frames:
+            frame.dirty = False
     
+    """ Waits for a pending write to complete.
+    Preconditions: _frames_lock must not be held by the caller, since the
+    writer does not need it to complete the write.
+    """
+    def _wait_for_pending_write(self, pending_write: Event):
+        start = time.perf_counter()
+        pending_write.wait()
+        self._metric_collector.record(Metric.BUFFER_MANAGER_PENDING_WRITE_WAIT,
+                                      time.perf_counter() - start)
+
+    """ Returns the event signalled once the pending write of page_id
+    completes, or None if page_id has no pending write
+    """
+    def _get_pending_write(self, page_id: int) -> Event:
+        with self._pending_writes_lock:
+            if page_id in self._pending_writes:
+                return self._pending_writes[page_id][0]
+            return None
+
     """ Adds page_id to list of pending writes
     """
     def _add_pending_write(self, page_id: int):
         with self._pending_writes_lock:
-            self._pending_writes.add(page_id)
+            if page_id in self._pending_writes:
+                self._pending_writes[page_id][1] += 1
+            else:
+                self._pending_writes[page_id] = [Event(), 1]
 
-    """ Removes page_id from list of pending writes
+    """ Removes one write of page_id from list of pending writes and
+    wakes up the threads waiting for it once no write is left
     """
     def _remove_pending_write(self, page_id: int):
         with self._pending_writes_lock:
-            self._pending_writes.discard(page_id)
+            pending_write = self._pending_writes.get(page_id)
+            if pending_write == None:
+                return
+            pending_write[1] -= 1
+            if pending_write[1] > 0:
+                return
+            del self._pending_writes[page_id]
+        pending_write[0].set()
+
+    """ Called by the flusher once a background write has completed
+    """
+    def _on_write_complete(self, frame: BufferFrame):
+        self._remove_pending_write(frame.page_id)
+        frame.release()
+
+    """ Takes copies of unpinned dirty frames and marks the frames clean until
+    the number of dirty frames drops to the low watermark.
+    Returns the copies, which must be written back by the caller.
+    """
+    def _clean_dirty_frames(self) -> List[BufferFrame]:
+        frames_to_write = []
+        with self._frames_lock:
+            frames_to_clean = len(self._dirty_frame_ids) - self._dirty_low_watermark
+            for frame_id in list(self._dirty_frame_ids):
+                if len(frames_to_write) >= frames_to_clean:
+                    break
+                # Pinned frames may still be modified
+                if self._descriptors.pin_counts[frame_id] > 0:
+                    continue
+                frame = self._frames[frame_id]
+                frames_to_write.append(frame.snapshot())
+                frame.dirty = False
+                self._dirty_frame_ids.discard(frame_id)
+                # Reading the page back must wait until its copy is written
+                self._add_pending_write(frame.page_id)
+                self._metric_collector.increment(Metric.BUFFER_MANAGER_BACKGROUND_CLEANS)
+        return frames_to_write
+
+    """ Evicts pages in a batch and puts their frames on the free frame list,
+    once fewer than free_frames_low_watermark frames are free, until
+    free_frames_high_watermark frames are free.
+    """
+    def _evict_frames(self):
+        evicted_frames = []
+        with self._frames_lock:
+            if len(self._free_frames) >= self._free_frames_low_watermark \
+               or self._next_unused_frame < self._frame_count:
+                return
+            while len(self._free_frames) < self._free_frames_high_watermark:
+                try:
+                    victim_page_id = self._replacer.get_victim()
+                except BufferFullError:
+                    break
+                frame_id, frame_to_evict = self._evict_page(victim_page_id)
+                self._frames[frame_id].page_id = INVALID_PAGE_ID
+                self._frames[frame_id].dirty = False
+                self._free_frames.append(frame_id)
+                evicted_frames.append(frame_to_evict)
+        for frame_to_evict in evicted_frames:
+            self._write_back_evicted_frame(frame_to_evict)
+
+    """ Removes victim_page_id from the pool.
+    Returns the id of its frame and a copy of the evicted frame.
+    Preconditions: _frames_lock has been acquired by the caller and a spare
+    slot is free, if the victim is dirty.
+    """
+    def _evict_page(self, victim_page_id: int) -> Tuple[int, BufferFrame]:
+        frame_id = self._page_to_frame[victim_page_id]
+        frame_to_evict = self._frames[frame_id].move()
+        del(self._page_to_frame[frame_to_evict.page_id])
+        self._dirty_frame_ids.discard(frame_id)
+        if frame_to_evict.dirty:
+            self._add_pending_write(frame_to_evict.page_id)
+        if victim_page_id in self._prefetched_pages:
+            self._prefetched_pages.discard(victim_page_id)
+            self._metric_collector.increment(Metric.BUFFER_MANAGER_PREFETCHES_WASTED)
+            if self._prefetcher != None:
+                self._prefetcher.on_prefetch_wasted(victim_page_id)
+        return frame_id, frame_to_evict
+
+    """ Updates the eviction metrics and writes an evicted frame back
+    if it is dirty.
+    Preconditions: _frames_lock is not held by the caller.
+    """
+    def _write_back_evicted_frame(self, frame_to_evict: BufferFrame):
+        self._metric_collector.increment(Metric.BUFFER_MANAGER_EVICTIONS)
+        if frame_to_evict.dirty:
+            self._metric_collector.increment(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS)
+            if self._flusher != None:
+                self._flusher.submit(frame_to_evict)
+            else:
+                try:
+                    self._write_frame(frame_to_evict)
+                finally:
+                    self._on_write_complete(frame_to_evict)
+        else:
+            self._metric_collector.increment(Metric.BUFFER_MANAGER_CLEAN_EVICTIONS)
     
     """ Returns true if a page is present in the buffer pool
     and false otherwise
@@ -77,67 +287,337 @@ class BufferManager():
     Returns the id of the free frame and a copy of the evicted frame,
     if a frame was evicted to make room for the new one.
     """
-    def _find_frame_to_use(self, page_id: int, is_prefetch=False) -> Tuple[int, BufferFrame, bool]:
+    def _find_frame_to_use(self, page_id: int, is_prefetch=False,
+                           strategy: BufferAccessStrategy = None) -> Tuple[int, BufferFrame, bool]:
+        while True:
+            pending_write = None
+            # Latch frames while finding free frame
+            with self._frames_lock:
+                if page_id not in self._page_to_frame:
+                    pending_write = self._get_pending_write(page_id)
+                if pending_write == None:
+                    if not self._must_wait_for_spare(page_id, strategy):
+                        return self._assign_frame(page_id, is_prefetch, strategy)
+            # The page must not be read back before its pending write completes.
+            # Wait for it or for a spare slot without holding the frames lock,
+            # then look it up again.
+            if pending_write != None:
+                self._wait_for_pending_write(pending_write)
+            else:
+                self._arena.wait_for_spare()
+
+    """ Returns true if assigning a frame to page_id may evict a dirty page
+    while no spare slot is free. Spare slots are only released once the
+    write-backs holding them complete, which may need the frames lock, so
+    the caller must wait for one without holding it.
+    Preconditions: _frames_lock has been acquired by the caller.
+    """
+    def _must_wait_for_spare(self, page_id: int, strategy: BufferAccessStrategy = None) -> bool:
+        if page_id in self._page_to_frame or self._arena.spare_count > 0:
+            return False
+        return strategy != None \
+               or (self._next_unused_frame >= self._frame_count and len(self._free_frames) == 0)
+
+    """ Assigns a frame to page_id, evicting a page if needed.
+    A page that is not present yet is read into the ring of strategy,
+    if one is given.
+    Preconditions: _frames_lock has been acquired by the caller and
+    page_id has no pending write.
+    """
+    def _assign_frame(self, page_id: int, is_prefetch: bool,
+                      strategy: BufferAccessStrategy = None) -> Tuple[int, BufferFrame, bool]:
         frame_id = INVALID_FRAME_ID
         frame_to_evict = None
         found_existing = False
-        
-        # Latch frames while finding free frame
+
+        # Check if page already in pool
+        if page_id in self._page_to_frame:
+            frame_id = self._page_to_frame[page_id]
+            found_existing = True
+            # The page leaves the ring if it is used outside of the scan,
+            # the replacer learns about it when it is pinned below
+            if frame_id in self._strategy_frames and self._strategy_frames[frame_id] is not strategy:
+                del self._strategy_frames[frame_id]
+        # Check for a frame of the strategy's ring to recycle
+        if frame_id == INVALID_FRAME_ID and strategy != None:
+            frame_id, frame_to_evict = self._recycle_strategy_frame(strategy)
+        # Check for unused frame
+        if frame_id == INVALID_FRAME_ID and self._next_unused_frame < self._frame_count:
+            frame_id = self._next_unused_frame
+            self._next_unused_frame += 1
+            self._frames[frame_id] = BufferFrame(frame_id, self._page_size, arena=self._arena,
+                                                 descriptors=self._descriptors,
+                                                 sector_size=self._sector_size,
+                                                 fault_in=self._fault_in)
+            self._lock_table[frame_id] = ReaderWriterLock()
+        # Check for frame freed by the background evictor
+        if frame_id == INVALID_FRAME_ID and len(self._free_frames) > 0:
+            frame_id = self._free_frames.popleft()
+        if not found_existing and self._evictor != None \
+           and len(self._free_frames) < self._free_frames_low_watermark:
+            self._evictor.request_eviction()
+        # Get victim from replacer if not in pool
+        if frame_id == INVALID_FRAME_ID:
+            victim_page_id = self._replacer.get_victim()
+            frame_id, frame_to_evict = self._evict_page(victim_page_id)
+
+        # If no usable frame found
+        if frame_id == INVALID_FRAME_ID:
+            raise BufferFullError()
+
+        if strategy != None and not found_existing:
+            strategy.add_frame(frame_id)
+            self._strategy_frames[frame_id] = strategy
+
+        self._descriptors.inc_pin(frame_id)
+        self._page_to_frame[page_id] = frame_id
+        # Prefetched pages are pinned as well, so that the replacer knows them
+        # once they are unpinned
+        if frame_id not in self._strategy_frames:
+            self._replacer.pin_page(page_id)
+
+        if is_prefetch and not found_existing:
+            self._prefetched_pages.add(page_id)
+            self._metric_collector.increment(Metric.BUFFER_MANAGER_PREFETCHES)
+        elif not is_prefetch and page_id in self._prefetched_pages:
+            self._prefetched_pages.discard(page_id)
+            self._metric_collector.increment(Metric.BUFFER_MANAGER_PREFETCHES_USED)
+            if self._prefetcher != None:
+                self._prefetcher.on_prefetch_used(page_id)
+
+        # If page is new to the pool, update frame metadata
+        if not found_existing:
+            self._frames[frame_id].dirty = False
+            self._frames[frame_id].page_id = page_id
+            # Lock frame in exclusive mode for reading
+            self._lock_frame(frame_id, True)
+
+        return frame_id, frame_to_evict, found_existing
+    
+    """ Evicts the page of the next frame in the ring of strategy, so that the
+    frame can be reused. Returns INVALID_FRAME_ID if the ring is not full
+    yet or its next frame cannot be recycled, because it is fixed or has
+    left the ring. A frame that is fixed by the scan itself is handed over
+    to the replacer, since the ring is moving past it.
+    Preconditions: _frames_lock has been acquired by the caller.
+    """
+    def _recycle_strategy_frame(self, strategy: BufferAccessStrategy) -> Tuple[int, BufferFrame]:
+        frame_id = strategy.get_next_frame()
+        if frame_id == INVALID_FRAME_ID or self._strategy_frames.get(frame_id) is not strategy:
+            return INVALID_FRAME_ID, None
+        if self._descriptors.pin_counts[frame_id] > 0:
+            self._adopt_strategy_frame(frame_id)
+            return INVALID_FRAME_ID, None
+        return self._evict_page(self._frames[frame_id].page_id)
+
+    """ Removes a fixed frame from the ring of its strategy and hands its page
+    over to the replacer, which is told about the page once it is unfixed.
+    Preconditions: _frames_lock has been acquired by the caller.
+    """
+    def _adopt_strategy_frame(self, frame_id: int):
+        del self._strategy_frames[frame_id]
+        self._replacer.pin_page(self._frames[frame_id].page_id)
+
+    """ Releases the frames of a strategy whose scan has finished.
+    Unfixed pages of its ring are evicted and their frames put on the free
+    frame list, so that the scan leaves no pages behind. Pages that are still
+    fixed are handed over to the replacer.
+    """
+    def free_access_strategy(self, strategy: BufferAccessStrategy):
+        evicted_frames = []
         with self._frames_lock:
-            self._wait_for_pending_write(page_id)
-            # Check if page already in pool
-            if page_id in self._page_to_frame:
-                frame_id = self._page_to_frame[page_id]
-                found_existing = True
-            # Check for unused frame
-            if frame_id == INVALID_FRAME_ID and self._next_unused_frame < self._frame_count:
-                frame_id = self._next_unused_frame
-                self._next_unused_frame += 1
-            # Get victim from replacer if not in pool
-            if frame_id == INVALID_FRAME_ID:
-                victim_page_id = self._replacer.get_victim()
-                frame_id = self._page_to_frame[victim_page_id]
-                frame_to_evict = self._frames[frame_id].move()
-                del(self._page_to_frame[frame_to_evict.page_id])
-                if frame_to_evict.dirty:
-                    self._add_pending_write(frame_to_evict.page_id)
-
-            # If no usable frame found
-            if frame_id == INVALID_FRAME_ID:
-                raise BufferFullError()
-
-            self._use_counters[frame_id].inc()
-            self._page_to_frame[page_id] = frame_id
-            if not is_prefetch:
-                self._replacer.pin_page(page_id)
-
-            # If page is new to the pool, update frame metadata
-            if not found_existing:
+            for frame_id in strategy.frame_ids:
+                if self._strategy_frames.get(frame_id) is not strategy:
+                    continue
+                if self._descriptors.pin_counts[frame_id] > 0:
+                    self._adopt_strategy_frame(frame_id)
+                    continue
+                del self._strategy_frames[frame_id]
+                _, frame_to_evict = self._evict_page(self._frames[frame_id].page_id)
+                self._frames[frame_id].page_id = INVALID_PAGE_ID
                 self._frames[frame_id].dirty = False
-                self._frames[frame_id].page_id = page_id
-                # Lock frame in exclusive mode for reading
-                self._lock_frame(frame_id, True)
+                self._free_frames.append(frame_id)
+                evicted_frames.append(frame_to_evict)
+            strategy.clear()
+        for frame_to_evict in evicted_frames:
+            self._write_back_evicted_frame(frame_to_evict)
 
-            return frame_id, frame_to_evict, found_existing
-    
     """ Returns true if it is safe to fix a page.
         Not thread safe.
     """
     def safe_to_fix_page(self, page_id: int, exclusive: bool) -> bool:
         if exclusive \
            and page_id in self._page_to_frame\
-           and self._use_counters[self._page_to_frame[page_id]].value > 0:
+           and self._descriptors.pin_counts[self._page_to_frame[page_id]] > 0:
                 return False
         if not exclusive \
            and page_id in self._page_to_frame \
-           and self._use_counters[self._page_to_frame[page_id]].value > 0 \
-           and self._frames[self._page_to_frame[page_id]].exclusive:
+           and self._descriptors.pin_counts[self._page_to_frame[page_id]] > 0 \
+           and self._descriptors.exclusive[self._page_to_frame[page_id]]:
                 return False
         return True
 
-    def fix_page(self, page_id: int, exclusive: bool, is_prefetch=False) -> BufferFrame:
-        frame_id, frame_to_evict, found_existing = self._find_frame_to_use(page_id, is_prefetch)
+    """ Fixes a page. A page that is not present yet is read into the ring of
+    strategy, if one is given.
+    With a byte_range (offset, length) and a sector_size, only the sectors
+    covering the range are read on a miss. The other sectors are read when
+    they are accessed through BufferFrame.read and BufferFrame.write, or
+    when the page is fixed without a byte_range.
+    """
+    def fix_page(self, page_id: int, exclusive: bool, is_prefetch=False,
+                 strategy: BufferAccessStrategy = None,
+                 byte_range: Tuple[int, int] = None) -> BufferFrame:
+        start = time.perf_counter()
+        frame_id, frame_to_evict, found_existing = self._find_frame_to_use(page_id, is_prefetch, strategy)
+        self._count_access(found_existing, is_prefetch)
+
+        if not found_existing:
+            self._load_page(frame_id, frame_to_evict, byte_range)
+            self._unlock_frame(frame_id)
+        
+        self._lock_frame(frame_id, exclusive)
+        self._on_latched(frame_id, exclusive, byte_range)
+        self._on_fixed(page_id, is_prefetch, start)
+        return self._frames[frame_id]
+
+    """ Fixes several distinct pages at once and returns their frames in the
+    order of page_ids. Hits and misses are resolved and victims reserved
+    under a single acquisition of the frames lock. Misses are read in runs
+    of contiguous pages, sorted by segment and page. Pages are latched in
+    sorted order, so batches do not deadlock with each other.
+    If the pool runs out of frames, the pages fixed so far are unfixed again
+    and BufferFullError is raised.
+    """
+    def fix_pages(self, page_ids: List[int], exclusive: bool,
+                  strategy: BufferAccessStrategy = None) -> List[BufferFrame]:
+        if len(set(page_ids)) != len(page_ids):
+            raise ValueError("page_ids must not contain duplicates.")
+        sorted_page_ids = sorted(page_ids)
+        assigned = {}
+        buffer_full_error = None
+        misses = []
+        while len(assigned) < len(sorted_page_ids) and buffer_full_error == None:
+            newly_assigned, buffer_full_error = self._find_frames_to_use(sorted_page_ids[len(assigned):], strategy)
+            for frame_id, frame_to_evict, found_existing in newly_assigned.values():
+                self._count_access(found_existing, False)
+                if frame_to_evict != None:
+                    self._write_back_evicted_frame(frame_to_evict)
+                if not found_existing:
+                    misses.append(frame_id)
+            assigned.update(newly_assigned)
+        for run in self._get_contiguous_runs(misses):
+            self._read_frames(run)
+            for frame_id in run:
+                self._unlock_frame(frame_id)
+
+        for frame_id, _, _ in assigned.values():
+            self._lock_frame(frame_id, exclusive)
+            self._on_latched(frame_id, exclusive)
+        if buffer_full_error != None:
+            self.unfix_pages([self._frames[frame_id] for frame_id, _, _ in assigned.values()], False)
+            raise buffer_full_error
+
+        if self._prefetcher != None:
+            for page_id in assigned:
+                self._prefetcher.on_access(page_id)
+        return [self._frames[assigned[page_id][0]] for page_id in page_ids]
+
+    def unfix_pages(self, frames: List[BufferFrame], is_dirty: bool):
+        for frame in frames:
+            self.unfix_page(frame, is_dirty)
+
+    """ Assigns frames to a prefix of sorted_page_ids like _find_frame_to_use.
+    Stops early once the arena runs out of spare slots, since further dirty
+    evictions would wait for write-backs that only happen after the frames
+    lock is released. Waits for a spare slot if not even the first page
+    can be assigned a frame.
+    Returns the assigned frames by page id in sorted order and the
+    BufferFullError raised if not all pages could be assigned a frame.
+    """
+    def _find_frames_to_use(self, sorted_page_ids: List[int],
+                            strategy: BufferAccessStrategy = None) -> Tuple[Dict[int, Tuple[int, BufferFrame, bool]], BufferFullError]:
+        while True:
+            pending_writes = []
+            with self._frames_lock:
+                for page_id in sorted_page_ids:
+                    if page_id not in self._page_to_frame:
+                        pending_write = self._get_pending_write(page_id)
+                        if pending_write != None:
+                            pending_writes.append(pending_write)
+                if len(pending_writes) == 0:
+                    assigned = {}
+                    for page_id in sorted_page_ids:
+                        if self._must_wait_for_spare(page_id, strategy):
+                            break
+                        try:
+                            assigned[page_id] = self._assign_frame(page_id, False, strategy)
+                        except BufferFullError as e:
+                            return assigned, e
+                    if len(assigned) > 0:
+                        return assigned, None
+            for pending_write in pending_writes:
+                self._wait_for_pending_write(pending_write)
+            if len(pending_writes) == 0:
+                self._arena.wait_for_spare()
+
+    """ Splits frames into runs whose pages are contiguous in one segment.
+    frame_ids must be sorted by page id.
+    """
+    def _get_contiguous_runs(self, frame_ids: List[int]) -> List[List[int]]:
+        runs = []
+        for frame_id in frame_ids:
+            page_id = self._frames[frame_id].page_id
+            if len(runs) > 0:
+                last_page_id = self._frames[runs[-1][-1]].page_id
+                if page_id == last_page_id + 1 \
+                   and get_segment_id(page_id) == get_segment_id(last_page_id):
+                    runs[-1].append(frame_id)
+                    continue
+            runs.append([frame_id])
+        return runs
+
+    """ Fixes a page like fix_page without blocking the event loop.
+    Reads and write-backs of a miss run on the async executor, while waits
+    for latches and pending writes suspend the calling coroutine.
+    """
+    async def fix_page_async(self, page_id: int, exclusive: bool, is_prefetch=False,
+                             strategy: BufferAccessStrategy = None,
+                             byte_range: Tuple[int, int] = None) -> BufferFrame:
+        start = time.perf_counter()
+        frame_id, frame_to_evict, found_existing = await self._find_frame_to_use_async(page_id, is_prefetch, strategy)
+        self._count_access(found_existing, is_prefetch)
+
+        if not found_existing:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._async_executor, self._load_page, frame_id, frame_to_evict, byte_range)
+            self._unlock_frame(frame_id)
+
+        await self._lock_frame_async(frame_id, exclusive)
+        self._on_latched(frame_id, exclusive, byte_range)
+        self._on_fixed(page_id, is_prefetch, start)
+        return self._frames[frame_id]
+
+    """ Async version of _find_frame_to_use
+    """
+    async def _find_frame_to_use_async(self, page_id: int, is_prefetch=False,
+                                       strategy: BufferAccessStrategy = None) -> Tuple[int, BufferFrame, bool]:
+        while True:
+            pending_write = None
+            with self._frames_lock:
+                if page_id not in self._page_to_frame:
+                    pending_write = self._get_pending_write(page_id)
+                if pending_write == None:
+                    if not self._must_wait_for_spare(page_id, strategy):
+                        return self._assign_frame(page_id, is_prefetch, strategy)
+            if pending_write == None:
+                await self._poll_async(lambda: self._arena.spare_count > 0)
+                continue
+            start = time.perf_counter()
+            await self._poll_async(pending_write.is_set)
+            self._metric_collector.record(Metric.BUFFER_MANAGER_PENDING_WRITE_WAIT,
+                                          time.perf_counter() - start)
 
+    def _count_access(self, found_existing: bool, is_prefetch: bool):
         if not is_prefetch:
             self._metric_collector.increment(Metric.BUFFER_MANAGER_ACCESSES)
             if found_existing:
@@ -145,53 +625,218 @@ class BufferManager():
             else:
                 self._metric_collector.increment(Metric.BUFFER_MANAGER_MISSES)
 
+    """ Reads the sectors of a partially read page that the fix needs, and
+    takes the copy of a page fixed exclusively that it is compared with
+    when it is unfixed, in diff_on_unfix mode
+    """
+    def _on_latched(self, frame_id: int, exclusive: bool, byte_range: Tuple[int, int] = None):
+        frame = self._frames[frame_id]
+        if byte_range == None:
+            frame.ensure_valid(0, self._page_size)
+        else:
+            frame.ensure_valid(byte_range[0], byte_range[1])
+        if self._diff_on_unfix and exclusive:
+            frame.save_shadow()
+
+    def _on_fixed(self, page_id: int, is_prefetch: bool, start: float):
+        if not is_prefetch:
+            self._metric_collector.record(Metric.BUFFER_MANAGER_FIX_LATENCY,
+                                          time.perf_counter() - start)
+            if self._prefetcher != None:
+                self._prefetcher.on_access(page_id)
+
+    """ Writes back the page evicted for a miss, if any, and reads the
+    missing page into its frame
+    """
+    def _load_page(self, frame_id: int, frame_to_evict: BufferFrame,
+                   byte_range: Tuple[int, int] = None):
         if frame_to_evict != None:
-            self._metric_collector.increment(Metric.BUFFER_MANAGER_EVICTIONS)
-            if frame_to_evict.dirty:
-                self._metric_collector.increment(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS)
-                self._write_frame(frame_to_evict)
-                self._remove_pending_write(frame_to_evict.page_id)
-            else:
-                self._metric_collector.increment(Metric.BUFFER_MANAGER_CLEAN_EVICTIONS)
-        if not found_existing:
-            self._read_frame(frame_id)
-            self._unlock_frame(frame_id)
-        
-        self._lock_frame(frame_id, exclusive)
-        return self._frames[frame_id]
+            self._write_back_evicted_frame(frame_to_evict)
+        self._read_frame(frame_id, byte_range)
 
+    """ Reads page_id into the pool, unpinned, if it is not present yet.
+    Called on an I/O thread of the prefetcher.
+    """
+    def _prefetch_page(self, page_id: int):
+        if self._closed or self.page_present(page_id):
+            return
+        try:
+            frame = self.fix_page(page_id, False, is_prefetch=True)
+        except BufferFullError:
+            return
+        self.unfix_page(frame, False, is_prefetch=True)
+
+    """ Unfixes a page. If is_dirty, the ranges marked with mark_dirty
+    while the page was fixed are dirty, or the whole page if none were.
+    In diff_on_unfix mode, the sectors that changed are dirty instead.
+    """
     def unfix_page(self, frame: BufferFrame, is_dirty: bool, is_prefetch=False):
+        if self._diff_on_unfix and frame.exclusive:
+            if is_dirty:
+                is_dirty = frame.mark_changed_sectors() or frame.ranges_marked
+            else:
+                frame.drop_shadow()
+        elif is_dirty and not frame.ranges_marked:
+            # Sectors of a partially read page that were never read are not dirty
+            for offset, length in frame.get_valid_ranges():
+                frame.mark_dirty(offset, length)
+        frame.ranges_marked = False
         frame.dirty = frame.dirty or is_dirty
+        if is_dirty:
+            self._dirty_frame_ids.add(frame.frame_id)
         
         self._unlock_frame(frame.frame_id)
-        counter_val = self._use_counters[frame.frame_id].dec()
-        if counter_val == 0 and not is_prefetch:
+        counter_val = self._descriptors.dec_pin(frame.frame_id)
+        # Pages in the ring of a strategy are not known to the replacer
+        if counter_val == 0 and frame.frame_id not in self._strategy_frames:
             self._replacer.unpin_page(frame.page_id, is_dirty)
+        if self._flusher != None and len(self._dirty_frame_ids) > self._dirty_high_watermark:
+            self._flusher.request_cleaning()
+
+    """ Unfixes a page fixed by fix_page_async. Unfixing never blocks
+    on I/O or latches.
+    """
+    async def unfix_page_async(self, frame: BufferFrame, is_dirty: bool, is_prefetch=False):
+        self.unfix_page(frame, is_dirty, is_prefetch)
+
+    """ Fixes a page for the duration of an async with block.
+    The page is unfixed as dirty if the frame is marked dirty on exit.
+    Usage:
+        async with buffer_manager.fix_page_guard_async(page_id, True) as frame:
+            frame.data[0] = 1
+            frame.dirty = True
+    """
+    @asynccontextmanager
+    async def fix_page_guard_async(self, page_id: int, exclusive: bool) -> AsyncIterator[BufferFrame]:
+        frame = await self.fix_page_async(page_id, exclusive)
+        try:
+            yield frame
+        finally:
+            await self.unfix_page_async(frame, frame.dirty)
 
     def _lock_frame(self, frame_id: int, exclusive: bool):
         if exclusive:
             self._lock_table[frame_id].lock_exclusive()
-            self._frames[frame_id].exclusive = True
+            self._descriptors.exclusive[frame_id] = True
         else:
             self._lock_table[frame_id].lock_shared()
-            self._frames[frame_id].exclusive = False
+            self._descriptors.exclusive[frame_id] = False
+
+    async def _lock_frame_async(self, frame_id: int, exclusive: bool):
+        if exclusive:
+            await self._poll_async(self._lock_table[frame_id].try_lock_exclusive)
+        else:
+            await self._poll_async(self._lock_table[frame_id].try_lock_shared)
+        self._descriptors.exclusive[frame_id] = exclusive
+
+    """ Suspends the calling coroutine until try_acquire returns true.
+    Waits are polled instead of handed to executor threads, since a latch
+    may be held by a coroutine that needs an executor thread to release it.
+    """
+    async def _poll_async(self, try_acquire: Callable[[], bool]):
+        delay = BufferManager._async_min_backoff
+        while not try_acquire():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BufferManager._async_max_backoff)
 
     def _unlock_frame(self, frame_id: int):
-        if self._frames[frame_id].exclusive:
+        if self._descriptors.exclusive[frame_id]:
             self._lock_table[frame_id].release_exclusive()
         else:
             self._lock_table[frame_id].release_shared()
 
-    def _read_frame(self, frame_id: int):
-        page_id = self._frames[frame_id].page_id
+    """ Reads the page of a frame, or only the sectors covering byte_range
+    if the frames track sectors
+    """
+    def _read_frame(self, frame_id: int, byte_range: Tuple[int, int] = None):
+        frame = self._frames[frame_id]
+        page_id = frame.page_id
+        segment_id = get_segment_id(page_id)
+        segment_page_id = get_segment_page_id(page_id)
+
+        if byte_range == None or self._sector_size == 0:
+            self._file_manager.read_block(str(segment_id), segment_page_id, frame.data)
+            frame.set_all_valid()
+            self._metric_collector.add(Metric.BUFFER_MANAGER_BYTES_READ, self._page_size)
+        else:
+            ranges = frame.get_sector_ranges(byte_range[0], byte_range[1])
+            self._file_manager.read_sectors(str(segment_id), segment_page_id, frame.data, ranges)
+            frame.set_valid_ranges(ranges)
+            self._metric_collector.add(Metric.BUFFER_MANAGER_BYTES_READ,
+                                       sum(length for offset, length in ranges))
+
+    """ Returns the function that reads missing sectors of a partially read
+    page into its frame. It does not refer to the buffer manager, which
+    would otherwise be kept alive by its own frames and never be closed.
+    Readers sharing a page may fault in the same sector at the same time,
+    which only reads the same data twice.
+    """
+    @staticmethod
+    def _create_fault_in(file_manager: FileManager,
+                         metric_collector: MetricCollector) -> Callable[[BufferFrame, List[Tuple[int, int]]], None]:
+        def fault_in(frame: BufferFrame, ranges: List[Tuple[int, int]]):
+            file_manager.read_sectors(str(get_segment_id(frame.page_id)),
+                                      get_segment_page_id(frame.page_id),
+                                      frame.data, ranges)
+            frame.mark_valid(ranges)
+            metric_collector.add(Metric.BUFFER_MANAGER_BYTES_READ,
+                                 sum(length for offset, length in ranges))
+        return fault_in
+
+    """ Reads the contiguous pages of frame_ids with one call to the file manager
+    """
+    def _read_frames(self, frame_ids: List[int]):
+        page_id = self._frames[frame_ids[0]].page_id
         segment_id = get_segment_id(page_id)
         segment_page_id = get_segment_page_id(page_id)
 
-        self._file_manager.read_block(str(segment_id), segment_page_id, self._frames[frame_id].data)
+        self._file_manager.read_blocks(str(segment_id), segment_page_id,
+                                       [self._frames[frame_id].data for frame_id in frame_ids])
+        for frame_id in frame_ids:
+            self._frames[frame_id].set_all_valid()
+        self._metric_collector.add(Metric.BUFFER_MANAGER_BYTES_READ, len(frame_ids) * self._page_size)
 
+    """ Writes the dirty ranges of a frame, the whole page unless it tracks
+    dirty sectors
+    """
     def _write_frame(self, frame: BufferFrame):
         page_id = frame.page_id
         segment_id = get_segment_id(page_id)
         segment_page_id = get_segment_page_id(page_id)
 
-        self._file_manager.write_block(str(segment_id), segment_page_id, frame.data)
\ No newline at end of file
+        ranges = self._count_written_bytes(frame)
+        if ranges == [(0, self._page_size)]:
+            self._file_manager.write_block(str(segment_id), segment_page_id, frame.data)
+        else:
+            self._file_manager.write_sectors(str(segment_id), segment_page_id, frame.data, ranges)
+
+    """ Writes frames with one batch, in which the file manager merges
+    adjacent pages into vectored writes. Frames with only some dirty
+    sectors are written separately.
+    """
+    def _write_frames(self, frames: List[BufferFrame]):
+        whole_pages = []
+        for frame in frames:
+            ranges = self._count_written_bytes(frame)
+            if ranges == [(0, self._page_size)]:
+                whole_pages.append((str(get_segment_id(frame.page_id)),
+                                    get_segment_page_id(frame.page_id),
+                                    frame.data))
+            else:
+                self._file_manager.write_sectors(str(get_segment_id(frame.page_id)),
+                                                 get_segment_page_id(frame.page_id),
+                                                 frame.data, ranges)
+        self._file_manager.write_batch(whole_pages)
+
+    """ Adds the bytes dirtied and the bytes written back of a frame to the
+    metrics. Returns the (offset, length) ranges to write.
+    """
+    def _count_written_bytes(self, frame: BufferFrame) -> List[Tuple[int, int]]:
+        ranges = frame.get_dirty_ranges()
+        if len(ranges) == 0:
+            # Frames written while clean, e.g. by tests, are written whole
+            ranges = [(0, self._page_size)]
+        self._metric_collector.add(Metric.BUFFER_MANAGER_BYTES_DIRTIED, frame.bytes_dirtied)
+        self._metric_collector.add(Metric.BUFFER_MANAGER_BYTES_WRITTEN,
+                                   sum(length for offset, length in ranges))
+        return ranges
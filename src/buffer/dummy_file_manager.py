@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 from threading import Lock
 import os, mmap
 import math
@@ -25,5 +25,22 @@ class DummyFileManager(FileManager):
     def read_block(self, file_name: str, page_id: int, dest: bytearray):
         pass
 
+    def read_blocks(self, file_name: str, page_id: int, dests: List[bytearray]):
+        pass
+
     def write_block(self, file_name: str, page_id: int, src: bytearray):
-        pass
\ No newline at end of file
+        pass
+    def write_blocks(self, file_name: str, page_id: int, srcs: List[bytearray]):
+        pass
+
+    def read_sectors(self, file_name: str, page_id: int, dest: bytearray, ranges: List[Tuple[int, int]]):
+        pass
+
+    def write_sectors(self, file_name: str, page_id: int, src: bytearray, ranges: List[Tuple[int, int]]):
+        pass
+
+    def read_batch(self, requests: List[Tuple[str, int, bytearray]]):
+        pass
+
+    def write_batch(self, requests: List[Tuple[str, int, bytearray]]):
+        pass
@@ -1,22 +1,46 @@
-from typing import Dict
-from threading import Lock
+from typing import Dict, List, Tuple
+from threading import Lock, local
 import os, mmap
 import math
+import ctypes
 from src.util.page_id_utils import get_segment_id, get_segment_page_id
 from src.util.constants import PAGE_SIZE
 
+"""Reads and writes pages of segment files with positional I/O.
+Reads and writes of a file run concurrently without a lock, since each
+of them only touches its own page. Only growing a file is serialized,
+by a lock per file that writes within the current size never take.
+Files grow by whole extents that are allocated with posix_fallocate, so
+appending pages neither writes zeros nor needs to stat the file.
+Runs of contiguous pages are read and written with one vectored call.
+"""
 class FileManager():
     _initial_size = 2**20 # 1MB
+    # Alignment of buffers, offsets and sizes required by O_DIRECT
+    _alignment = 4096
+    _open_flags = os.O_CREAT | os.O_RDWR | os.O_DIRECT
+    # Maximum number of buffers of one vectored read or write
+    _iov_max = os.sysconf('SC_IOV_MAX') if 'SC_IOV_MAX' in os.sysconf_names else 1024
 
-    def __init__(self, directory = 'data', page_size = PAGE_SIZE):
+    """
+    Arguments
+        extent_size: The number of bytes a file grows by at a time when a
+            page past its end is written
+    """
+    def __init__(self, directory = 'data', page_size = PAGE_SIZE, extent_size = _initial_size):
         self._directory = directory
         os.makedirs(self._directory, exist_ok=True)
         self._page_size = page_size
+        self._extent_size = extent_size
+        # key=file_path; value=size of the file in bytes
+        self._file_sizes: Dict[str, int] = {}
         self._header_cache = {}
         self._file_handles: Dict[str, int] = {}
         self._lock_table_lock = Lock()
-        self._lock_table: Dict[str, Lock] = {}
-        self._buffers: Dict[str, mmap.mmap] = {}
+        # Serializes growing a file
+        self._extent_locks: Dict[str, Lock] = {}
+        # Bounce buffer of each thread for unaligned buffers
+        self._bounce_buffers = local()
     
     def __del__(self):
         for file_path, handle in self._file_handles.items():
@@ -27,21 +51,21 @@ class FileManager():
 
     def _open_file(self, file_name: str) -> int:
         file_path = self._get_file_path(file_name)
+        fd = self._file_handles.get(file_path)
+        if fd != None:
+            return fd
         with self._lock_table_lock:
             if file_path not in self._file_handles:
-                self._file_handles[file_path] = os.open(file_path, 
-                                                    os.O_CREAT | os.O_RDWR | os.O_DIRECT)
-                self._lock_table[file_path] = Lock()
-                self._buffers[file_path] = mmap.mmap(-1, self._page_size)
+                self._file_handles[file_path] = os.open(file_path, self._open_flags)
+                self._extent_locks[file_path] = Lock()
             return self._file_handles[file_path]
 
     def create_file(self, file_name: str):
         self._open_file(file_name)
         file_path = self._get_file_path(file_name)
-        with self._lock_table[file_path]:
-            with mmap.mmap(-1, FileManager._initial_size) as mm:
-                mm.write(b'\0' * FileManager._initial_size)
-                os.write(self._file_handles[file_path], mm)
+        with self._extent_locks[file_path]:
+            if self._file_size(file_name) < FileManager._initial_size:
+                self._grow_file(file_name, FileManager._initial_size)
     
     def remove_file(self, file_name: str):
         self._open_file(file_name)
@@ -49,41 +73,198 @@ class FileManager():
         with self._lock_table_lock:
             os.remove(file_path)
             del self._file_handles[file_path]
-            del self._lock_table[file_path]
-            del self._buffers[file_path]
+            del self._extent_locks[file_path]
+            self._file_sizes.pop(file_path, None)
     
-    def _file_size(self, file_name: str):
+    """ Returns the size of a file, which is only looked up the first time
+    """
+    def _file_size(self, file_name: str) -> int:
         file_path = self._get_file_path(file_name)
-        return os.stat(file_path).st_size
+        size = self._file_sizes.get(file_path)
+        if size == None:
+            size = os.fstat(self._open_file(file_name)).st_size
+            self._file_sizes[file_path] = size
+        return size
     
+    """ Allocates the space between the end of a file and new_size.
+    File systems without fallocate support get a sparse file instead.
+    Preconditions: the extent lock of the file is held by the caller or
+    the file is not used concurrently.
+    """
     def _grow_file(self, file_name: str, new_size: int):
         file_path = self._get_file_path(file_name)
-        size = os.stat(file_path).st_size
+        size = self._file_size(file_name)
         if(new_size < size):
             raise ValueError(f"New size of file {file_path} must be greater than old size.")
-        size_diff = math.floor(new_size - size)
-        with mmap.mmap(-1, size_diff) as mm:
-            mm.write(b'\0' * size_diff)
-            os.lseek(self._file_handles[file_path], 0, os.SEEK_END)
-            os.write(self._file_handles[file_path], mm)
+        new_size = math.floor(new_size)
+        fd = self._open_file(file_name)
+        try:
+            os.posix_fallocate(fd, size, new_size - size)
+        except OSError:
+            # The cached size may be stale if another process grew the file
+            if os.fstat(fd).st_size < new_size:
+                os.ftruncate(fd, new_size)
+        self._file_sizes[file_path] = new_size
 
+    """ Returns the bounce buffer of the calling thread
+    """
+    def _get_bounce_buffer(self) -> mmap.mmap:
+        bounce_buffer = getattr(self._bounce_buffers, 'buffer', None)
+        if bounce_buffer == None:
+            bounce_buffer = mmap.mmap(-1, self._page_size)
+            self._bounce_buffers.buffer = bounce_buffer
+        return bounce_buffer
+
+    """ Returns true if O_DIRECT I/O can use buffer without copying it.
+    Buffers that are not writable, such as bytes, are never used directly.
+    """
+    def _is_aligned(self, buffer) -> bool:
+        try:
+            address = ctypes.addressof(ctypes.c_char.from_buffer(buffer))
+        except (TypeError, ValueError):
+            return False
+        return address % FileManager._alignment == 0
+
+    """ Reads a page with one positional read on the cached file descriptor.
+    Aligned buffers, like the frames of the buffer pool, are read into
+    directly, others through the thread's bounce buffer.
+    """
     def read_block(self, file_name: str, page_id: int, dest: bytearray):
-        self._open_file(file_name)
-        file_path = self._get_file_path(file_name)
-        with self._lock_table[file_path]:
-            fd = os.open(file_path, os.O_CREAT | os.O_RDWR | os.O_DIRECT)
-            with os.fdopen(fd, "rb+", 0) as file_obj:
-                file_obj.seek(page_id * self._page_size, os.SEEK_SET)
-                file_obj.readinto(self._buffers[file_path])
-                dest[:] = self._buffers[file_path][:]
+        fd = self._open_file(file_name)
+        offset = page_id * self._page_size
+        if self._is_aligned(dest):
+            bytes_read = os.preadv(fd, [dest], offset)
+        else:
+            bounce_buffer = self._get_bounce_buffer()
+            bytes_read = os.preadv(fd, [bounce_buffer], offset)
+            dest[:bytes_read] = bounce_buffer[:bytes_read]
+        # Pages past the end of the file read as zeros
+        if bytes_read < self._page_size:
+            dest[bytes_read:] = bytes(self._page_size - bytes_read)
+
+    """ Reads the contiguous pages starting at page_id into dests with one
+    vectored read per IOV_MAX pages. Runs containing an unaligned buffer
+    are read page by page through the bounce buffer.
+    """
+    def read_blocks(self, file_name: str, page_id: int, dests: List[bytearray]):
+        if not all(self._is_aligned(dest) for dest in dests):
+            for i, dest in enumerate(dests):
+                self.read_block(file_name, page_id + i, dest)
+            return
+        fd = self._open_file(file_name)
+        for start in range(0, len(dests), FileManager._iov_max):
+            chunk = dests[start:start + FileManager._iov_max]
+            offset = (page_id + start) * self._page_size
+            bytes_read = os.preadv(fd, chunk, offset)
+            # Pages past the end of the file read as zeros
+            for i in range(bytes_read // self._page_size, len(chunk)):
+                page_bytes_read = max(bytes_read - i * self._page_size, 0)
+                chunk[i][page_bytes_read:] = bytes(self._page_size - page_bytes_read)
 
     def write_block(self, file_name: str, page_id: int, src: bytearray):
-        self._open_file(file_name)
-        file_path = self._get_file_path(file_name)
-        with self._lock_table[file_path]:
-            offset = page_id * self._page_size
-            if(self._file_size(file_name) < offset + self._page_size):
-                self._grow_file(file_name, offset + self._page_size)
-            self._buffers[file_path][:] = src[:]
-            os.lseek(self._file_handles[file_path], offset, os.SEEK_SET)
-            os.write(self._file_handles[file_path], self._buffers[file_path])
\ No newline at end of file
+        fd = self._open_file(file_name)
+        offset = page_id * self._page_size
+        self._ensure_file_size(file_name, offset + self._page_size)
+        if self._is_aligned(src):
+            os.pwritev(fd, [src], offset)
+        else:
+            bounce_buffer = self._get_bounce_buffer()
+            bounce_buffer[:] = src[:]
+            os.pwritev(fd, [bounce_buffer], offset)
+
+    """ Writes srcs to the contiguous pages starting at page_id with one
+    vectored write per IOV_MAX pages
+    """
+    def write_blocks(self, file_name: str, page_id: int, srcs: List[bytearray]):
+        if not all(self._is_aligned(src) for src in srcs):
+            for i, src in enumerate(srcs):
+                self.write_block(file_name, page_id + i, src)
+            return
+        fd = self._open_file(file_name)
+        self._ensure_file_size(file_name, (page_id + len(srcs)) * self._page_size)
+        for start in range(0, len(srcs), FileManager._iov_max):
+            offset = (page_id + start) * self._page_size
+            os.pwritev(fd, srcs[start:start + FileManager._iov_max], offset)
+
+    """ Reads only the (offset, length) byte ranges of a page into dest, with
+    one positional read per range. For O_DIRECT, offsets and lengths of
+    the ranges must be multiples of 4096 bytes.
+    """
+    def read_sectors(self, file_name: str, page_id: int, dest: bytearray, ranges: List[Tuple[int, int]]):
+        fd = self._open_file(file_name)
+        offset = page_id * self._page_size
+        with memoryview(dest) as dest_view:
+            for start, length in ranges:
+                with dest_view[start:start + length] as range_view:
+                    if self._is_aligned(range_view):
+                        bytes_read = os.preadv(fd, [range_view], offset + start)
+                    else:
+                        bounce_buffer = self._get_bounce_buffer()
+                        with memoryview(bounce_buffer)[:length] as bounce_view:
+                            bytes_read = os.preadv(fd, [bounce_view], offset + start)
+                        range_view[:bytes_read] = bounce_buffer[:bytes_read]
+                    # Ranges past the end of the file read as zeros
+                    if bytes_read < length:
+                        range_view[bytes_read:] = bytes(length - bytes_read)
+
+    """ Writes only the (offset, length) byte ranges of a page from src, with
+    one positional write per range. For O_DIRECT, offsets and lengths of
+    the ranges must be multiples of 4096 bytes.
+    """
+    def write_sectors(self, file_name: str, page_id: int, src: bytearray, ranges: List[Tuple[int, int]]):
+        fd = self._open_file(file_name)
+        offset = page_id * self._page_size
+        self._ensure_file_size(file_name, offset + self._page_size)
+        with memoryview(src) as src_view:
+            for start, length in ranges:
+                with src_view[start:start + length] as range_view:
+                    if self._is_aligned(range_view):
+                        os.pwritev(fd, [range_view], offset + start)
+                    else:
+                        bounce_buffer = self._get_bounce_buffer()
+                        bounce_buffer[:length] = range_view
+                        with memoryview(bounce_buffer)[:length] as bounce_view:
+                            os.pwritev(fd, [bounce_view], offset + start)
+
+    """ Reads a batch of (file_name, page_id, dest) requests, merging the
+    requests for adjacent pages of a file into one vectored read
+    """
+    def read_batch(self, requests: List[Tuple[str, int, bytearray]]):
+        for file_name, page_id, dests in self._merge_requests(requests):
+            self.read_blocks(file_name, page_id, dests)
+
+    """ Writes a batch of (file_name, page_id, src) requests, merging the
+    requests for adjacent pages of a file into one vectored write.
+    Requests for the same page are written in the order of the batch.
+    """
+    def write_batch(self, requests: List[Tuple[str, int, bytearray]]):
+        for file_name, page_id, srcs in self._merge_requests(requests):
+            self.write_blocks(file_name, page_id, srcs)
+
+    """ Sorts requests by file and page and groups them into runs of
+    contiguous pages.
+    Returns a list of [<file_name>, <first page_id>, <list of buffers>].
+    """
+    def _merge_requests(self, requests: List[Tuple[str, int, bytearray]]) -> List[list]:
+        runs = []
+        # The sort is stable, so requests for the same page keep their order
+        for file_name, page_id, buffer in sorted(requests, key=lambda request: request[:2]):
+            if len(runs) > 0 and runs[-1][0] == file_name \
+               and runs[-1][1] + len(runs[-1][2]) == page_id:
+                runs[-1][2].append(buffer)
+            else:
+                runs.append([file_name, page_id, [buffer]])
+        return runs
+
+    """ Grows a file by whole extents to at least size bytes, unless it is
+    large enough already. Growing is the only operation on a file that is
+    serialized.
+    """
+    def _ensure_file_size(self, file_name: str, size: int):
+        if self._file_size(file_name) >= size:
+            return
+        with self._extent_locks[self._get_file_path(file_name)]:
+            # Another writer may have grown the file in the meantime
+            if self._file_size(file_name) < size:
+                extent_count = math.ceil(size / self._extent_size)
+                self._grow_file(file_name, extent_count * self._extent_size)
@@ -0,0 +1,64 @@
+from threading import Condition
+from collections import deque
+import mmap
+
+"""Memory of the buffer pool, allocated as one anonymous mmap that is split
+into page sized slots. Slots start at a multiple of page_size from the
+page aligned start of the mapping, so they are suitable for O_DIRECT I/O
+whenever page_size is a multiple of the OS page size.
+
+The first frame_count slots initially back the frames. The remaining
+spare slots are handed out to frames whose dirty page is evicted: the
+evicted copy keeps the old slot until it has been written back, and the
+frame continues with a spare slot instead of a newly allocated buffer.
+"""
+class FrameArena():
+    def __init__(self, frame_count: int, page_size: int, spare_count: int = 16):
+        if spare_count < 1:
+            raise ValueError("spare_count must be at least 1.")
+        self._page_size = page_size
+        self._slot_count = frame_count + spare_count
+        self._memory = mmap.mmap(-1, self._slot_count * page_size)
+        self._view = memoryview(self._memory)
+        self._spare_slots_available = Condition()
+        self._spare_slots = deque(range(frame_count, self._slot_count))
+
+    @property
+    def slot_count(self) -> int:
+        return self._slot_count
+
+    @property
+    def spare_count(self) -> int:
+        with self._spare_slots_available:
+            return len(self._spare_slots)
+
+    """ Returns the memory of a slot
+    """
+    def get_slot(self, slot: int) -> memoryview:
+        return self._view[slot * self._page_size:(slot + 1) * self._page_size]
+
+    """ Takes a spare slot, waiting for one to be released if there is none.
+    Slots are only released once their copy has been written back, so a
+    caller that holds a lock the writer needs must check spare_count
+    first instead of waiting here.
+    """
+    def acquire_spare(self) -> int:
+        with self._spare_slots_available:
+            while len(self._spare_slots) == 0:
+                self._spare_slots_available.wait()
+            return self._spare_slots.popleft()
+
+    """ Returns a slot that is no longer used to the spare slots
+    """
+    def release_spare(self, slot: int):
+        with self._spare_slots_available:
+            self._spare_slots.append(slot)
+            # Threads in wait_for_spare do not take the slot, so wake up all
+            self._spare_slots_available.notify_all()
+
+    """ Waits until a spare slot is free, without taking it
+    """
+    def wait_for_spare(self):
+        with self._spare_slots_available:
+            while len(self._spare_slots) == 0:
+                self._spare_slots_available.wait()
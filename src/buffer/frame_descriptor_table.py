@@ -0,0 +1,32 @@
+from array import array
+from threading import Lock
+
+from src.util.constants import INVALID_PAGE_ID
+
+"""Metadata of all frames of a buffer pool, kept in parallel typed arrays
+indexed by frame id instead of in one Python object per frame.
+"""
+class FrameDescriptorTable():
+    _pin_lock_count = 64
+
+    def __init__(self, frame_count: int):
+        self._frame_count = frame_count
+        self.page_ids = array('q', [INVALID_PAGE_ID]) * frame_count
+        self.dirty = bytearray(frame_count)
+        self.exclusive = bytearray(frame_count)
+        self.pin_counts = array('l', [0]) * frame_count
+        # Pin counts are updated without the frames lock, so they are guarded
+        # by a small set of locks shared by frames instead of one lock per frame
+        self._pin_locks = [Lock() for i in range(min(frame_count, FrameDescriptorTable._pin_lock_count))]
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
+
+    def inc_pin(self, frame_id: int, amt=1) -> int:
+        with self._pin_locks[frame_id % len(self._pin_locks)]:
+            self.pin_counts[frame_id] += amt
+            return self.pin_counts[frame_id]
+
+    def dec_pin(self, frame_id: int, amt=1) -> int:
+        return self.inc_pin(frame_id, -amt)
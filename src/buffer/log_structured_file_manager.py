@@ -0,0 +1,299 @@
+from typing import Dict, List, Tuple
+from threading import Lock, Thread, Event
+import os
+import json
+import traceback
+
+from src.util.constants import PAGE_SIZE
+from src.util.ReaderWriterLock import ReaderWriterLock
+from src.buffer.file_manager import FileManager
+
+"""Implementation of the FileManager interface that never overwrites a
+page in place. Written pages are appended to the active log file, so the
+device only sees sequential writes, and a mapping table in memory keeps
+the location of the latest version of each page.
+
+A log that is full is sealed and a new one is started. Overwriting a page
+leaves a stale copy behind in its old log. A cleaner thread compacts
+sealed logs in which at most clean_threshold of the pages are live, by
+appending their live pages to the active log and deleting the log.
+
+The mapping table is checkpointed to a file every checkpoint_interval
+writes and on close, and is loaded from it when the directory is opened
+again. Writes after the last checkpoint are lost if the process crashes.
+"""
+class LogStructuredFileManager(FileManager):
+    _checkpoint_name = 'mapping.json'
+    _cleaning_interval = 0.1 # seconds
+
+    """
+    Arguments
+        log_pages: The number of pages of a log file
+        clean_threshold: The fraction of live pages up to which a sealed
+            log is compacted by the cleaner
+        checkpoint_interval: The number of writes after which the mapping
+            table is checkpointed
+        background_cleaning: Whether a cleaner thread compacts logs. clean
+            can be called explicitly either way.
+    """
+    def __init__(self, directory = 'data', page_size = PAGE_SIZE, extent_size = FileManager._initial_size,
+                 log_pages: int = 256, clean_threshold: float = 0.5, checkpoint_interval: int = 1024,
+                 background_cleaning: bool = True):
+        self._directory = directory
+        self._page_size = page_size
+        # Reads and writes the log files in place
+        self._log_files = FileManager(directory, page_size, extent_size)
+        self._log_pages = log_pages
+        self._clean_threshold = clean_threshold
+        self._checkpoint_interval = checkpoint_interval
+        # Held shared by reads and writes, and exclusively while a log is cleaned
+        self._cleaning_lock = ReaderWriterLock()
+        # Serializes appending to the active log
+        self._append_lock = Lock()
+        # key=(file_name, page_id); value=(log_id, slot)
+        self._mapping: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        # key=log_id; value=the (file_name, page_id) stored in each slot, None if stale
+        self._logs: Dict[int, List[Tuple[str, int]]] = {}
+        # key=log_id; value=number of live pages
+        self._live_counts: Dict[int, int] = {}
+        self._active_log = -1
+        self._next_slot = log_pages
+        self._writes_since_checkpoint = 0
+        self._bytes_requested = 0
+        self._bytes_written = 0
+        self._load_checkpoint()
+
+        self._cleaning_requested = Event()
+        self._stopped = Event()
+        self._cleaner = None
+        if background_cleaning:
+            self._cleaner = Thread(target=self._clean_loop, daemon=True)
+            self._cleaner.start()
+
+    def __del__(self):
+        self.close()
+
+    """ Bytes of pages written by callers
+    """
+    @property
+    def bytes_requested(self) -> int:
+        return self._bytes_requested
+
+    """ Bytes written to the device, including pages moved by the cleaner
+    """
+    @property
+    def bytes_written(self) -> int:
+        return self._bytes_written
+
+    @property
+    def log_count(self) -> int:
+        return len(self._logs)
+
+    """ Stops the cleaner and checkpoints the mapping table
+    """
+    def close(self):
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if self._cleaner != None:
+            self._cleaning_requested.set()
+            self._cleaner.join()
+        self.checkpoint()
+
+    def _get_log_name(self, log_id: int) -> str:
+        return f"log_{log_id}"
+
+    def _load_checkpoint(self):
+        checkpoint_path = self._get_file_path(LogStructuredFileManager._checkpoint_name)
+        if not os.path.exists(checkpoint_path):
+            return
+        with open(checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        self._active_log = checkpoint['active_log']
+        self._next_slot = checkpoint['next_slot']
+        for log_id in checkpoint['logs']:
+            self._logs[log_id] = [None] * self._log_pages
+            self._live_counts[log_id] = 0
+        for file_name, page_id, log_id, slot in checkpoint['mapping']:
+            self._mapping[(file_name, page_id)] = (log_id, slot)
+            self._logs[log_id][slot] = (file_name, page_id)
+            self._live_counts[log_id] += 1
+
+    """ Writes the mapping table to a temporary file and renames it, so that
+    a crash leaves either the old or the new checkpoint behind
+    """
+    def checkpoint(self):
+        with self._append_lock:
+            self._writes_since_checkpoint = 0
+            checkpoint_path = self._get_file_path(LogStructuredFileManager._checkpoint_name)
+            with open(f"{checkpoint_path}.tmp", 'w') as checkpoint_file:
+                json.dump({'active_log': self._active_log,
+                           'next_slot': self._next_slot,
+                           'logs': list(self._logs.keys()),
+                           'mapping': [[key[0], key[1], location[0], location[1]]
+                                       for key, location in self._mapping.items()]},
+                          checkpoint_file)
+            os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
+
+    def create_file(self, file_name: str):
+        pass
+
+    """ Drops all pages of a segment. Their log slots become stale.
+    """
+    def remove_file(self, file_name: str):
+        self._cleaning_lock.lock_exclusive()
+        try:
+            with self._append_lock:
+                for key in [key for key in self._mapping.keys() if key[0] == file_name]:
+                    self._mark_stale(self._mapping.pop(key))
+        finally:
+            self._cleaning_lock.release_exclusive()
+
+    """ Reads the latest version of a page from its log.
+    Pages that were never written read as zeros.
+    """
+    def read_block(self, file_name: str, page_id: int, dest: bytearray):
+        self._cleaning_lock.lock_shared()
+        try:
+            location = self._mapping.get((file_name, page_id))
+            if location == None:
+                dest[:self._page_size] = bytes(self._page_size)
+            else:
+                self._log_files.read_block(self._get_log_name(location[0]), location[1], dest)
+        finally:
+            self._cleaning_lock.release_shared()
+
+    def read_blocks(self, file_name: str, page_id: int, dests: List[bytearray]):
+        for i, dest in enumerate(dests):
+            self.read_block(file_name, page_id + i, dest)
+
+    """ Reads the ranges from the latest version of the page in its log
+    """
+    def read_sectors(self, file_name: str, page_id: int, dest: bytearray, ranges: List[Tuple[int, int]]):
+        self._cleaning_lock.lock_shared()
+        try:
+            location = self._mapping.get((file_name, page_id))
+            if location == None:
+                for start, length in ranges:
+                    dest[start:start + length] = bytes(length)
+            else:
+                self._log_files.read_sectors(self._get_log_name(location[0]), location[1], dest, ranges)
+        finally:
+            self._cleaning_lock.release_shared()
+
+    def write_block(self, file_name: str, page_id: int, src: bytearray):
+        self.write_blocks(file_name, page_id, [src])
+
+    """ Appends the whole page, since a page is never updated in place.
+    The ranges are merged into the latest version of the page, as the
+    rest of src may not have been read.
+    """
+    def write_sectors(self, file_name: str, page_id: int, src: bytearray, ranges: List[Tuple[int, int]]):
+        page = bytearray(self._page_size)
+        self.read_block(file_name, page_id, page)
+        for start, length in ranges:
+            page[start:start + length] = src[start:start + length]
+        self.write_blocks(file_name, page_id, [page])
+
+    """ Appends the contiguous pages starting at page_id to the active log
+    """
+    def write_blocks(self, file_name: str, page_id: int, srcs: List[bytearray]):
+        self._cleaning_lock.lock_shared()
+        try:
+            self._append([(file_name, page_id + i) for i in range(0, len(srcs))], srcs)
+        finally:
+            self._cleaning_lock.release_shared()
+        self._bytes_requested += len(srcs) * self._page_size
+        if self._writes_since_checkpoint >= self._checkpoint_interval:
+            self.checkpoint()
+
+    """ Appends pages to the active log with one write per log they fill
+    and points the mapping table at them.
+    Preconditions: _cleaning_lock is held by the caller.
+    """
+    def _append(self, keys: List[Tuple[str, int]], srcs: List[bytearray]):
+        with self._append_lock:
+            start = 0
+            while start < len(keys):
+                if self._next_slot == self._log_pages:
+                    self._start_log()
+                count = min(len(keys) - start, self._log_pages - self._next_slot)
+                self._log_files.write_blocks(self._get_log_name(self._active_log), self._next_slot,
+                                     srcs[start:start + count])
+                for i in range(start, start + count):
+                    old_location = self._mapping.get(keys[i])
+                    if old_location != None:
+                        self._mark_stale(old_location)
+                    self._mapping[keys[i]] = (self._active_log, self._next_slot)
+                    self._logs[self._active_log][self._next_slot] = keys[i]
+                    self._live_counts[self._active_log] += 1
+                    self._next_slot += 1
+                start += count
+            self._bytes_written += len(keys) * self._page_size
+            self._writes_since_checkpoint += len(keys)
+
+    """ Seals the active log and starts a new one.
+    Preconditions: _append_lock is held by the caller.
+    """
+    def _start_log(self):
+        self._active_log += 1
+        self._next_slot = 0
+        self._logs[self._active_log] = [None] * self._log_pages
+        self._live_counts[self._active_log] = 0
+        if len(self._logs) > 1:
+            self._cleaning_requested.set()
+
+    """ Preconditions: _append_lock is held by the caller.
+    """
+    def _mark_stale(self, location: Tuple[int, int]):
+        self._logs[location[0]][location[1]] = None
+        self._live_counts[location[0]] -= 1
+
+    """ Compacts all sealed logs in which at most clean_threshold of the
+    pages are live, emptiest first.
+    Returns the number of logs that were deleted.
+    """
+    def clean(self) -> int:
+        with self._append_lock:
+            log_ids = sorted([log_id for log_id in self._logs.keys()
+                              if log_id != self._active_log
+                              and self._live_counts[log_id] <= self._clean_threshold * self._log_pages],
+                             key=lambda log_id: self._live_counts[log_id])
+        for log_id in log_ids:
+            self._clean_log(log_id)
+        return len(log_ids)
+
+    """ Moves the live pages of a sealed log to the active log and deletes it
+    """
+    def _clean_log(self, log_id: int):
+        self._cleaning_lock.lock_exclusive()
+        try:
+            # Another call of clean may have compacted the log already
+            if log_id not in self._logs:
+                return
+            log_name = self._get_log_name(log_id)
+            keys = [key for key in self._logs[log_id] if key != None]
+            srcs = [bytearray(self._page_size) for key in keys]
+            for key, src in zip(keys, srcs):
+                self._log_files.read_block(log_name, self._mapping[key][1], src)
+            if len(keys) > 0:
+                self._append(keys, srcs)
+            with self._append_lock:
+                del self._logs[log_id]
+                del self._live_counts[log_id]
+            self._log_files.remove_file(log_name)
+        finally:
+            self._cleaning_lock.release_exclusive()
+
+    def _clean_loop(self):
+        while not self._stopped.is_set():
+            self._cleaning_requested.wait(LogStructuredFileManager._cleaning_interval)
+            if self._stopped.is_set():
+                return
+            if self._cleaning_requested.is_set():
+                self._cleaning_requested.clear()
+                try:
+                    self.clean()
+                except Exception:
+                    # Keep cleaning, stale pages only cost space until then
+                    traceback.print_exc()
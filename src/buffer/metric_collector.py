@@ -1,17 +1,28 @@
 from enum import Enum
-from typing import Dict
+from threading import Lock
+from typing import Dict, List
+import math
 
 """Class for collecting metrics which running benchmarks
 """
 class MetricCollector:
     def __init__(self):
         self._metrics: Dict[Metric, int] = {}
+        self._samples: Dict[Metric, List[float]] = {}
+        # Background threads of the buffer manager update metrics concurrently
+        self._lock = Lock()
     
     def _do_increment(self, key_name):
-        if key_name in self._metrics:
-            self._metrics[key_name] += 1
-        else:
-            self._metrics[key_name] = 1
+        self.add(key_name, 1)
+
+    """Adds amount to a counter, e.g. a number of bytes
+    """
+    def add(self, key_name, amount: int):
+        with self._lock:
+            if key_name in self._metrics:
+                self._metrics[key_name] += amount
+            else:
+                self._metrics[key_name] = amount
     
     def increment(self, *args):
         for key_name in args:
@@ -23,8 +34,52 @@ class MetricCollector:
         else:
             return 0
     
+    """Records one sample, e.g. the latency of a single operation, for
+    metrics that are summarized as a distribution rather than a count
+    """
+    def record(self, key_name, value: float):
+        with self._lock:
+            if key_name in self._samples:
+                self._samples[key_name].append(value)
+            else:
+                self._samples[key_name] = [value]
+
+    def get_samples(self, key_name) -> List[float]:
+        if key_name in self._samples:
+            return self._samples[key_name]
+        else:
+            return []
+
+    """Returns the given percentile (0-100) of the recorded samples using
+    the nearest-rank method, or 0 if no samples were recorded
+    """
+    def get_percentile(self, key_name, percentile: float) -> float:
+        samples = sorted(self.get_samples(key_name))
+        if len(samples) == 0:
+            return 0
+        rank = max(math.ceil(percentile / 100 * len(samples)), 1)
+        return samples[rank - 1]
+
+    """Fraction of prefetched pages that were used before being evicted
+    """
+    def get_prefetch_accuracy(self) -> float:
+        prefetches = self.get_metric(Metric.BUFFER_MANAGER_PREFETCHES)
+        if prefetches == 0:
+            return 0
+        return self.get_metric(Metric.BUFFER_MANAGER_PREFETCHES_USED) / prefetches
+
+    """Fraction of the demand misses that prefetching avoided
+    """
+    def get_prefetch_coverage(self) -> float:
+        used = self.get_metric(Metric.BUFFER_MANAGER_PREFETCHES_USED)
+        misses = self.get_metric(Metric.BUFFER_MANAGER_MISSES)
+        if used + misses == 0:
+            return 0
+        return used / (used + misses)
+
     def reset(self):
         self._metrics.clear()
+        self._samples.clear()
 
 class Metric(Enum):
     BUFFER_MANAGER_ACCESSES = 1
@@ -32,4 +87,13 @@ class Metric(Enum):
     BUFFER_MANAGER_MISSES = 3
     BUFFER_MANAGER_EVICTIONS = 4
     BUFFER_MANAGER_CLEAN_EVICTIONS = 5
-    BUFFER_MANAGER_DIRTY_EVICTIONS = 6
\ No newline at end of file
+    BUFFER_MANAGER_DIRTY_EVICTIONS = 6
+    BUFFER_MANAGER_FIX_LATENCY = 7
+    BUFFER_MANAGER_PENDING_WRITE_WAIT = 8
+    BUFFER_MANAGER_BACKGROUND_CLEANS = 9
+    BUFFER_MANAGER_PREFETCHES = 10
+    BUFFER_MANAGER_PREFETCHES_USED = 11
+    BUFFER_MANAGER_PREFETCHES_WASTED = 12
+    BUFFER_MANAGER_BYTES_DIRTIED = 13
+    BUFFER_MANAGER_BYTES_WRITTEN = 14
+    BUFFER_MANAGER_BYTES_READ = 15
\ No newline at end of file
@@ -0,0 +1,122 @@
+from typing import Dict, List, Tuple
+import os, mmap
+
+from src.util.constants import PAGE_SIZE
+from src.buffer.file_manager import FileManager
+
+"""Implementation of the FileManager interface that maps each segment file
+into memory. Reads copy from the mapping, or return a view of it with
+read_block_view, without a system call. Writes copy into the mapping and
+msync the written range.
+
+A file that has grown past its mapping is mapped again with its new size
+on the first access past the old end. The old mapping is kept alive,
+since views of it may still be in use, and stays valid for the pages it
+covers.
+"""
+class MmapFileManager(FileManager):
+    # Mapped files are accessed through the page cache
+    _open_flags = os.O_CREAT | os.O_RDWR
+
+    def __init__(self, directory = 'data', page_size = PAGE_SIZE, extent_size = FileManager._initial_size):
+        super().__init__(directory, page_size, extent_size)
+        # key=file_path; value=mapping of the whole file
+        self._mappings: Dict[str, mmap.mmap] = {}
+        # key=file_path; value=mappings replaced after the file has grown
+        self._retired_mappings: Dict[str, List[mmap.mmap]] = {}
+
+    def __del__(self):
+        for file_path in list(self._mappings.keys()):
+            self._close_mappings(file_path)
+        super().__del__()
+
+    def remove_file(self, file_name: str):
+        self._close_mappings(self._get_file_path(file_name))
+        super().remove_file(file_name)
+
+    def _close_mappings(self, file_path: str):
+        mappings = self._retired_mappings.pop(file_path, [])
+        if file_path in self._mappings:
+            mappings.append(self._mappings.pop(file_path))
+        for mapping in mappings:
+            try:
+                mapping.close()
+            except BufferError:
+                # Views of the mapping are still in use, it is unmapped once they are released
+                pass
+
+    """ Returns a mapping of a file that covers at least its first size
+    bytes, mapping the file again if it has grown since it was mapped.
+    Returns None if the file is smaller than size.
+    """
+    def _get_mapping(self, file_name: str, size: int) -> mmap.mmap:
+        file_path = self._get_file_path(file_name)
+        mapping = self._mappings.get(file_path)
+        if mapping != None and len(mapping) >= size:
+            return mapping
+        if self._file_size(file_name) < size:
+            return None
+        with self._extent_locks[file_path]:
+            mapping = self._mappings.get(file_path)
+            if mapping == None or len(mapping) < size:
+                mapping = mmap.mmap(self._open_file(file_name), self._file_size(file_name))
+                old_mapping = self._mappings.get(file_path)
+                self._mappings[file_path] = mapping
+                if old_mapping != None:
+                    self._retired_mappings.setdefault(file_path, []).append(old_mapping)
+            return mapping
+
+    """ Returns a read-only view of a page in the mapping of its file.
+    Pages past the end of the file read as zeros.
+    """
+    def read_block_view(self, file_name: str, page_id: int) -> memoryview:
+        offset = page_id * self._page_size
+        mapping = self._get_mapping(file_name, offset + self._page_size)
+        if mapping == None:
+            return memoryview(bytes(self._page_size))
+        return memoryview(mapping)[offset:offset + self._page_size].toreadonly()
+
+    def read_block(self, file_name: str, page_id: int, dest: bytearray):
+        dest[:self._page_size] = self.read_block_view(file_name, page_id)
+
+    def read_blocks(self, file_name: str, page_id: int, dests: List[bytearray]):
+        for i, dest in enumerate(dests):
+            self.read_block(file_name, page_id + i, dest)
+
+    def write_block(self, file_name: str, page_id: int, src: bytearray):
+        self.write_blocks(file_name, page_id, [src])
+
+    """ Copies srcs into the mapping of the contiguous pages starting at
+    page_id and flushes them with one msync
+    """
+    def write_blocks(self, file_name: str, page_id: int, srcs: List[bytearray]):
+        offset = page_id * self._page_size
+        size = len(srcs) * self._page_size
+        self._ensure_file_size(file_name, offset + size)
+        mapping = self._get_mapping(file_name, offset + size)
+        for i, src in enumerate(srcs):
+            page_offset = offset + i * self._page_size
+            mapping[page_offset:page_offset + self._page_size] = src
+        # msync requires the range to start at a page of the mapping
+        flush_offset = offset - offset % mmap.PAGESIZE
+        mapping.flush(flush_offset, offset + size - flush_offset)
+
+    """ Copies the (offset, length) byte ranges of a page into dest
+    """
+    def read_sectors(self, file_name: str, page_id: int, dest: bytearray, ranges: List[Tuple[int, int]]):
+        view = self.read_block_view(file_name, page_id)
+        for start, length in ranges:
+            dest[start:start + length] = view[start:start + length]
+        view.release()
+
+    """ Copies the (offset, length) byte ranges of a page from src into the
+    mapping and flushes each of them
+    """
+    def write_sectors(self, file_name: str, page_id: int, src: bytearray, ranges: List[Tuple[int, int]]):
+        offset = page_id * self._page_size
+        self._ensure_file_size(file_name, offset + self._page_size)
+        mapping = self._get_mapping(file_name, offset + self._page_size)
+        for start, length in ranges:
+            mapping[offset + start:offset + start + length] = src[start:start + length]
+            flush_offset = offset + start - (offset + start) % mmap.PAGESIZE
+            mapping.flush(flush_offset, offset + start + length - flush_offset)
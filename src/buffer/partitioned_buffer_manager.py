@@ -0,0 +1,118 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List
+
+from src.buffer.metric_collector import MetricCollector
+from src.buffer.buffer_frame import BufferFrame
+from src.buffer.error import BufferFullError
+from src.buffer.buffer_manager import BufferManager
+from src.buffer.replacement.abstract_replacer import AbstractReplacer
+from src.buffer.file_manager import FileManager
+
+"""Buffer manager that splits the frame pool into independent shards.
+Every shard is a complete BufferManager with its own page table, free frame
+cursor, frame lock and replacer instance. Pages are assigned to a shard by
+a hash of their page id, so fixes of pages that live in different shards
+never contend on the same lock.
+"""
+class PartitionedBufferManager():
+    """
+    Arguments
+        frame_count: The total number of frames, split evenly across shards
+        page_size: The size of a page in bytes
+        replacer_factory: Called with the frame count of a shard, returns
+            the replacer used by that shard
+        file_manager: FileManager shared by all shards
+        metric_collector: MetricCollector shared by all shards
+        shard_count: The number of shards to split the pool into
+        Other keyword arguments are passed on to the BufferManager of every shard.
+    """
+    def __init__(self,
+                 frame_count: int,
+                 page_size: int,
+                 replacer_factory: Callable[[int], AbstractReplacer],
+                 file_manager: FileManager,
+                 metric_collector: MetricCollector,
+                 shard_count: int = 1,
+                 **kwargs):
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1.")
+        if frame_count < shard_count:
+            raise ValueError("frame_count must be at least shard_count.")
+        self._frame_count = frame_count
+        self._page_size = page_size
+        self._shard_count = shard_count
+
+        self._shards: List[BufferManager] = []
+        for i in range(self._shard_count):
+            # Spread the remainder over the first shards
+            shard_frame_count = frame_count // shard_count
+            if i < frame_count % shard_count:
+                shard_frame_count += 1
+            self._shards.append(BufferManager(shard_frame_count,
+                                              page_size,
+                                              replacer_factory(shard_frame_count),
+                                              file_manager,
+                                              metric_collector,
+                                              **kwargs))
+
+    @property
+    def shard_count(self) -> int:
+        return self._shard_count
+
+    @property
+    def shards(self) -> List[BufferManager]:
+        return self._shards
+
+    def close(self):
+        for shard in self._shards:
+            shard.close()
+
+    """ Returns the shard responsible for page_id
+    """
+    def _get_shard(self, page_id: int) -> BufferManager:
+        return self._shards[hash(page_id) % self._shard_count]
+
+    def page_present(self, page_id: int) -> bool:
+        return self._get_shard(page_id).page_present(page_id)
+
+    def safe_to_fix_page(self, page_id: int, exclusive: bool) -> bool:
+        return self._get_shard(page_id).safe_to_fix_page(page_id, exclusive)
+
+    def fix_page(self, page_id: int, exclusive: bool, is_prefetch=False) -> BufferFrame:
+        return self._get_shard(page_id).fix_page(page_id, exclusive, is_prefetch)
+
+    def unfix_page(self, frame: BufferFrame, is_dirty: bool, is_prefetch=False):
+        self._get_shard(frame.page_id).unfix_page(frame, is_dirty, is_prefetch)
+
+    """ Fixes the pages of every shard with one batch per shard.
+    Shards are visited in order, so batches do not deadlock with each other.
+    """
+    def fix_pages(self, page_ids: List[int], exclusive: bool) -> List[BufferFrame]:
+        shard_page_ids: List[List[int]] = [[] for i in range(self._shard_count)]
+        for page_id in page_ids:
+            shard_page_ids[hash(page_id) % self._shard_count].append(page_id)
+        frames = {}
+        try:
+            for shard, page_ids_of_shard in zip(self._shards, shard_page_ids):
+                if len(page_ids_of_shard) > 0:
+                    for frame in shard.fix_pages(page_ids_of_shard, exclusive):
+                        frames[frame.page_id] = frame
+        except BufferFullError:
+            self.unfix_pages(list(frames.values()), False)
+            raise
+        return [frames[page_id] for page_id in page_ids]
+
+    def unfix_pages(self, frames: List[BufferFrame], is_dirty: bool):
+        for frame in frames:
+            self.unfix_page(frame, is_dirty)
+
+    async def fix_page_async(self, page_id: int, exclusive: bool, is_prefetch=False) -> BufferFrame:
+        return await self._get_shard(page_id).fix_page_async(page_id, exclusive, is_prefetch)
+
+    async def unfix_page_async(self, frame: BufferFrame, is_dirty: bool, is_prefetch=False):
+        await self._get_shard(frame.page_id).unfix_page_async(frame, is_dirty, is_prefetch)
+
+    @asynccontextmanager
+    async def fix_page_guard_async(self, page_id: int, exclusive: bool) -> AsyncIterator[BufferFrame]:
+        async with self._get_shard(page_id).fix_page_guard_async(page_id, exclusive) as frame:
+            yield frame
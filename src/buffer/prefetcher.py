@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, List
+
+from src.util.page_id_utils import get_segment_id, get_segment_page_id
+
+"""Detects sequential runs of page accesses per segment and reads the
+following pages ahead of time on a pool of I/O threads.
+
+The readahead depth of each segment adapts to how useful its prefetches
+are: it doubles whenever a prefetched page is used and halves whenever a
+prefetched page is evicted without having been used.
+"""
+class Prefetcher():
+    """
+    Arguments
+        prefetch_page: Brings a page into the buffer pool. Called on an I/O thread.
+        max_depth: The maximum number of pages read ahead of a sequential run
+        min_depth: The number of pages read ahead of a newly detected run
+        thread_count: The number of I/O threads
+        sequential_threshold: The number of consecutive pages after which
+            accesses to a segment are considered sequential
+    """
+    def __init__(self,
+                 prefetch_page: Callable[[int], None],
+                 max_depth: int = 8,
+                 min_depth: int = 1,
+                 thread_count: int = 2,
+                 sequential_threshold: int = 2):
+        if min_depth < 1 or max_depth < min_depth:
+            raise ValueError("Depths must satisfy 1 <= min_depth <= max_depth.")
+        self._prefetch_page = prefetch_page
+        self._max_depth = max_depth
+        self._min_depth = min_depth
+        self._sequential_threshold = sequential_threshold
+        self._executor = ThreadPoolExecutor(max_workers=thread_count)
+        self._mutex = Lock()
+        # key=segment_id; value=[<last page>, <run length>, <depth>, <next page to prefetch>]
+        self._streams: Dict[int, List[int]] = {}
+        self._stopped = False
+
+    def get_depth(self, segment_id: int) -> int:
+        with self._mutex:
+            if segment_id not in self._streams:
+                return self._min_depth
+            return self._streams[segment_id][2]
+
+    """ Notifies the prefetcher of a demand access to page_id and
+    starts reading ahead if it continues a sequential run.
+    Returns the pages that are read ahead.
+    """
+    def on_access(self, page_id: int) -> List[int]:
+        segment_id = get_segment_id(page_id)
+        segment_page_id = get_segment_page_id(page_id)
+        with self._mutex:
+            if self._stopped:
+                return []
+            if segment_id not in self._streams:
+                self._streams[segment_id] = [segment_page_id, 1, self._min_depth, segment_page_id + 1]
+                return []
+            stream = self._streams[segment_id]
+            # Accesses to pages that were already read ahead continue the run
+            if stream[0] < segment_page_id <= max(stream[0] + 1, stream[3] - 1):
+                stream[1] += segment_page_id - stream[0]
+            else:
+                stream[1] = 1
+                stream[3] = segment_page_id + 1
+            stream[0] = segment_page_id
+            if stream[1] < self._sequential_threshold:
+                return []
+            first_page = max(stream[3], segment_page_id + 1)
+            last_page = segment_page_id + stream[2]
+            stream[3] = max(stream[3], last_page + 1)
+            pages = [page_id - segment_page_id + p for p in range(first_page, last_page + 1)]
+            for prefetched_page_id in pages:
+                self._executor.submit(self._prefetch_page, prefetched_page_id)
+        return pages
+
+    """ Notifies the prefetcher that a prefetched page has been used
+    """
+    def on_prefetch_used(self, page_id: int):
+        with self._mutex:
+            stream = self._streams.get(get_segment_id(page_id))
+            if stream != None:
+                stream[2] = min(stream[2] * 2, self._max_depth)
+
+    """ Notifies the prefetcher that a prefetched page has been evicted
+    without being used
+    """
+    def on_prefetch_wasted(self, page_id: int):
+        with self._mutex:
+            stream = self._streams.get(get_segment_id(page_id))
+            if stream != None:
+                stream[2] = max(stream[2] // 2, self._min_depth)
+
+    """ Waits for all issued reads and stops the I/O threads.
+    Accesses after shutdown are not read ahead anymore.
+    """
+    def shutdown(self):
+        with self._mutex:
+            self._stopped = True
+        self._executor.shutdown(wait=True)
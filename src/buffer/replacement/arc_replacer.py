@@ -0,0 +1,128 @@
+from threading import Lock
+from typing import Dict, List
+from collections import OrderedDict
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.abstract_replacer import AbstractReplacer
+
+"""ARC (Megiddo and Modha). Pages seen once since they entered the pool are
+on T1, pages seen at least twice on T2, both in LRU order. B1 and B2
+remember the page ids evicted from T1 and T2. The target size p of T1
+adapts to the workload: a miss on a page in B1 means T1 was too small and
+grows p, a miss on a page in B2 shrinks it. Victims are taken from T1
+while it holds more than p pages, and from T2 otherwise. T1 and B1 hold at
+most page_count entries together, all four lists at most twice that.
+
+get_victim is called before the page that caused the miss is pinned, so,
+unlike the paper, it cannot prefer T1 on a tie for a page in B2, and p is
+adapted when the page is pinned.
+
+The lists only hold unpinned pages. A page is queued when it is
+unpinned, so that the lists order pages by their last release, and
+taking a victim is constant time. If the list that should be evicted
+from only has pinned pages, the other one is evicted from.
+"""
+class ARCReplacer(AbstractReplacer):
+    _T1 = 1
+    _T2 = 2
+
+    def __init__(self, page_count):
+        super().__init__(page_count)
+        self._mutex = Lock()
+        # key=page_id; value=_T1 or _T2, for all pages in the pool
+        self._pages: Dict[int, int] = {}
+        # Number of pages on T1 and T2, pinned or not
+        self._t1_count = 0
+        self._t2_count = 0
+        self._t1_queue = OrderedDict()
+        self._t2_queue = OrderedDict()
+        self._b1_queue = OrderedDict()
+        self._b2_queue = OrderedDict()
+        self._target_t1_size = 0.0
+
+    @property
+    def target_t1_size(self) -> float:
+        return self._target_t1_size
+
+    """ Unpinned pages of T1 in eviction order
+    """
+    @property
+    def t1_queue(self) -> List[int]:
+        return list(self._t1_queue)
+
+    """ Unpinned pages of T2 in eviction order
+    """
+    @property
+    def t2_queue(self) -> List[int]:
+        return list(self._t2_queue)
+
+    @property
+    def b1_queue(self) -> List[int]:
+        return list(self._b1_queue)
+
+    @property
+    def b2_queue(self) -> List[int]:
+        return list(self._b2_queue)
+
+    def pin_page(self, page_id: int):
+        with self._mutex:
+            queue = self._pages.get(page_id)
+            if queue == ARCReplacer._T1:
+                self._t1_queue.pop(page_id, None)
+                self._t1_count -= 1
+                self._t2_count += 1
+                self._pages[page_id] = ARCReplacer._T2
+            elif queue == ARCReplacer._T2:
+                self._t2_queue.pop(page_id, None)
+            elif page_id in self._b1_queue:
+                self._target_t1_size = min(self._page_count, self._target_t1_size
+                                           + max(len(self._b2_queue) / len(self._b1_queue), 1))
+                del self._b1_queue[page_id]
+                self._t2_count += 1
+                self._pages[page_id] = ARCReplacer._T2
+            elif page_id in self._b2_queue:
+                self._target_t1_size = max(0, self._target_t1_size
+                                           - max(len(self._b1_queue) / len(self._b2_queue), 1))
+                del self._b2_queue[page_id]
+                self._t2_count += 1
+                self._pages[page_id] = ARCReplacer._T2
+            else:
+                self._t1_count += 1
+                self._pages[page_id] = ARCReplacer._T1
+            self._trim_history()
+
+    def unpin_page(self, page_id: int, dirty: bool = False):
+        with self._mutex:
+            queue = self._pages.get(page_id)
+            if queue == None:
+                raise ValueError(f"Error: Page {page_id} is not found. Failed to unpin.")
+            if queue == ARCReplacer._T1:
+                self._t1_queue[page_id] = None
+            else:
+                self._t2_queue[page_id] = None
+
+    def get_victim(self) -> int:
+        with self._mutex:
+            if len(self._t1_queue) > 0 \
+               and (self._t1_count > self._target_t1_size or len(self._t2_queue) == 0):
+                victim = self._t1_queue.popitem(last=False)[0]
+                self._t1_count -= 1
+                self._b1_queue[victim] = None
+            elif len(self._t2_queue) > 0:
+                victim = self._t2_queue.popitem(last=False)[0]
+                self._t2_count -= 1
+                self._b2_queue[victim] = None
+            else:
+                raise BufferFullError()
+            del self._pages[victim]
+            self._trim_history()
+            return victim
+
+    """ Drops the oldest page ids of B1 and B2 beyond the sizes ARC allows
+    Preconditions: _mutex is held by the caller.
+    """
+    def _trim_history(self):
+        while len(self._b1_queue) > 0 and self._t1_count + len(self._b1_queue) > self._page_count:
+            self._b1_queue.popitem(last=False)
+        while len(self._b2_queue) > 0 and self._t1_count + self._t2_count \
+              + len(self._b1_queue) + len(self._b2_queue) > 2 * self._page_count:
+            self._b2_queue.popitem(last=False)
@@ -0,0 +1,99 @@
+from threading import Lock
+from typing import Dict, List
+from collections import OrderedDict
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.abstract_replacer import AbstractReplacer
+
+"""CFLRU (Park et al.): LRU whose window_size least recently used pages form
+a clean-first region. The least recently used clean page of the region is
+evicted, so that dirty pages stay in the pool longer and fewer of them are
+written back. Only if the region has no clean page, its least recently
+used dirty page is evicted.
+
+The queues only hold unpinned pages. A page is queued when it is
+unpinned, so that they order pages by their last release. The region is
+kept in a queue of its own, with its clean pages in another one, and is
+refilled from the head of the working queue, so that taking a victim is
+constant time.
+
+A page counts as dirty from the first unpin that reports it dirty until it
+is evicted, since the replacer is not told about background write-back.
+"""
+class CFLRUReplacer(AbstractReplacer):
+    """
+    Arguments
+        window_size: The number of least recently used unpinned pages in
+            the clean-first region. None uses half of page_count.
+    """
+    def __init__(self, page_count, window_size: int = None):
+        super().__init__(page_count)
+        self._mutex = Lock()
+        self._window_size = window_size if window_size != None else max(page_count // 2, 1)
+        # key=page_id; value=whether the page is dirty, for all pages in the pool
+        self._pages: Dict[int, bool] = {}
+        # The window_size least recently used unpinned pages
+        self._window_queue = OrderedDict()
+        # Clean pages of the window queue in the same order
+        self._clean_window_queue = OrderedDict()
+        # Unpinned pages more recently used than the clean-first region
+        self._working_queue = OrderedDict()
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    """ Unpinned pages of the clean-first region in LRU order
+    """
+    @property
+    def window_queue(self) -> List[int]:
+        return list(self._window_queue)
+
+    """ Unpinned pages outside the clean-first region in LRU order
+    """
+    @property
+    def working_queue(self) -> List[int]:
+        return list(self._working_queue)
+
+    def pin_page(self, page_id: int):
+        with self._mutex:
+            if page_id not in self._pages:
+                self._pages[page_id] = False
+            elif page_id in self._window_queue:
+                del self._window_queue[page_id]
+                self._clean_window_queue.pop(page_id, None)
+                self._fill_window()
+            else:
+                self._working_queue.pop(page_id, None)
+
+    def unpin_page(self, page_id: int, dirty: bool = False):
+        with self._mutex:
+            if page_id not in self._pages:
+                raise ValueError(f"Error: Page {page_id} is not found. Failed to unpin.")
+            if dirty:
+                self._pages[page_id] = True
+            self._working_queue[page_id] = None
+            self._fill_window()
+
+    def get_victim(self) -> int:
+        with self._mutex:
+            if len(self._clean_window_queue) > 0:
+                victim = self._clean_window_queue.popitem(last=False)[0]
+                del self._window_queue[victim]
+            elif len(self._window_queue) > 0:
+                victim = self._window_queue.popitem(last=False)[0]
+            else:
+                raise BufferFullError()
+            del self._pages[victim]
+            self._fill_window()
+            return victim
+
+    """ Moves the least recently used pages of the working queue to the
+    clean-first region until it holds window_size pages
+    Preconditions: _mutex is held by the caller.
+    """
+    def _fill_window(self):
+        while len(self._window_queue) < self._window_size and len(self._working_queue) > 0:
+            page_id = self._working_queue.popitem(last=False)[0]
+            self._window_queue[page_id] = None
+            if not self._pages[page_id]:
+                self._clean_window_queue[page_id] = None
@@ -0,0 +1,302 @@
+from threading import Lock
+from typing import Dict, List
+from src.buffer.replacement.abstract_replacer import AbstractReplacer
+from src.buffer.error import BufferFullError
+from src.util.constants import INVALID_PAGE_ID
+
+"""CLOCK-Pro: separates pages that are re-accessed within a short reuse
+distance (hot) from pages that are not (cold), and only evicts cold pages.
+
+A page starts out cold and in its test period. If it is accessed again
+within the test period, it becomes hot. Evicted cold pages stay on the
+clock without their data (non-resident) until their test period ends, so
+that a page that comes back soon is recognized. The pages are kept on one
+circular list, with new pages inserted in front of the hot hand.
+  - The cold hand looks for a victim among the resident cold pages.
+    Referenced pages in their test period become hot, other referenced
+    pages start a new test period.
+  - The hot hand turns unreferenced hot pages cold, when there are more
+    hot pages than the target allows, and ends the test periods it passes.
+  - The test hand ends test periods to bound the non-resident pages by the
+    number of frames.
+The target number of resident cold pages grows when a non-resident page
+is accessed again and shrinks when a test period ends without an access.
+
+The state of the pages is kept in flat arrays indexed by node. As with
+ClockReplacer, pinning and unpinning a resident page only set bytes of
+them, without taking the mutex, and a page must not be pinned while
+get_victim may return it.
+"""
+class ClockProReplacer(AbstractReplacer):
+    _HOT = 1
+    _TEST = 2
+    _RESIDENT = 4
+
+    def __init__(self, frame_count):
+        super().__init__(frame_count)
+        node_count = 2 * frame_count
+        # key=page_id; value=node, for resident and non-resident pages
+        self._nodes: Dict[int, int] = {}
+        self._pages: List[int] = [INVALID_PAGE_ID] * node_count
+        self._next: List[int] = [-1] * node_count
+        self._prev: List[int] = [-1] * node_count
+        self._flags = bytearray(node_count)
+        self._referenced = bytearray(node_count)
+        # Free and non-resident nodes count as pinned, so that get_victim
+        # can tell quickly whether any page can be evicted
+        self._pinned = bytearray(b'\x01' * node_count)
+        self._free_nodes = list(range(node_count - 1, -1, -1))
+        # -1 while the clock is empty
+        self._hand_hot = -1
+        self._hand_cold = -1
+        self._hand_test = -1
+        self._hot_count = 0
+        self._cold_count = 0
+        self._non_resident_count = 0
+        self._cold_target = max(1, frame_count // 2)
+        self._mutex = Lock()
+
+    @property
+    def hot_count(self) -> int:
+        return self._hot_count
+
+    @property
+    def cold_count(self) -> int:
+        return self._cold_count
+
+    @property
+    def non_resident_count(self) -> int:
+        return self._non_resident_count
+
+    @property
+    def cold_target(self) -> int:
+        return self._cold_target
+
+    def pin_page(self, page_id: int):
+        node = self._nodes.get(page_id)
+        if node != None and self._flags[node] & ClockProReplacer._RESIDENT:
+            self._referenced[node] = 1
+        else:
+            node = self._add_page(page_id)
+        self._pinned[node] = 1
+
+    def unpin_page(self, page_id: int, dirty: bool = False):
+        node = self._nodes.get(page_id)
+        if node == None or not self._flags[node] & ClockProReplacer._RESIDENT:
+            node = self._add_page(page_id)
+        self._pinned[node] = 0
+
+    """ Puts a page that is not resident on the clock. A page that comes
+    back during its test period becomes hot, any other page is cold.
+    Returns its node.
+    """
+    def _add_page(self, page_id: int) -> int:
+        with self._mutex:
+            node = self._nodes.get(page_id)
+            if node != None and self._flags[node] & ClockProReplacer._RESIDENT:
+                return node
+            if node != None:
+                self._cold_target = min(self._cold_target + 1, max(self._page_count - 1, 1))
+                self._non_resident_count -= 1
+                self._flags[node] = ClockProReplacer._HOT | ClockProReplacer._RESIDENT
+                self._hot_count += 1
+                self._unlink(node)
+            else:
+                node = self._allocate_node(page_id)
+                self._flags[node] = ClockProReplacer._TEST | ClockProReplacer._RESIDENT
+                self._cold_count += 1
+            self._referenced[node] = 0
+            self._insert_at_head(node)
+            self._limit_hot_pages()
+            return node
+
+    """ Preconditions: _mutex is held by the caller.
+    """
+    def _allocate_node(self, page_id: int) -> int:
+        if len(self._free_nodes) == 0:
+            self._free_nodes.append(len(self._pages))
+            self._pages.append(INVALID_PAGE_ID)
+            self._next.append(-1)
+            self._prev.append(-1)
+            self._flags.append(0)
+            self._referenced.append(0)
+            self._pinned.append(1)
+        node = self._free_nodes.pop()
+        self._pages[node] = page_id
+        self._nodes[page_id] = node
+        return node
+
+    """ Preconditions: _mutex is held by the caller and node is unlinked.
+    """
+    def _free_node(self, node: int):
+        del self._nodes[self._pages[node]]
+        self._pages[node] = INVALID_PAGE_ID
+        self._flags[node] = 0
+        self._referenced[node] = 0
+        self._pinned[node] = 1
+        self._free_nodes.append(node)
+
+    """ Inserts a node at the head of the list, which is right behind the
+    hot hand, so that it is the last node the hot hand reaches.
+    Preconditions: _mutex is held by the caller.
+    """
+    def _insert_at_head(self, node: int):
+        if self._hand_hot == -1:
+            self._next[node] = node
+            self._prev[node] = node
+            self._hand_hot = node
+            self._hand_cold = node
+            self._hand_test = node
+            return
+        prev = self._prev[self._hand_hot]
+        self._next[prev] = node
+        self._prev[node] = prev
+        self._next[node] = self._hand_hot
+        self._prev[self._hand_hot] = node
+
+    """ Removes a node from the list, moving the hands that point to it on.
+    Preconditions: _mutex is held by the caller.
+    """
+    def _unlink(self, node: int):
+        next = self._next[node]
+        if next == node:
+            self._hand_hot = -1
+            self._hand_cold = -1
+            self._hand_test = -1
+            return
+        if self._hand_hot == node:
+            self._hand_hot = next
+        if self._hand_cold == node:
+            self._hand_cold = next
+        if self._hand_test == node:
+            self._hand_test = next
+        prev = self._prev[node]
+        self._next[prev] = next
+        self._prev[next] = prev
+
+    def _move_to_head(self, node: int):
+        self._unlink(node)
+        self._insert_at_head(node)
+
+    def get_victim(self) -> int:
+        with self._mutex:
+            if self._pinned.find(0) == -1:
+                raise BufferFullError()
+            while True:
+                # Without a victim among the cold pages, turn a hot page cold
+                if self._cold_count == 0:
+                    self._run_hot_hand()
+                victim = self._run_cold_hand(2 * (self._hot_count + self._cold_count + self._non_resident_count))
+                if victim != INVALID_PAGE_ID:
+                    return victim
+                if self._pinned.find(0) == -1:
+                    raise BufferFullError()
+                self._run_hot_hand()
+
+    """ Moves the cold hand until it has evicted a page, for at most
+    max_steps nodes.
+    Returns the page that was evicted, or INVALID_PAGE_ID.
+    Preconditions: _mutex is held by the caller.
+    """
+    def _run_cold_hand(self, max_steps: int) -> int:
+        next, flags, pinned = self._next, self._flags, self._pinned
+        for i in range(0, max_steps):
+            node = self._hand_cold
+            self._hand_cold = next[node]
+            # Only unpinned resident cold pages are looked at
+            if flags[node] & (ClockProReplacer._HOT | ClockProReplacer._RESIDENT) != ClockProReplacer._RESIDENT \
+               or pinned[node]:
+                continue
+            victim = self._run_cold_hand_at(node)
+            if victim != INVALID_PAGE_ID:
+                return victim
+        return INVALID_PAGE_ID
+
+    """ Gives a referenced cold page another test period or makes it hot,
+    and evicts it otherwise.
+    Returns the page that was evicted, or INVALID_PAGE_ID.
+    Preconditions: _mutex is held by the caller.
+    """
+    def _run_cold_hand_at(self, node: int) -> int:
+        flags = self._flags[node]
+        if self._referenced[node]:
+            self._referenced[node] = 0
+            if flags & ClockProReplacer._TEST:
+                self._flags[node] = ClockProReplacer._HOT | ClockProReplacer._RESIDENT
+                self._cold_count -= 1
+                self._hot_count += 1
+                self._move_to_head(node)
+                self._limit_hot_pages()
+            else:
+                self._flags[node] = ClockProReplacer._TEST | ClockProReplacer._RESIDENT
+                self._move_to_head(node)
+            return INVALID_PAGE_ID
+        victim = self._pages[node]
+        self._cold_count -= 1
+        if flags & ClockProReplacer._TEST:
+            self._flags[node] = ClockProReplacer._TEST
+            self._pinned[node] = 1
+            self._non_resident_count += 1
+            while self._non_resident_count > self._page_count:
+                self._run_test_hand()
+        else:
+            self._unlink(node)
+            self._free_node(node)
+        return victim
+
+    """ Preconditions: _mutex is held by the caller.
+    """
+    def _limit_hot_pages(self):
+        while self._hot_count > max(self._page_count - self._cold_target, 1):
+            self._run_hot_hand()
+
+    """ Moves the hot hand until it has turned a hot page cold, ending the
+    test periods of the cold pages it passes.
+    Preconditions: _mutex is held by the caller.
+    """
+    def _run_hot_hand(self):
+        while self._hot_count > 0:
+            node = self._hand_hot
+            next = self._next[node]
+            flags = self._flags[node]
+            if flags & ClockProReplacer._HOT:
+                self._hand_hot = next
+                if self._referenced[node]:
+                    self._referenced[node] = 0
+                else:
+                    self._flags[node] = ClockProReplacer._RESIDENT
+                    self._hot_count -= 1
+                    self._cold_count += 1
+                    return
+            else:
+                if flags & ClockProReplacer._TEST:
+                    self._end_test_period(node)
+                self._hand_hot = next
+
+    """ Moves the test hand until it has removed a non-resident page,
+    ending the test periods of the cold pages it passes.
+    Preconditions: _mutex is held by the caller.
+    """
+    def _run_test_hand(self):
+        while True:
+            node = self._hand_test
+            next = self._next[node]
+            flags = self._flags[node]
+            if flags & ClockProReplacer._TEST:
+                self._end_test_period(node)
+            self._hand_test = next
+            if flags == ClockProReplacer._TEST:
+                return
+
+    """ A cold page whose test period ends without an access shrinks the
+    target of cold pages. A non-resident page is removed from the clock.
+    Preconditions: _mutex is held by the caller.
+    """
+    def _end_test_period(self, node: int):
+        self._cold_target = max(self._cold_target - 1, 1)
+        if self._flags[node] & ClockProReplacer._RESIDENT:
+            self._flags[node] = ClockProReplacer._RESIDENT
+        else:
+            self._non_resident_count -= 1
+            self._unlink(node)
+            self._free_node(node)
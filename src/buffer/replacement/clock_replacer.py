@@ -0,0 +1,83 @@
+from threading import Lock
+from typing import Dict, List
+from src.buffer.replacement.abstract_replacer import AbstractReplacer
+from src.buffer.error import BufferFullError
+from src.util.constants import INVALID_PAGE_ID
+
+"""Evicts pages in the order of a clock hand sweeping over the buffer pool,
+giving every page that was accessed since the hand last passed it a second
+chance.
+
+The state of the pages is kept in flat arrays indexed by slot, one slot per
+frame. Pinning a page that has a slot only sets its pinned and referenced
+bytes, and unpinning it clears its pinned byte, without taking the mutex.
+Only giving a slot to a new page and sweeping the hand are serialized.
+As with every replacer, a page must not be pinned while get_victim may
+return it, which the buffer manager ensures by holding its frames lock.
+"""
+class ClockReplacer(AbstractReplacer):
+    def __init__(self, frame_count):
+        super().__init__(frame_count)
+        # key=page_id; value=slot
+        self._slots: Dict[int, int] = {}
+        self._pages: List[int] = [INVALID_PAGE_ID] * frame_count
+        self._referenced = bytearray(frame_count)
+        # Free slots count as pinned, so that the hand never stops at them
+        self._pinned = bytearray(b'\x01' * frame_count)
+        self._free_slots = list(range(frame_count - 1, -1, -1))
+        self._hand = 0
+        self._mutex = Lock()
+
+    def pin_page(self, page_id: int):
+        slot = self._slots.get(page_id)
+        if slot == None:
+            slot = self._assign_slot(page_id)
+        self._pinned[slot] = 1
+        self._referenced[slot] = 1
+
+    def unpin_page(self, page_id: int, dirty: bool = False):
+        slot = self._slots.get(page_id)
+        if slot == None:
+            slot = self._assign_slot(page_id)
+        self._pinned[slot] = 0
+
+    """ Gives a page that is new to the replacer a free slot. The arrays
+    grow if a buffer manager hands over more pages than frames.
+    """
+    def _assign_slot(self, page_id: int) -> int:
+        with self._mutex:
+            slot = self._slots.get(page_id)
+            if slot != None:
+                return slot
+            if len(self._free_slots) == 0:
+                self._free_slots.append(len(self._pages))
+                self._pages.append(INVALID_PAGE_ID)
+                self._referenced.append(0)
+                self._pinned.append(1)
+            slot = self._free_slots.pop()
+            self._pages[slot] = page_id
+            self._referenced[slot] = 0
+            self._slots[page_id] = slot
+            return slot
+
+    def get_victim(self) -> int:
+        with self._mutex:
+            while True:
+                if self._pinned.find(0) == -1:
+                    raise BufferFullError()
+                # Within two rotations the hand clears all referenced bytes
+                # and reaches an unpinned page, unless it was pinned meanwhile
+                for i in range(0, 2 * len(self._pages)):
+                    slot = self._hand
+                    self._hand = (self._hand + 1) % len(self._pages)
+                    if self._pinned[slot]:
+                        continue
+                    if self._referenced[slot]:
+                        self._referenced[slot] = 0
+                        continue
+                    victim = self._pages[slot]
+                    del self._slots[victim]
+                    self._pages[slot] = INVALID_PAGE_ID
+                    self._pinned[slot] = 1
+                    self._free_slots.append(slot)
+                    return victim
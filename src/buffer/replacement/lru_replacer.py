@@ -1,44 +1,72 @@
-from random import Random
 from threading import Lock
 from collections import OrderedDict
 from src.buffer.replacement.abstract_replacer import AbstractReplacer
 from src.buffer.error import BufferFullError
-from src.util.constants import INVALID_PAGE_ID
 
+"""Evicts the unpinned page that was pinned least recently.
+
+Pages are queued in the order they were last pinned. Pinned pages are not
+removed from the queue on pin, since that would be O(n) for an OrderedDict
+kept in pin order. Instead, get_victim takes pinned pages it finds at the
+head of the queue out of it, so that every pin costs at most one step of a
+later eviction, and victim selection as well as pin and unpin are O(1)
+amortized.
+
+A page taken out that way was pinned before every page still in the queue.
+When it is unpinned, it is queued in front of them, ordered by the time it
+was unpinned among the other pages taken out.
+"""
 class LRUReplacer(AbstractReplacer):
     def __init__(self, frame_count):
         super().__init__(frame_count)
         self._unpinned_pages = set()
-        # self._lru_queue = []
+        # Pages in the order of their last pin, may contain pinned pages
         self._lru_queue = OrderedDict()
+        # Pinned pages that get_victim has taken out of _lru_queue
+        self._skipped_pages = set()
+        # Skipped pages that have been unpinned since, evicted before _lru_queue
+        self._released_queue = OrderedDict()
+        self._scanned_entries = 0
         self._mutex = Lock()
 
+    """ The number of queue entries get_victim has looked at
+    """
+    @property
+    def scanned_entries(self) -> int:
+        return self._scanned_entries
+
     def pin_page(self, page_id: int):
-        self._mutex.acquire()
-        if page_id in self._unpinned_pages:
-            self._unpinned_pages.remove(page_id)
-        if page_id in self._lru_queue:
-            # self._lru_queue.remove(page_id)
-            self._lru_queue.move_to_end(page_id)
-        else:
-            self._lru_queue[page_id] = None
-        self._mutex.release()        
+        with self._mutex:
+            self._unpinned_pages.discard(page_id)
+            self._skipped_pages.discard(page_id)
+            self._released_queue.pop(page_id, None)
+            if page_id in self._lru_queue:
+                self._lru_queue.move_to_end(page_id)
+            else:
+                self._lru_queue[page_id] = None
 
     def unpin_page(self, page_id: int, dirty: bool = False):
-        self._mutex.acquire()
-        self._unpinned_pages.add(page_id)
-        self._mutex.release()
+        with self._mutex:
+            self._unpinned_pages.add(page_id)
+            if page_id in self._skipped_pages:
+                self._skipped_pages.remove(page_id)
+                self._released_queue[page_id] = None
+            elif page_id not in self._lru_queue:
+                self._lru_queue[page_id] = None
 
     def get_victim(self) -> int:
-        self._mutex.acquire()
-        if len(self._unpinned_pages) == 0:
-            raise BufferFullError()
-        victim = INVALID_PAGE_ID
-        for page in self._lru_queue:
-            if page in self._unpinned_pages:
-                victim = page
-                self._unpinned_pages.remove(victim)
-                self._lru_queue.pop(victim)
-                break
-        self._mutex.release()
-        return victim
\ No newline at end of file
+        with self._mutex:
+            if len(self._unpinned_pages) == 0:
+                raise BufferFullError()
+            if len(self._released_queue) > 0:
+                victim = self._released_queue.popitem(last=False)[0]
+                self._scanned_entries += 1
+            else:
+                while True:
+                    victim = self._lru_queue.popitem(last=False)[0]
+                    self._scanned_entries += 1
+                    if victim in self._unpinned_pages:
+                        break
+                    self._skipped_pages.add(victim)
+            self._unpinned_pages.remove(victim)
+            return victim
@@ -0,0 +1,68 @@
+from threading import Lock
+from typing import Dict, List
+from collections import OrderedDict
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.abstract_replacer import AbstractReplacer
+
+"""LRU-WSR (Jung et al.): LRU with a second chance for dirty pages. A clean
+page at the LRU end is evicted. A dirty page at the LRU end is evicted only
+if it is marked cold, otherwise it is marked cold and moved to the MRU end.
+Accessing a page clears its mark, so dirty pages that are used again stay
+in the pool, while dirty pages that are not are evicted on their second
+turn. Every page moved has been accessed since it was last moved, so
+taking a victim is constant time amortized.
+
+The queue only holds unpinned pages. A page is queued when it is
+unpinned, so that it orders pages by their last release.
+
+A page counts as dirty from the first unpin that reports it dirty until it
+is evicted, since the replacer is not told about background write-back.
+"""
+class LRUWSRReplacer(AbstractReplacer):
+    def __init__(self, page_count):
+        super().__init__(page_count)
+        self._mutex = Lock()
+        # key=page_id; value=whether the page is dirty, for all pages in the pool
+        self._pages: Dict[int, bool] = {}
+        self._lru_queue = OrderedDict()
+        # Dirty pages that have had their second chance
+        self._cold_pages = set()
+
+    """ Unpinned pages in LRU order
+    """
+    @property
+    def lru_queue(self) -> List[int]:
+        return list(self._lru_queue)
+
+    @property
+    def cold_pages(self) -> List[int]:
+        return list(self._cold_pages)
+
+    def pin_page(self, page_id: int):
+        with self._mutex:
+            if page_id in self._pages:
+                self._lru_queue.pop(page_id, None)
+                self._cold_pages.discard(page_id)
+            else:
+                self._pages[page_id] = False
+
+    def unpin_page(self, page_id: int, dirty: bool = False):
+        with self._mutex:
+            if page_id not in self._pages:
+                raise ValueError(f"Error: Page {page_id} is not found. Failed to unpin.")
+            if dirty:
+                self._pages[page_id] = True
+            self._lru_queue[page_id] = None
+
+    def get_victim(self) -> int:
+        with self._mutex:
+            while len(self._lru_queue) > 0:
+                page_id = next(iter(self._lru_queue))
+                if not self._pages[page_id] or page_id in self._cold_pages:
+                    del self._lru_queue[page_id]
+                    del self._pages[page_id]
+                    self._cold_pages.discard(page_id)
+                    return page_id
+                self._cold_pages.add(page_id)
+                self._lru_queue.move_to_end(page_id)
+            raise BufferFullError()
@@ -25,6 +25,7 @@ class RandomReplacer(AbstractReplacer):
     def get_victim(self) -> int:
         self._mutex.acquire()
         if len(self._unpinned_pages) == 0:
+            self._mutex.release()
             raise BufferFullError()
         victim = self._unpinned_pages.pop()
         self._mutex.release()
@@ -1,68 +1,104 @@
 from threading import Lock
+from typing import Dict, List
 from src.buffer.error import BufferFullError
 from src.buffer.replacement.abstract_replacer import AbstractReplacer
 from collections import OrderedDict
-from src.util.constants import INVALID_PAGE_ID
 
+"""Full 2Q (Johnson and Shasha). A page seen for the first time is put on
+A1in, a FIFO queue. Pages evicted from A1in are remembered in A1out, a
+FIFO queue of page ids without data. A page that is accessed again while
+it is in A1out has been re-referenced after a while and goes to Am, an LRU
+queue of hot pages. Accesses to pages in A1in are correlated references
+and do not promote them, so a scan only ever passes through A1in.
 
+Victims are taken from A1in while it holds more than kin pages, and from
+Am otherwise. A1out holds at most kout page ids.
+
+The queues only hold unpinned pages. A page is queued when it is
+unpinned, so that the queues order pages by their last release, and
+taking a victim is constant time.
+"""
 class TwoQReplacer(AbstractReplacer):
-    def __init__(self, page_count):
+    _A1IN = 0
+    _AM = 1
+
+    """
+    Arguments
+        kin: The number of pages in A1in above which A1in is evicted
+            from. None uses a quarter of page_count.
+        kout: The number of page ids A1out holds. None uses half of
+            page_count.
+    """
+    def __init__(self, page_count, kin: int = None, kout: int = None):
         super().__init__(page_count)
         self._mutex = Lock()
-        self._fifo_queue = OrderedDict()
-        self._lru_queue = OrderedDict()
-        self._pages = {} # key=page_id; value=[<in_fifo>, <isPinned>]
+        self._kin = kin if kin != None else max(page_count // 4, 1)
+        self._kout = kout if kout != None else max(page_count // 2, 1)
+        # key=page_id; value=_A1IN or _AM, for all pages in the pool
+        self._pages: Dict[int, int] = {}
+        self._pinned_pages = set()
+        # Number of pages in A1in, pinned or not
+        self._a1in_count = 0
+        self._a1in_queue = OrderedDict()
+        self._am_queue = OrderedDict()
+        self._a1out_queue = OrderedDict()
+
+    """ Unpinned pages of A1in in eviction order
+    """
+    @property
+    def a1in_queue(self) -> List[int]:
+        return list(self._a1in_queue)
 
+    """ Unpinned pages of Am in eviction order
+    """
     @property
-    def fifo_q(self):
-        return self._fifo_queue
+    def am_queue(self) -> List[int]:
+        return list(self._am_queue)
 
+    """ Page ids remembered after their eviction from A1in, oldest first
+    """
     @property
-    def lru_q(self):
-        return self._lru_queue
+    def a1out_queue(self) -> List[int]:
+        return list(self._a1out_queue)
 
     def pin_page(self, page_id: int):
-        # print(f"PIN {page_id}")
-        self._mutex.acquire()
-        if page_id not in self._pages: # page has not been used
-            self._pages[page_id] = [True, True]
-            self._fifo_queue[page_id] = None
-        else:
-            if self._pages[page_id][0]: # page is in fifo
-                self._fifo_queue.pop(page_id)
-                self._lru_queue[page_id] = None
+        with self._mutex:
+            queue = self._pages.get(page_id)
+            if queue == TwoQReplacer._A1IN:
+                self._a1in_queue.pop(page_id, None)
+            elif queue == TwoQReplacer._AM:
+                self._am_queue.pop(page_id, None)
+            elif page_id in self._a1out_queue:
+                del self._a1out_queue[page_id]
+                self._pages[page_id] = TwoQReplacer._AM
             else:
-                self._lru_queue.move_to_end(page_id)
-            self._pages[page_id] = [False, True] # page is in lru and is being pinned
-        self._mutex.release()
+                self._pages[page_id] = TwoQReplacer._A1IN
+                self._a1in_count += 1
+            self._pinned_pages.add(page_id)
 
     def unpin_page(self, page_id: int, dirty=False):
-        # print(f"UNPIN {page_id}")
-        self._mutex.acquire()
-        if page_id not in self._pages:
-            self._mutex.release()
-            raise ValueError(f"Error: Page {page_id} is not found. Failed to unpin.")
-        self._pages[page_id][1] = False
-        self._mutex.release()
+        with self._mutex:
+            queue = self._pages.get(page_id)
+            if queue == None:
+                raise ValueError(f"Error: Page {page_id} is not found. Failed to unpin.")
+            self._pinned_pages.discard(page_id)
+            if queue == TwoQReplacer._A1IN:
+                self._a1in_queue[page_id] = None
+            else:
+                self._am_queue[page_id] = None
 
     def get_victim(self) -> int:
-        self._mutex.acquire()
-        victim = INVALID_PAGE_ID
-        for p in self._fifo_queue:
-            if self._pages[p][1] is False:
-                victim = p
-                self._fifo_queue.pop(p)
-                break
-        if victim < 0:
-            for p in self._lru_queue:
-                if self._pages[p][1] is False:
-                    victim = p
-                    self._lru_queue.pop(p)
-                    break
-        if victim != INVALID_PAGE_ID:
-            self._pages.pop(victim)
-        else:
-            self._mutex.release()
-            raise BufferFullError()
-        self._mutex.release()
-        return victim
+        with self._mutex:
+            if len(self._a1in_queue) > 0 \
+               and (self._a1in_count > self._kin or len(self._am_queue) == 0):
+                victim = self._a1in_queue.popitem(last=False)[0]
+                self._a1in_count -= 1
+                self._a1out_queue[victim] = None
+                if len(self._a1out_queue) > self._kout:
+                    self._a1out_queue.popitem(last=False)
+            elif len(self._am_queue) > 0:
+                victim = self._am_queue.popitem(last=False)[0]
+            else:
+                raise BufferFullError()
+            del self._pages[victim]
+            return victim
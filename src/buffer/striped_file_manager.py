@@ -0,0 +1,180 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from threading import Lock
+import os
+import json
+import zlib
+
+from src.util.constants import PAGE_SIZE
+from src.buffer.file_manager import FileManager
+
+"""Implementation of the FileManager interface that spreads segments over
+several directories, typically the mount points of different devices,
+with one FileManager per directory.
+
+Each segment is placed on a directory derived from its name. With a
+stripe unit, the pages of every segment are striped across all
+directories instead, starting at the segment's directory, so that a run
+of pages is read from several devices in parallel.
+
+The directories, the stripe unit and the placement of the segments are
+kept in a manifest in the first directory. Reopening a store reads the
+layout from it, and opening it with a different layout fails.
+"""
+class StripedFileManager(FileManager):
+    _manifest_name = 'manifest.json'
+
+    """
+    Arguments
+        directories: The directories that segments are placed on
+        stripe_unit: The number of contiguous pages of a segment stored in
+            one directory before moving to the next. 0 places whole segments.
+    """
+    def __init__(self, directories: List[str], page_size = PAGE_SIZE,
+                 extent_size = FileManager._initial_size, stripe_unit: int = 0):
+        if len(directories) == 0:
+            raise ValueError("At least one directory is required.")
+        if stripe_unit < 0:
+            raise ValueError("stripe_unit must not be negative.")
+        self._directories = list(directories)
+        self._page_size = page_size
+        self._stripe_unit = stripe_unit
+        self._file_managers = [FileManager(directory, page_size, extent_size)
+                               for directory in self._directories]
+        self._executor = ThreadPoolExecutor(max_workers=len(self._directories))
+        self._manifest_lock = Lock()
+        # key=file_name; value=index of the directory the segment starts on
+        self._placements: Dict[str, int] = {}
+        self._load_manifest()
+
+    def __del__(self):
+        self._executor.shutdown(wait=False)
+
+    @property
+    def directories(self) -> List[str]:
+        return self._directories
+
+    @property
+    def stripe_unit(self) -> int:
+        return self._stripe_unit
+
+    def _get_manifest_path(self) -> str:
+        return f"{self._directories[0]}/{StripedFileManager._manifest_name}"
+
+    def _load_manifest(self):
+        manifest_path = self._get_manifest_path()
+        if not os.path.exists(manifest_path):
+            self._save_manifest()
+            return
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest['directories'] != self._directories \
+           or manifest['stripe_unit'] != self._stripe_unit:
+            raise ValueError(f"Layout of {manifest_path} does not match directories and stripe_unit.")
+        self._placements = manifest['segments']
+
+    """ Writes the manifest to a temporary file and renames it, so that a
+    crash leaves either the old or the new manifest behind
+    """
+    def _save_manifest(self):
+        manifest_path = self._get_manifest_path()
+        with open(f"{manifest_path}.tmp", 'w') as manifest_file:
+            json.dump({'directories': self._directories,
+                       'stripe_unit': self._stripe_unit,
+                       'segments': self._placements}, manifest_file)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    """ Returns the index of the directory a segment starts on.
+    Segments named by a number are spread round robin, others by hash.
+    """
+    def _get_placement(self, file_name: str) -> int:
+        placement = self._placements.get(file_name)
+        if placement != None:
+            return placement
+        if file_name.isdigit():
+            return int(file_name) % len(self._directories)
+        return zlib.crc32(file_name.encode()) % len(self._directories)
+
+    """ Returns the index of the directory holding a page of a segment and
+    the page's position in the segment's file there
+    """
+    def _locate(self, file_name: str, page_id: int) -> Tuple[int, int]:
+        placement = self._get_placement(file_name)
+        if self._stripe_unit == 0:
+            return placement, page_id
+        directory_count = len(self._directories)
+        stripe = page_id // self._stripe_unit
+        local_page_id = (stripe // directory_count) * self._stripe_unit + page_id % self._stripe_unit
+        return (placement + stripe) % directory_count, local_page_id
+
+    """ Splits the run of pages starting at page_id into runs that are
+    contiguous within one directory.
+    Returns a list of [<directory index>, <first local page_id>, <list of buffers>].
+    """
+    def _split_run(self, file_name: str, page_id: int, buffers: List[bytearray]) -> List[list]:
+        runs = []
+        for i, buffer in enumerate(buffers):
+            directory_index, local_page_id = self._locate(file_name, page_id + i)
+            if len(runs) > 0 and runs[-1][0] == directory_index \
+               and runs[-1][1] + len(runs[-1][2]) == local_page_id:
+                runs[-1][2].append(buffer)
+            else:
+                runs.append([directory_index, local_page_id, [buffer]])
+        return runs
+
+    """ Runs io_function for each run on the file manager of its directory,
+    in parallel if the runs span several directories
+    """
+    def _run_parallel(self, io_function_name: str, file_name: str, runs: List[list]):
+        if len(runs) == 1:
+            directory_index, local_page_id, buffers = runs[0]
+            getattr(self._file_managers[directory_index], io_function_name)(file_name, local_page_id, buffers)
+            return
+        futures = [self._executor.submit(getattr(self._file_managers[directory_index], io_function_name),
+                                         file_name, local_page_id, buffers)
+                   for directory_index, local_page_id, buffers in runs]
+        for future in futures:
+            future.result()
+
+    def create_file(self, file_name: str):
+        with self._manifest_lock:
+            if file_name not in self._placements:
+                self._placements[file_name] = self._get_placement(file_name)
+                self._save_manifest()
+        if self._stripe_unit == 0:
+            self._file_managers[self._get_placement(file_name)].create_file(file_name)
+        else:
+            for file_manager in self._file_managers:
+                file_manager.create_file(file_name)
+
+    def remove_file(self, file_name: str):
+        if self._stripe_unit == 0:
+            self._file_managers[self._get_placement(file_name)].remove_file(file_name)
+        else:
+            for file_manager in self._file_managers:
+                file_manager.remove_file(file_name)
+        with self._manifest_lock:
+            if self._placements.pop(file_name, None) != None:
+                self._save_manifest()
+
+    def read_block(self, file_name: str, page_id: int, dest: bytearray):
+        directory_index, local_page_id = self._locate(file_name, page_id)
+        self._file_managers[directory_index].read_block(file_name, local_page_id, dest)
+
+    def read_blocks(self, file_name: str, page_id: int, dests: List[bytearray]):
+        self._run_parallel('read_blocks', file_name, self._split_run(file_name, page_id, dests))
+
+    def write_block(self, file_name: str, page_id: int, src: bytearray):
+        directory_index, local_page_id = self._locate(file_name, page_id)
+        self._file_managers[directory_index].write_block(file_name, local_page_id, src)
+
+    def write_blocks(self, file_name: str, page_id: int, srcs: List[bytearray]):
+        self._run_parallel('write_blocks', file_name, self._split_run(file_name, page_id, srcs))
+
+    def read_sectors(self, file_name: str, page_id: int, dest: bytearray, ranges: List[Tuple[int, int]]):
+        directory_index, local_page_id = self._locate(file_name, page_id)
+        self._file_managers[directory_index].read_sectors(file_name, local_page_id, dest, ranges)
+
+    def write_sectors(self, file_name: str, page_id: int, src: bytearray, ranges: List[Tuple[int, int]]):
+        directory_index, local_page_id = self._locate(file_name, page_id)
+        self._file_managers[directory_index].write_sectors(file_name, local_page_id, src, ranges)
@@ -0,0 +1,130 @@
+from queue import Queue, Empty
+from threading import Thread, Event
+from typing import Callable, List
+import traceback
+
+from src.buffer.buffer_frame import BufferFrame
+
+"""Background thread pool that writes evicted dirty frames back through
+the FileManager so that the fixing thread does not have to wait for it.
+Writes of the same page always go to the same worker, so they complete in
+the order they were submitted. Adjacent pages go to the same worker as
+well, which writes the frames queued at once as one batch.
+"""
+class WriteBackFlusher():
+    _cleaning_interval = 0.1 # seconds
+    # Number of adjacent pages that are written by the same worker
+    _run_length = 32
+
+    """
+    Arguments
+        write_frame: Writes a frame to storage
+        on_write_complete: Called with the frame once its write has completed
+        clean_frames: Called by the cleaner thread when cleaning was requested.
+            Returns copies of the frames it cleaned, which are then written.
+        thread_count: The number of writer threads
+        queue_size: The maximum number of queued writes, submit blocks
+            once it is reached
+        write_frames: Writes a batch of frames to storage. If given, it
+            is used instead of write_frame for up to max_batch_size frames
+            that are queued at once.
+        max_batch_size: The maximum number of frames written in one batch
+    """
+    def __init__(self,
+                 write_frame: Callable[[BufferFrame], None],
+                 on_write_complete: Callable[[BufferFrame], None],
+                 clean_frames: Callable[[], List[BufferFrame]],
+                 thread_count: int = 2,
+                 queue_size: int = 16,
+                 write_frames: Callable[[List[BufferFrame]], None] = None,
+                 max_batch_size: int = 16):
+        if thread_count < 1:
+            raise ValueError("thread_count must be at least 1.")
+        self._write_frame = write_frame
+        self._write_frames = write_frames
+        self._max_batch_size = max_batch_size
+        self._on_write_complete = on_write_complete
+        self._clean_frames = clean_frames
+        self._thread_count = thread_count
+        self._queues: List[Queue] = [Queue(maxsize=max(queue_size // thread_count, 1))
+                                     for i in range(thread_count)]
+        self._cleaning_requested = Event()
+        self._stopped = Event()
+
+        self._threads = [Thread(target=self._write_loop, args=(i,), daemon=True)
+                         for i in range(thread_count)]
+        self._threads.append(Thread(target=self._clean_loop, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    """ Queues a copy of a dirty frame to be written.
+    Blocks while the queue of the responsible writer is full.
+    """
+    def submit(self, frame: BufferFrame):
+        worker_num = hash(frame.page_id // WriteBackFlusher._run_length) % self._thread_count
+        self._queues[worker_num].put(frame)
+
+    """ Wakes up the cleaner thread
+    """
+    def request_cleaning(self):
+        self._cleaning_requested.set()
+
+    """ Blocks until all queued writes have completed
+    """
+    def drain(self):
+        for queue in self._queues:
+            queue.join()
+
+    """ Completes all queued writes and stops the threads
+    """
+    def shutdown(self):
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._cleaning_requested.set()
+        self._threads[-1].join()
+        for queue in self._queues:
+            queue.put(None)
+        for thread in self._threads[:-1]:
+            thread.join()
+
+    def _write_loop(self, worker_num: int):
+        queue = self._queues[worker_num]
+        stopping = False
+        while not stopping:
+            frames = [queue.get()]
+            # Writes that were queued in the meantime are written as one batch
+            while self._write_frames != None and frames[-1] != None \
+                  and len(frames) < self._max_batch_size:
+                try:
+                    frames.append(queue.get_nowait())
+                except Empty:
+                    break
+            if frames[-1] == None:
+                stopping = True
+                frames.pop()
+            try:
+                if len(frames) == 1 or self._write_frames == None:
+                    for frame in frames:
+                        self._write_frame(frame)
+                elif len(frames) > 0:
+                    self._write_frames(frames)
+            except Exception:
+                # Keep the worker alive so that later writes still complete
+                traceback.print_exc()
+            finally:
+                for frame in frames:
+                    self._on_write_complete(frame)
+                    queue.task_done()
+                if stopping:
+                    queue.task_done()
+
+    def _clean_loop(self):
+        while not self._stopped.is_set():
+            self._cleaning_requested.wait(WriteBackFlusher._cleaning_interval)
+            if self._stopped.is_set():
+                return
+            if self._cleaning_requested.is_set():
+                self._cleaning_requested.clear()
+                for frame in self._clean_frames():
+                    self.submit(frame)
@@ -16,6 +16,12 @@ class ReaderWriterLock():
     def lock_shared(self) -> bool:
         return self._lock.r_acquire()
     
+    def try_lock_exclusive(self) -> bool:
+        return self._lock.w_try_acquire()
+    
+    def try_lock_shared(self) -> bool:
+        return self._lock.r_try_acquire()
+    
     def release_exclusive(self):
         self._lock.w_release()
     
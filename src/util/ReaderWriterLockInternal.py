@@ -51,6 +51,19 @@ class RWLock(object):
             self.w_lock.acquire()
         self.num_r_lock.release()
 
+    def r_try_acquire(self):
+        """ Acquires the lock for reading without blocking.
+            Returns False if that is not possible right now. """
+        if not self.num_r_lock.acquire(blocking=False):
+            return False
+        try:
+            if self.num_r == 0 and not self.w_lock.acquire(blocking=False):
+                return False
+            self.num_r += 1
+            return True
+        finally:
+            self.num_r_lock.release()
+
     def r_release(self):
         assert self.num_r > 0
         self.num_r_lock.acquire()
@@ -77,6 +90,11 @@ class RWLock(object):
     def w_acquire(self):
         self.w_lock.acquire()
 
+    def w_try_acquire(self):
+        """ Acquires the lock for writing without blocking.
+            Returns False if that is not possible right now. """
+        return self.w_lock.acquire(blocking=False)
+
     def w_release(self):
         self.w_lock.release()
     
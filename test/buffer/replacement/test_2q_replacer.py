@@ -5,90 +5,93 @@ from src.buffer.replacement.two_q_replacer import TwoQReplacer
 
 class Test2QReplacer(unittest.TestCase):
     def setUp(self):
-        self.twoq_replacer = TwoQReplacer(3)
+        self.twoq_replacer = TwoQReplacer(4, kin=2, kout=2)
+
+    def access(self, page_id: int):
+        self.twoq_replacer.pin_page(page_id)
+        self.twoq_replacer.unpin_page(page_id)
 
     def test_fifo(self):
-        self.twoq_replacer.pin_page(1)
-        self.twoq_replacer.unpin_page(1)
-        self.assertEqual([1], self.twoq_replacer.fifo_q)
-        self.assertEqual([], self.twoq_replacer.lru_q)
-        self.twoq_replacer.pin_page(2)
+        self.access(1)
+        self.assertEqual([1], self.twoq_replacer.a1in_queue)
+        self.assertEqual([], self.twoq_replacer.am_queue)
+        self.access(2)
         self.twoq_replacer.pin_page(3)
-        self.assertEqual([1, 2, 3], self.twoq_replacer.fifo_q)
-        self.assertEqual([], self.twoq_replacer.lru_q)
+        # Only unpinned pages are queued
+        self.assertEqual([1, 2], self.twoq_replacer.a1in_queue)
+        self.twoq_replacer.unpin_page(3)
+        self.assertEqual([1, 2, 3], self.twoq_replacer.a1in_queue)
         victim = self.twoq_replacer.get_victim()
         self.assertEqual(1, victim)
-        self.twoq_replacer.pin_page(4)
-        self.assertEqual([2, 3, 4], self.twoq_replacer.fifo_q)
-        self.assertEqual([], self.twoq_replacer.lru_q)
+        self.assertEqual([2, 3], self.twoq_replacer.a1in_queue)
+        self.assertEqual([1], self.twoq_replacer.a1out_queue)
 
-    def test_move_to_lru(self):
-        self.twoq_replacer.pin_page(1)
-        self.twoq_replacer.pin_page(2)
-        self.twoq_replacer.unpin_page(1)
-        self.twoq_replacer.pin_page(2)
-        self.assertEqual([1], self.twoq_replacer.fifo_q)
-        self.assertEqual([2], self.twoq_replacer.lru_q)
-        self.twoq_replacer.pin_page(1)
-        self.assertEqual([], self.twoq_replacer.fifo_q)
-        self.assertEqual([2,1], self.twoq_replacer.lru_q)
+    def test_correlated_reference_stays_in_a1in(self):
+        self.access(1)
+        self.access(2)
+        self.access(1)
+        self.assertEqual([2, 1], self.twoq_replacer.a1in_queue)
+        self.assertEqual([], self.twoq_replacer.am_queue)
+
+    def test_move_to_am_from_a1out(self):
+        for page_id in range(1, 4):
+            self.access(page_id)
+        self.assertEqual(1, self.twoq_replacer.get_victim())
+        self.access(1)
+        self.assertEqual([2, 3], self.twoq_replacer.a1in_queue)
+        self.assertEqual([1], self.twoq_replacer.am_queue)
+        self.assertEqual([], self.twoq_replacer.a1out_queue)
+
+    def test_am_is_lru(self):
+        for page_id in range(1, 4):
+            self.access(page_id)
+        self.assertEqual(1, self.twoq_replacer.get_victim())
+        self.assertEqual(2, self.twoq_replacer.get_victim())
+        self.access(1)
+        self.access(2)
+        self.access(1)
+        self.assertEqual([2, 1], self.twoq_replacer.am_queue)
+
+    def test_a1out_is_bounded(self):
+        for page_id in range(1, 6):
+            self.access(page_id)
+        for page_id in range(1, 4):
+            self.assertEqual(page_id, self.twoq_replacer.get_victim())
+        self.assertEqual([2, 3], self.twoq_replacer.a1out_queue)
 
-    def test_lru(self):
-        self.twoq_replacer.pin_page(1)
-        self.twoq_replacer.pin_page(2)
-        self.twoq_replacer.pin_page(3)
-        self.twoq_replacer.pin_page(3)
-        self.assertEqual([1,2], self.twoq_replacer.fifo_q)
-        self.assertEqual([3], self.twoq_replacer.lru_q)
-        self.twoq_replacer.pin_page(2)
-        self.assertEqual([1], self.twoq_replacer.fifo_q)
-        self.assertEqual([3, 2], self.twoq_replacer.lru_q)
-        self.twoq_replacer.pin_page(3)
-        self.assertEqual([1], self.twoq_replacer.fifo_q)
-        self.assertEqual([2, 3], self.twoq_replacer.lru_q)
-    
     def test_find_victim_when_buffer_full(self):
         self.twoq_replacer.pin_page(1)
         self.twoq_replacer.pin_page(2)
         self.twoq_replacer.pin_page(3)
-        self.twoq_replacer.pin_page(3)
         self.assertRaises(BufferFullError, self.twoq_replacer.get_victim)
-        self.twoq_replacer.pin_page(2)
-        self.twoq_replacer.pin_page(3)
         self.assertRaises(BufferFullError, self.twoq_replacer.get_victim)
-
-    def test_find_victim_in_fifo(self):
-        self.twoq_replacer.pin_page(1)
-        self.twoq_replacer.pin_page(2)
-        self.twoq_replacer.pin_page(2)
         self.twoq_replacer.unpin_page(2)
-        self.twoq_replacer.unpin_page(1)
-        self.twoq_replacer.pin_page(3)
-        self.twoq_replacer.unpin_page(3)
-        self.twoq_replacer.pin_page(4)
-        self.twoq_replacer.unpin_page(4)
-        self.assertEqual([1, 3, 4], self.twoq_replacer.fifo_q)
-        self.assertEqual([2], self.twoq_replacer.lru_q)
-        victim = self.twoq_replacer.get_victim()
-        self.assertEqual(1, victim)
-        self.assertEqual([3, 4], self.twoq_replacer.fifo_q)
-        self.assertEqual([2], self.twoq_replacer.lru_q)
-        victim = self.twoq_replacer.get_victim()
-        self.assertEqual(3, victim)
-        self.assertEqual([4], self.twoq_replacer.fifo_q)
-        self.assertEqual([2], self.twoq_replacer.lru_q)
+        self.assertEqual(2, self.twoq_replacer.get_victim())
 
+    def test_find_victim_in_am_while_a1in_small(self):
+        for page_id in range(1, 4):
+            self.access(page_id)
+        self.assertEqual(1, self.twoq_replacer.get_victim())
+        self.access(1)
+        # A1in holds kin pages, so Am is evicted from
+        self.assertEqual(1, self.twoq_replacer.get_victim())
+        self.assertEqual([2, 3], self.twoq_replacer.a1in_queue)
+        # Without unpinned pages in Am, A1in is evicted from anyway
+        self.assertEqual(2, self.twoq_replacer.get_victim())
 
-    def test_find_victim_in_lru(self):
-        self.twoq_replacer.pin_page(1)
-        self.twoq_replacer.pin_page(2)
+    def test_find_victim_in_am_while_a1in_pinned(self):
+        for page_id in range(1, 4):
+            self.access(page_id)
+        self.assertEqual(1, self.twoq_replacer.get_victim())
+        self.access(1)
+        self.twoq_replacer.pin_page(4)
         self.twoq_replacer.pin_page(2)
-        self.twoq_replacer.unpin_page(2)
-        self.assertEqual([2], self.twoq_replacer.lru_q)
-        victim = self.twoq_replacer.get_victim()
-        self.assertEqual(2, victim)
-        self.assertEqual([1], self.twoq_replacer.fifo_q)
-        self.assertEqual([], self.twoq_replacer.lru_q)
+        self.twoq_replacer.pin_page(3)
+        self.assertEqual(1, self.twoq_replacer.get_victim())
+        self.assertRaises(BufferFullError, self.twoq_replacer.get_victim)
+
+    def test_unpin_unknown_page_should_throw(self):
+        self.assertRaises(ValueError, self.twoq_replacer.unpin_page, 1)
 
 if __name__ == '__main__':
     unittest.main()
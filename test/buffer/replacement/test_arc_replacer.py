@@ -0,0 +1,69 @@
+import unittest
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.arc_replacer import ARCReplacer
+
+
+class ARCReplacerTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def access(self, replacer: ARCReplacer, page_id: int):
+        replacer.pin_page(page_id)
+        replacer.unpin_page(page_id)
+
+    def test_should_move_page_seen_twice_to_t2(self):
+        replacer = ARCReplacer(4)
+        for page_id in range(0, 3):
+            self.access(replacer, page_id)
+        self.access(replacer, 1)
+        self.assertEqual(replacer.t1_queue, [0, 2])
+        self.assertEqual(replacer.t2_queue, [1])
+        # T1 holds more pages than its target of 0
+        self.assertEqual(replacer.get_victim(), 0)
+        self.assertEqual(replacer.b1_queue, [0])
+
+    def test_should_adapt_target_on_ghost_hits(self):
+        replacer = ARCReplacer(4)
+        for page_id in range(0, 4):
+            self.access(replacer, page_id)
+        self.assertEqual(replacer.get_victim(), 0)
+        self.access(replacer, 0)
+        # A miss on a page evicted from T1 grows the target of T1
+        self.assertEqual(replacer.target_t1_size, 1)
+        self.assertEqual(replacer.t2_queue, [0])
+        self.assertEqual(replacer.get_victim(), 1)
+        self.assertEqual(replacer.get_victim(), 2)
+        self.access(replacer, 4)
+        self.access(replacer, 4)
+        # T1 is at its target now, so T2 is evicted from
+        self.assertEqual(replacer.t1_queue, [3])
+        self.assertEqual(replacer.get_victim(), 0)
+        self.assertEqual(replacer.b2_queue, [0])
+        self.access(replacer, 0)
+        self.assertEqual(replacer.target_t1_size, 0)
+
+    def test_should_bound_history(self):
+        replacer = ARCReplacer(2)
+        for page_id in range(0, 10):
+            if page_id >= 2:
+                replacer.get_victim()
+            self.access(replacer, page_id)
+        self.assertEqual(replacer.t1_queue, [8, 9])
+        self.assertEqual(replacer.b1_queue, [])
+
+    def test_should_skip_pinned_pages(self):
+        replacer = ARCReplacer(4)
+        for page_id in range(0, 3):
+            replacer.pin_page(page_id)
+        self.assertRaises(BufferFullError, replacer.get_victim)
+        self.assertRaises(BufferFullError, replacer.get_victim)
+        replacer.unpin_page(1)
+        self.assertEqual(replacer.get_victim(), 1)
+        replacer.pin_page(2)
+        replacer.unpin_page(2)
+        # T1 only has pinned pages, so T2 is evicted from
+        self.assertEqual(replacer.get_victim(), 2)
+
+    def test_unpin_unknown_page_should_throw(self):
+        replacer = ARCReplacer(4)
+        self.assertRaises(ValueError, replacer.unpin_page, 1)
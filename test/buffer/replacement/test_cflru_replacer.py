@@ -0,0 +1,69 @@
+import unittest
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.cflru_replacer import CFLRUReplacer
+
+
+class TestCFLRUReplacer(unittest.TestCase):
+    def setUp(self):
+        self.cflru_replacer = CFLRUReplacer(6, window_size=2)
+
+    def access(self, page_id: int, dirty: bool = False):
+        self.cflru_replacer.pin_page(page_id)
+        self.cflru_replacer.unpin_page(page_id, dirty)
+
+    def test_lru_order(self):
+        for page_id in range(1, 5):
+            self.access(page_id)
+        self.assertEqual([1, 2], self.cflru_replacer.window_queue)
+        self.assertEqual([3, 4], self.cflru_replacer.working_queue)
+        self.access(1)
+        self.assertEqual([2, 3], self.cflru_replacer.window_queue)
+        self.assertEqual([4, 1], self.cflru_replacer.working_queue)
+        # Only unpinned pages are queued
+        self.cflru_replacer.pin_page(2)
+        self.assertEqual([3, 4], self.cflru_replacer.window_queue)
+        self.assertEqual([1], self.cflru_replacer.working_queue)
+
+    def test_evict_clean_page_in_window_first(self):
+        self.access(1, dirty=True)
+        self.access(2)
+        self.access(3)
+        self.assertEqual(2, self.cflru_replacer.get_victim())
+        self.assertEqual([1, 3], self.cflru_replacer.window_queue)
+        self.assertEqual(3, self.cflru_replacer.get_victim())
+        self.assertEqual(1, self.cflru_replacer.get_victim())
+
+    def test_evict_lru_page_without_clean_page_in_window(self):
+        self.access(1, dirty=True)
+        self.access(2, dirty=True)
+        self.access(3)
+        # Page 3 is outside the clean-first region
+        self.assertEqual(1, self.cflru_replacer.get_victim())
+        self.assertEqual(3, self.cflru_replacer.get_victim())
+        self.assertEqual(2, self.cflru_replacer.get_victim())
+
+    def test_page_stays_dirty_until_evicted(self):
+        self.access(1, dirty=True)
+        self.access(1)
+        self.access(2)
+        self.assertEqual(2, self.cflru_replacer.get_victim())
+        self.access(3)
+        self.assertEqual(3, self.cflru_replacer.get_victim())
+        self.assertEqual(1, self.cflru_replacer.get_victim())
+        self.access(1)
+        self.access(4, dirty=True)
+        self.assertEqual(1, self.cflru_replacer.get_victim())
+
+    def test_find_victim_when_buffer_full(self):
+        self.cflru_replacer.pin_page(1)
+        self.cflru_replacer.pin_page(2)
+        self.assertRaises(BufferFullError, self.cflru_replacer.get_victim)
+        self.cflru_replacer.unpin_page(2, True)
+        self.assertEqual(2, self.cflru_replacer.get_victim())
+        self.assertRaises(BufferFullError, self.cflru_replacer.get_victim)
+
+    def test_unpin_unknown_page_should_throw(self):
+        self.assertRaises(ValueError, self.cflru_replacer.unpin_page, 1)
+
+if __name__ == '__main__':
+    unittest.main()
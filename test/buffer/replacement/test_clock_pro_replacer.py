@@ -0,0 +1,63 @@
+import unittest
+
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.clock_pro_replacer import ClockProReplacer
+
+class ClockProReplacerTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def access(self, replacer: ClockProReplacer, page_id: int):
+        replacer.pin_page(page_id)
+        replacer.unpin_page(page_id)
+
+    def test_should_evict_cold_pages_first(self):
+        replacer = ClockProReplacer(4)
+        for i in range(0, 4):
+            self.access(replacer, i)
+        # Page 1 is accessed again during its test period and becomes hot
+        # once the cold hand passes it
+        self.access(replacer, 1)
+        self.assertEqual(replacer.get_victim(), 0)
+        self.assertEqual(replacer.get_victim(), 2)
+        self.assertEqual(replacer.hot_count, 1)
+        self.assertEqual(replacer.get_victim(), 3)
+        # Evicted pages in their test period stay on the clock
+        self.assertEqual(replacer.non_resident_count, 3)
+
+    def test_should_promote_page_returning_in_test_period(self):
+        replacer = ClockProReplacer(4)
+        for i in range(0, 4):
+            self.access(replacer, i)
+        self.assertEqual(replacer.get_victim(), 0)
+        cold_target = replacer.cold_target
+        self.access(replacer, 0)
+        self.assertEqual(replacer.hot_count, 1)
+        self.assertEqual(replacer.non_resident_count, 0)
+        self.assertEqual(replacer.cold_target, cold_target + 1)
+
+    def test_should_resist_scans(self):
+        frame_count = 10
+        replacer = ClockProReplacer(frame_count)
+        for repetition in range(0, 2):
+            for i in range(0, 4):
+                self.access(replacer, i)
+        victims = []
+        for i in range(0, 100):
+            if 4 + i >= frame_count:
+                victims.append(replacer.get_victim())
+            self.access(replacer, 1000 + i)
+        # The pages accessed twice survive a scan over many more pages than frames
+        self.assertEqual(replacer.hot_count, 4)
+        for i in range(0, 4):
+            self.assertNotIn(i, victims)
+
+    def test_should_skip_pinned_pages(self):
+        replacer = ClockProReplacer(4)
+        for i in range(0, 4):
+            replacer.pin_page(i)
+        replacer.unpin_page(2)
+        self.assertEqual(replacer.get_victim(), 2)
+        self.assertRaises(BufferFullError, replacer.get_victim)
+        replacer.unpin_page(3)
+        self.assertEqual(replacer.get_victim(), 3)
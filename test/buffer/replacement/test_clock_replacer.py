@@ -0,0 +1,50 @@
+import unittest
+
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.clock_replacer import ClockReplacer
+
+class ClockReplacerTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_should_return_pages_in_clock_order(self):
+        replacer = ClockReplacer(4)
+        for i in range(0, 4):
+            replacer.pin_page(i)
+            replacer.unpin_page(i)
+        # All pages are referenced, the hand clears them and comes back to page 0
+        self.assertEqual(replacer.get_victim(), 0)
+        replacer.pin_page(4)
+        replacer.unpin_page(4)
+        self.assertEqual(replacer.get_victim(), 1)
+
+    def test_should_give_referenced_page_second_chance(self):
+        replacer = ClockReplacer(4)
+        for i in range(0, 4):
+            replacer.pin_page(i)
+            replacer.unpin_page(i)
+        self.assertEqual(replacer.get_victim(), 0)
+        replacer.pin_page(1)
+        replacer.unpin_page(1)
+        self.assertEqual(replacer.get_victim(), 2)
+        self.assertEqual(replacer.get_victim(), 3)
+        self.assertEqual(replacer.get_victim(), 1)
+
+    def test_should_skip_pinned_pages(self):
+        replacer = ClockReplacer(4)
+        for i in range(0, 4):
+            replacer.pin_page(i)
+        replacer.unpin_page(2)
+        self.assertEqual(replacer.get_victim(), 2)
+        self.assertRaises(BufferFullError, replacer.get_victim)
+        replacer.unpin_page(3)
+        self.assertEqual(replacer.get_victim(), 3)
+
+    def test_should_grow_past_frame_count(self):
+        replacer = ClockReplacer(2)
+        for i in range(0, 3):
+            replacer.pin_page(i)
+        for i in range(0, 3):
+            replacer.unpin_page(i)
+        self.assertEqual(sorted(replacer.get_victim() for i in range(0, 3)), [0, 1, 2])
+        self.assertRaises(BufferFullError, replacer.get_victim)
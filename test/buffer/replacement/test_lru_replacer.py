@@ -57,4 +57,27 @@ class LruReplacerTest(unittest.TestCase):
 
         self.assertEqual(replacer.get_victim(), 2)
         self.assertEqual(replacer.get_victim(), 8)
-        self.assertRaises(BufferFullError, replacer.get_victim)
\ No newline at end of file
+        self.assertRaises(BufferFullError, replacer.get_victim)
+    def test_should_scan_pinned_page_once(self):
+        replacer = LRUReplacer(10)
+        for i in range(0, 9):
+            replacer.pin_page(i)
+        for i in range(5, 9):
+            replacer.unpin_page(i)
+        for i in range(5, 9):
+            self.assertEqual(replacer.get_victim(), i)
+        # Pages 0 to 4 are looked at by the first eviction only
+        self.assertEqual(replacer.scanned_entries, 9)
+        self.assertRaises(BufferFullError, replacer.get_victim)
+        self.assertRaises(BufferFullError, replacer.get_victim)
+
+        for i in range(9, 12):
+            replacer.pin_page(i)
+            replacer.unpin_page(i)
+        # Pages pinned before the scan are still evicted first
+        replacer.unpin_page(3)
+        replacer.unpin_page(1)
+        self.assertEqual(replacer.get_victim(), 3)
+        self.assertEqual(replacer.get_victim(), 1)
+        self.assertEqual(replacer.get_victim(), 9)
+        self.assertEqual(replacer.scanned_entries, 12)
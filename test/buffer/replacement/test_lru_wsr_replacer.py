@@ -0,0 +1,59 @@
+import unittest
+from src.buffer.error import BufferFullError
+from src.buffer.replacement.lru_wsr_replacer import LRUWSRReplacer
+
+
+class TestLRUWSRReplacer(unittest.TestCase):
+    def setUp(self):
+        self.lru_wsr_replacer = LRUWSRReplacer(4)
+
+    def access(self, page_id: int, dirty: bool = False):
+        self.lru_wsr_replacer.pin_page(page_id)
+        self.lru_wsr_replacer.unpin_page(page_id, dirty)
+
+    def test_lru_order(self):
+        for page_id in range(1, 4):
+            self.access(page_id)
+        self.access(1)
+        self.assertEqual([2, 3, 1], self.lru_wsr_replacer.lru_queue)
+        # Only unpinned pages are queued
+        self.lru_wsr_replacer.pin_page(3)
+        self.assertEqual([2, 1], self.lru_wsr_replacer.lru_queue)
+        self.assertEqual(2, self.lru_wsr_replacer.get_victim())
+
+    def test_dirty_page_gets_second_chance(self):
+        self.access(1, dirty=True)
+        self.access(2)
+        self.access(3, dirty=True)
+        self.assertEqual(2, self.lru_wsr_replacer.get_victim())
+        self.assertEqual([3, 1], self.lru_wsr_replacer.lru_queue)
+        self.assertEqual([1], self.lru_wsr_replacer.cold_pages)
+        # Page 3 is marked cold as well and page 1 is evicted on its second turn
+        self.assertEqual(1, self.lru_wsr_replacer.get_victim())
+        self.assertEqual(3, self.lru_wsr_replacer.get_victim())
+
+    def test_access_clears_cold_mark(self):
+        self.access(1, dirty=True)
+        self.access(2, dirty=True)
+        self.access(3)
+        self.assertEqual(3, self.lru_wsr_replacer.get_victim())
+        self.access(1)
+        self.access(4)
+        # Page 1 is still dirty but has been accessed since it was marked cold
+        self.assertEqual(2, self.lru_wsr_replacer.get_victim())
+        self.assertEqual(4, self.lru_wsr_replacer.get_victim())
+        self.assertEqual(1, self.lru_wsr_replacer.get_victim())
+
+    def test_find_victim_when_buffer_full(self):
+        self.lru_wsr_replacer.pin_page(1)
+        self.lru_wsr_replacer.pin_page(2)
+        self.assertRaises(BufferFullError, self.lru_wsr_replacer.get_victim)
+        self.lru_wsr_replacer.unpin_page(2, True)
+        self.assertEqual(2, self.lru_wsr_replacer.get_victim())
+        self.assertRaises(BufferFullError, self.lru_wsr_replacer.get_victim)
+
+    def test_unpin_unknown_page_should_throw(self):
+        self.assertRaises(ValueError, self.lru_wsr_replacer.unpin_page, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import threading
+import mmap
+from src.util.constants import PAGE_SIZE
+
+from src.buffer.async_file_manager import AsyncFileManager, IOPriority
+from src.buffer.file_manager import FileManager
+
+class BlockingFileManager(FileManager):
+    def __init__(self):
+        super().__init__()
+        self.resume = threading.Event()
+        self.started = threading.Event()
+        self.order = []
+
+    def read_block(self, file_name: str, page_id: int, dest: bytearray):
+        self.started.set()
+        self.resume.wait(5)
+        self.order.append(page_id)
+        super().read_block(file_name, page_id, dest)
+
+    def write_block(self, file_name: str, page_id: int, src: bytearray):
+        self.started.set()
+        self.resume.wait(5)
+        self.order.append(page_id)
+        super().write_block(file_name, page_id, src)
+
+class AsyncFileManagerTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_write_read_block(self):
+        file_manager = FileManager()
+        file_manager.create_file('0')
+        async_file_manager = AsyncFileManager(file_manager, thread_count=2)
+
+        with mmap.mmap(-1, PAGE_SIZE) as src, mmap.mmap(-1, PAGE_SIZE) as dest:
+            src.write(b'\x2a' * PAGE_SIZE)
+            async_file_manager.write_block('0', 4, src).result(5)
+            async_file_manager.read_block('0', 4, dest).result(5)
+            self.assertEqual(dest[:], b'\x2a' * PAGE_SIZE)
+        async_file_manager.shutdown()
+        file_manager.remove_file('0')
+
+    def test_should_serve_demand_reads_before_write_backs(self):
+        file_manager = BlockingFileManager()
+        file_manager.create_file('0')
+        async_file_manager = AsyncFileManager(file_manager, thread_count=1)
+
+        futures = [async_file_manager.write_block('0', 0, bytearray(PAGE_SIZE))]
+        # The worker is busy with the first write while the others queue up
+        self.assertTrue(file_manager.started.wait(5))
+        futures += [async_file_manager.write_block('0', page_id, bytearray(PAGE_SIZE))
+                    for page_id in [1, 2]]
+        futures.append(async_file_manager.read_block('0', 3, bytearray(PAGE_SIZE),
+                                                     priority=IOPriority.PREFETCH))
+        futures.append(async_file_manager.read_block('0', 4, bytearray(PAGE_SIZE)))
+        file_manager.resume.set()
+        for future in futures:
+            future.result(5)
+
+        self.assertEqual(file_manager.order, [0, 4, 3, 1, 2])
+        async_file_manager.shutdown()
+        file_manager.remove_file('0')
+
+    def test_should_limit_queue_depth_per_priority(self):
+        file_manager = BlockingFileManager()
+        file_manager.create_file('0')
+        async_file_manager = AsyncFileManager(file_manager, thread_count=1, queue_depth=2)
+
+        async_file_manager.write_block('0', 0, bytearray(PAGE_SIZE))
+        async_file_manager.write_block('0', 1, bytearray(PAGE_SIZE))
+        submitted = threading.Event()
+        def submit_write():
+            async_file_manager.write_block('0', 2, bytearray(PAGE_SIZE))
+            submitted.set()
+        thread = threading.Thread(target=submit_write)
+        thread.start()
+        self.assertFalse(submitted.wait(0.1))
+        # Other classes are not blocked by the full write-back class
+        read = async_file_manager.read_block('0', 3, bytearray(PAGE_SIZE))
+        file_manager.resume.set()
+        read.result(5)
+        self.assertTrue(submitted.wait(5))
+        thread.join()
+        async_file_manager.shutdown()
+        file_manager.remove_file('0')
+
+    def test_should_return_errors_through_future(self):
+        file_manager = FileManager()
+        file_manager.create_file('0')
+        async_file_manager = AsyncFileManager(file_manager, thread_count=1)
+
+        # Reading into a missing buffer fails on the I/O thread
+        future = async_file_manager.read_block('0', 0, None)
+        self.assertIsNotNone(future.exception(5))
+        async_file_manager.shutdown()
+        self.assertRaises(RuntimeError, async_file_manager.read_block, '0', 0, bytearray(PAGE_SIZE))
+        file_manager.remove_file('0')
@@ -0,0 +1,32 @@
+import unittest
+
+from src.buffer.buffer_access_strategy import BufferAccessStrategy
+from src.util.constants import INVALID_FRAME_ID
+
+class BufferAccessStrategyTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_should_recycle_frames_round_robin(self):
+        strategy = BufferAccessStrategy(ring_size=3)
+        for frame_id in [4, 7, 1]:
+            self.assertEqual(strategy.get_next_frame(), INVALID_FRAME_ID)
+            strategy.add_frame(frame_id)
+        self.assertEqual(strategy.frame_ids, [4, 7, 1])
+
+        for frame_id in [4, 7, 1, 4]:
+            self.assertEqual(strategy.get_next_frame(), frame_id)
+            strategy.add_frame(frame_id)
+
+    def test_should_replace_next_frame(self):
+        strategy = BufferAccessStrategy(ring_size=2)
+        strategy.add_frame(0)
+        strategy.add_frame(1)
+        self.assertEqual(strategy.get_next_frame(), 0)
+        strategy.add_frame(5)
+        self.assertEqual(strategy.frame_ids, [5, 1])
+        self.assertEqual(strategy.get_next_frame(), 1)
+
+        strategy.clear()
+        self.assertEqual(strategy.frame_ids, [])
+        self.assertEqual(strategy.get_next_frame(), INVALID_FRAME_ID)
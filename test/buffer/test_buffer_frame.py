@@ -1,6 +1,7 @@
 import unittest
 
 from src.buffer.buffer_frame import BufferFrame
+from src.buffer.frame_arena import FrameArena
 
 class BufferFrameTest(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -20,3 +21,93 @@ class BufferFrameTest(unittest.TestCase):
         self.assertEqual(new_frame_bytes[0:len(content)].decode('utf-8'), string)
         frame_bytes = frame.data
         self.assertEqual(frame_bytes[0:len(content)].decode('utf-8'), "\0" * len(content))
+
+    def test_should_move_clean_arena_frame_without_copy(self):
+        arena = FrameArena(2, 4096, spare_count=1)
+        frame = BufferFrame(1, 4096, arena=arena)
+        frame.data[0] = 42
+
+        new_frame = frame.move()
+        self.assertEqual(frame.slot, 1)
+        self.assertEqual(new_frame.slot, 1)
+        self.assertEqual(frame.data[0], 42)
+        self.assertEqual(arena.spare_count, 1)
+
+    def test_should_move_dirty_arena_frame_to_spare_slot(self):
+        arena = FrameArena(2, 4096, spare_count=1)
+        frame = BufferFrame(1, 4096, arena=arena)
+        frame.data[0] = 42
+        frame.dirty = True
+
+        new_frame = frame.move()
+        self.assertEqual(new_frame.slot, 1)
+        self.assertEqual(new_frame.data[0], 42)
+        self.assertEqual(frame.slot, 2)
+        self.assertEqual(arena.spare_count, 0)
+
+        new_frame.release()
+        self.assertEqual(arena.spare_count, 1)
+        self.assertEqual(arena.acquire_spare(), 1)
+
+    def test_should_snapshot_arena_frame(self):
+        arena = FrameArena(2, 4096, spare_count=1)
+        frame = BufferFrame(0, 4096, arena=arena)
+        frame.data[0] = 42
+
+        copy = frame.snapshot()
+        frame.data[0] = 43
+        self.assertEqual(copy.data[0], 42)
+        self.assertEqual(copy.slot, 2)
+        copy.release()
+        self.assertEqual(arena.spare_count, 1)
+
+    def test_should_track_dirty_sectors(self):
+        frame = BufferFrame(0, 4 * 4096, sector_size=4096)
+        self.assertEqual(frame.get_dirty_ranges(), [])
+        frame.mark_dirty(100, 10)
+        frame.mark_dirty(3 * 4096 - 1, 2)
+        self.assertTrue(frame.dirty)
+        self.assertEqual(frame.bytes_dirtied, 12)
+        self.assertEqual(frame.get_dirty_ranges(), [(0, 4096), (2 * 4096, 2 * 4096)])
+        self.assertRaises(ValueError, frame.mark_dirty, 4 * 4096 - 1, 2)
+
+        # Copies keep the dirty sectors of the frame
+        new_frame = frame.move()
+        self.assertEqual(new_frame.get_dirty_ranges(), [(0, 4096), (2 * 4096, 2 * 4096)])
+        frame.dirty = False
+        self.assertEqual(frame.bytes_dirtied, 0)
+        frame.mark_dirty(4096, 1)
+        self.assertEqual(frame.get_dirty_ranges(), [(4096, 4096)])
+
+    def test_should_mark_changed_sectors(self):
+        frame = BufferFrame(0, 4 * 4096, sector_size=4096)
+        frame.save_shadow()
+        self.assertFalse(frame.mark_changed_sectors())
+        frame.save_shadow()
+        frame.data[2 * 4096 + 5] = 1
+        self.assertTrue(frame.mark_changed_sectors())
+        self.assertEqual(frame.get_dirty_ranges(), [(2 * 4096, 4096)])
+
+    def test_should_fault_in_missing_sectors(self):
+        faults = []
+        def fault_in(frame, ranges):
+            faults.append(ranges)
+            for offset, length in ranges:
+                frame.data[offset:offset + length] = b'\x01' * length
+            frame.mark_valid(ranges)
+        frame = BufferFrame(0, 4 * 4096, sector_size=4096, fault_in=fault_in)
+        self.assertEqual(frame.get_sector_ranges(100, 4096), [(0, 2 * 4096)])
+        frame.set_valid_ranges([(4096, 4096)])
+        self.assertEqual(frame.get_valid_ranges(), [(4096, 4096)])
+        self.assertEqual(frame.get_missing_ranges(0, 4 * 4096), [(0, 4096), (2 * 4096, 2 * 4096)])
+
+        self.assertEqual(bytes(frame.read(4096, 10)), bytes(10))
+        self.assertEqual(faults, [])
+        self.assertEqual(bytes(frame.read(2 * 4096 - 1, 2)), b'\x00\x01')
+        self.assertEqual(faults, [[(2 * 4096, 4096)]])
+        frame.write(3 * 4096 + 5, b'\x02')
+        self.assertEqual(faults, [[(2 * 4096, 4096)], [(3 * 4096, 4096)]])
+        self.assertEqual(frame.get_dirty_ranges(), [(3 * 4096, 4096)])
+        self.assertRaises(ValueError, frame.read, 4 * 4096 - 1, 2)
+        frame.ensure_valid(0, 4 * 4096)
+        self.assertEqual(frame.get_valid_ranges(), [(0, 4 * 4096)])
@@ -2,12 +2,16 @@ import unittest
 import struct
 import os
 import glob
+import threading
+import asyncio
 
 from src.buffer.metric_collector import Metric, MetricCollector
 from src.buffer.file_manager import FileManager
 from src.buffer.buffer_manager import BufferManager
+from src.buffer.buffer_access_strategy import BufferAccessStrategy
 from src.buffer.replacement.random_replacer import RandomReplacer
 from src.buffer.replacement.two_q_replacer import TwoQReplacer
+from src.buffer.replacement.lru_replacer import LRUReplacer
 from src.util.page_id_utils import make_page_id
 from src.buffer.error import BufferFullError
 
@@ -175,4 +179,537 @@ class BufferManagerTest(unittest.TestCase):
         self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES), 20)
         self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS), 10)
         self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_CLEAN_EVICTIONS), 6)
-        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS), 4)
\ No newline at end of file
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS), 4)
+
+    def test_should_wait_for_pending_write(self):
+        frame_count = 10
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       RandomReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector)
+
+        buffer_manager._add_pending_write(0)
+        fixed = threading.Event()
+        def fix_pending_page():
+            frame = buffer_manager.fix_page(0, False)
+            fixed.set()
+            buffer_manager.unfix_page(frame, False)
+        waiter = threading.Thread(target=fix_pending_page)
+        waiter.start()
+
+        # Other pages can be fixed while the waiter is blocked
+        frame = buffer_manager.fix_page(1, True)
+        buffer_manager.unfix_page(frame, False)
+        self.assertFalse(fixed.wait(0.05))
+
+        buffer_manager._remove_pending_write(0)
+        waiter.join(5)
+        self.assertTrue(fixed.is_set())
+        self.assertEqual(len(metric_collector.get_samples(Metric.BUFFER_MANAGER_PENDING_WRITE_WAIT)), 1)
+        self.assertEqual(len(metric_collector.get_samples(Metric.BUFFER_MANAGER_FIX_LATENCY)), 2)
+
+    def test_should_wait_for_spare_without_frames_lock(self):
+        frame_count = 2
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       spare_frame_count=1)
+        for page_id in range(0, frame_count):
+            frame = buffer_manager.fix_page(page_id, True)
+            struct.pack_into("Q", frame.data, 0, page_id)
+            buffer_manager.unfix_page(frame, True)
+
+        # Evicting a dirty page needs a spare slot, which is taken by a pending write
+        slot = buffer_manager._arena.acquire_spare()
+        fixed = threading.Event()
+        def fix_page():
+            frame = buffer_manager.fix_page(frame_count, True)
+            fixed.set()
+            buffer_manager.unfix_page(frame, True)
+        waiter = threading.Thread(target=fix_page)
+        waiter.start()
+        self.assertFalse(fixed.wait(0.05))
+        self.assertTrue(buffer_manager._frames_lock.acquire(timeout=5))
+        buffer_manager._frames_lock.release()
+
+        buffer_manager._arena.release_spare(slot)
+        waiter.join(5)
+        self.assertTrue(fixed.is_set())
+        for page_id in range(0, frame_count + 1):
+            frame = buffer_manager.fix_page(page_id, False)
+            self.assertEqual(page_id if page_id < frame_count else 0, struct.unpack_from("Q", frame.data, 0)[0])
+            buffer_manager.unfix_page(frame, False)
+        buffer_manager.close()
+
+    def test_should_write_back_more_dirty_pages_than_spares(self):
+        frame_count = 10
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       flusher_thread_count=1,
+                                       spare_frame_count=2)
+        def dirty_pages(first_page_id: int):
+            for page_id in range(first_page_id, first_page_id + 5 * frame_count):
+                frame = buffer_manager.fix_page(page_id, True)
+                struct.pack_into("Q", frame.data, 0, page_id)
+                buffer_manager.unfix_page(frame, True)
+        writers = [threading.Thread(target=dirty_pages, args=(i * 1000,)) for i in range(0, 4)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join(30)
+            self.assertFalse(writer.is_alive())
+
+        for i in range(0, 4):
+            for page_id in range(i * 1000, i * 1000 + 5 * frame_count):
+                frame = buffer_manager.fix_page(page_id, False)
+                self.assertEqual(page_id, struct.unpack_from("Q", frame.data, 0)[0])
+                buffer_manager.unfix_page(frame, False)
+        buffer_manager.close()
+
+    def test_should_write_back_in_background(self):
+        frame_count = 10
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       flusher_thread_count=2)
+
+        for page_id in range(0, 3 * frame_count):
+            frame = buffer_manager.fix_page(page_id, True)
+            struct.pack_into("Q", frame.data, 0, page_id)
+            buffer_manager.unfix_page(frame, True)
+        for page_id in range(0, 3 * frame_count):
+            frame = buffer_manager.fix_page(page_id, False)
+            self.assertEqual(page_id, struct.unpack_from("Q", frame.data, 0)[0])
+            buffer_manager.unfix_page(frame, False)
+        buffer_manager.close()
+
+        self.assertEqual(buffer_manager._pending_writes, {})
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS),
+                         metric_collector.get_metric(Metric.BUFFER_MANAGER_CLEAN_EVICTIONS)
+                         + metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS))
+
+    def test_should_clean_dirty_frames_above_high_watermark(self):
+        frame_count = 10
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       dirty_high_watermark=0.5,
+                                       dirty_low_watermark=0.2)
+
+        frames = []
+        for page_id in range(0, frame_count):
+            frame = buffer_manager.fix_page(page_id, True)
+            struct.pack_into("Q", frame.data, 0, page_id)
+            frames.append(frame)
+        # Pinned frames must not be cleaned
+        for frame in frames[:6]:
+            buffer_manager.unfix_page(frame, True)
+        self.assertEqual(len(buffer_manager._dirty_frame_ids), 6)
+
+        cleaned = buffer_manager._clean_dirty_frames()
+        self.assertEqual(len(cleaned), 4)
+        self.assertEqual(len(buffer_manager._dirty_frame_ids), 2)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_BACKGROUND_CLEANS), 4)
+        for frame in cleaned:
+            self.assertTrue(frame.dirty)
+            self.assertFalse(buffer_manager._frames[frame.frame_id].dirty)
+            self.assertEqual(frame.page_id, struct.unpack_from("Q", frame.data, 0)[0])
+            buffer_manager._write_frame(frame)
+            buffer_manager._on_write_complete(frame)
+        self.assertEqual(buffer_manager._pending_writes, {})
+
+        for frame in frames[6:]:
+            buffer_manager.unfix_page(frame, False)
+
+    def test_should_evict_to_free_frames(self):
+        frame_count = 10
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       free_frames_low_watermark=2,
+                                       free_frames_high_watermark=4)
+        # Stop the evictor thread so that eviction only happens below
+        buffer_manager._evictor.shutdown()
+
+        for page_id in range(0, frame_count):
+            frame = buffer_manager.fix_page(page_id, True)
+            struct.pack_into("Q", frame.data, 0, page_id)
+            buffer_manager.unfix_page(frame, page_id % 2 == 0)
+        buffer_manager._evict_frames()
+
+        self.assertEqual(len(buffer_manager._free_frames), 4)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS), 4)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS), 2)
+        for page_id in range(0, 4):
+            self.assertFalse(buffer_manager.page_present(page_id))
+
+        # Misses take free frames without evicting
+        for page_id in range(frame_count, frame_count + 3):
+            frame = buffer_manager.fix_page(page_id, False)
+            buffer_manager.unfix_page(frame, False)
+        self.assertEqual(len(buffer_manager._free_frames), 1)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_EVICTIONS), 4)
+
+        # Dirty pages were written back
+        for page_id in range(0, 4, 2):
+            frame = buffer_manager.fix_page(page_id, False)
+            self.assertEqual(page_id, struct.unpack_from("Q", frame.data, 0)[0])
+            buffer_manager.unfix_page(frame, False)
+        buffer_manager.close()
+
+    def test_should_keep_data_with_background_evictor(self):
+        frame_count = 10
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       flusher_thread_count=1,
+                                       free_frames_low_watermark=2,
+                                       free_frames_high_watermark=4)
+
+        for page_id in range(0, 5 * frame_count):
+            frame = buffer_manager.fix_page(page_id, True)
+            struct.pack_into("Q", frame.data, 0, page_id)
+            buffer_manager.unfix_page(frame, True)
+        for page_id in range(0, 5 * frame_count):
+            frame = buffer_manager.fix_page(page_id, False)
+            self.assertEqual(page_id, struct.unpack_from("Q", frame.data, 0)[0])
+            buffer_manager.unfix_page(frame, False)
+        buffer_manager.close()
+
+    def test_should_prefetch_sequential_pages(self):
+        frame_count = 10
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       prefetch_max_depth=2)
+
+        for page_id in range(0, 2):
+            frame = buffer_manager.fix_page(page_id, False)
+            buffer_manager.unfix_page(frame, False)
+        buffer_manager._prefetcher.shutdown()
+        self.assertTrue(buffer_manager.page_present(2))
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_PREFETCHES), 1)
+
+        frame = buffer_manager.fix_page(2, False)
+        buffer_manager.unfix_page(frame, False)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_PREFETCHES_USED), 1)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_HITS), 1)
+        self.assertEqual(metric_collector.get_prefetch_accuracy(), 1)
+        self.assertEqual(metric_collector.get_prefetch_coverage(), 1 / 3)
+        buffer_manager.close()
+
+    def test_prefetched_pages_should_be_evictable(self):
+        frame_count = 2
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector)
+
+        frame = buffer_manager.fix_page(0, False, is_prefetch=True)
+        buffer_manager.unfix_page(frame, False, is_prefetch=True)
+        frame = buffer_manager.fix_page(1, False, is_prefetch=True)
+        buffer_manager.unfix_page(frame, False, is_prefetch=True)
+        frame = buffer_manager.fix_page(2, False)
+        buffer_manager.unfix_page(frame, False)
+
+        self.assertFalse(buffer_manager.page_present(0))
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_PREFETCHES), 2)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_PREFETCHES_WASTED), 1)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES), 1)
+
+    def test_should_fix_page_async(self):
+        frame_count = 2
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector)
+
+        async def run():
+            for page_id in range(0, 4):
+                async with buffer_manager.fix_page_guard_async(page_id, True) as frame:
+                    struct.pack_into("Q", frame.data, 0, page_id + 100)
+                    frame.dirty = True
+            for page_id in range(0, 4):
+                frame = await buffer_manager.fix_page_async(page_id, False)
+                self.assertEqual(struct.unpack_from("Q", frame.data, 0)[0], page_id + 100)
+                await buffer_manager.unfix_page_async(frame, False)
+
+        asyncio.run(run())
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_MISSES), 8)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS), 4)
+
+    def test_latch_wait_should_suspend_coroutine(self):
+        frame_count = 2
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector)
+        events = []
+
+        async def writer():
+            frame = await buffer_manager.fix_page_async(0, True)
+            events.append("writer fixed")
+            await asyncio.sleep(0.01)
+            events.append("writer unfixing")
+            await buffer_manager.unfix_page_async(frame, True)
+
+        async def reader():
+            await asyncio.sleep(0)
+            frame = await buffer_manager.fix_page_async(0, False)
+            events.append("reader fixed")
+            await buffer_manager.unfix_page_async(frame, False)
+
+        async def run():
+            await asyncio.gather(writer(), reader())
+
+        asyncio.run(run())
+        self.assertEqual(events, ["writer fixed", "writer unfixing", "reader fixed"])
+
+    def test_should_serve_concurrent_async_requests(self):
+        frame_count = 16
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector)
+
+        async def request(page_id: int):
+            async with buffer_manager.fix_page_guard_async(page_id, False) as frame:
+                await asyncio.sleep(0)
+                return frame.page_id
+
+        async def run():
+            return await asyncio.gather(*[request(i % frame_count) for i in range(0, 500)])
+
+        page_ids = asyncio.run(run())
+        self.assertEqual(page_ids, [i % frame_count for i in range(0, 500)])
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES), 500)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_MISSES), frame_count)
+
+    def test_should_fix_pages_in_batch(self):
+        frame_count = 10
+        read_calls = []
+        class CountingFileManager(FileManager):
+            def read_blocks(self, file_name, page_id, dests):
+                read_calls.append((file_name, page_id, len(dests)))
+                super().read_blocks(file_name, page_id, dests)
+        file_manager = CountingFileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector)
+
+        frame = buffer_manager.fix_page(make_page_id(0, 2), True)
+        struct.pack_into("Q", frame.data, 0, 42)
+        buffer_manager.unfix_page(frame, True)
+
+        page_ids = [make_page_id(1, 0), make_page_id(0, 3), make_page_id(0, 2),
+                    make_page_id(0, 1), make_page_id(0, 5)]
+        frames = buffer_manager.fix_pages(page_ids, False)
+        self.assertEqual([frame.page_id for frame in frames], page_ids)
+        self.assertEqual(struct.unpack_from("Q", frames[2].data, 0)[0], 42)
+        self.assertEqual(read_calls, [("0", 1, 1), ("0", 3, 1), ("0", 5, 1), ("1", 0, 1)])
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES), 6)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_HITS), 1)
+        buffer_manager.unfix_pages(frames, False)
+
+        read_calls.clear()
+        frames = buffer_manager.fix_pages([make_page_id(2, i) for i in range(0, 4)], True)
+        self.assertEqual(read_calls, [("2", 0, 4)])
+        buffer_manager.unfix_pages(frames, True)
+
+    def test_fix_pages_should_unfix_pages_if_buffer_full(self):
+        frame_count = 3
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector)
+
+        pinned_frame = buffer_manager.fix_page(10, False)
+        with self.assertRaises(BufferFullError):
+            buffer_manager.fix_pages([0, 1, 2], True)
+        # The pages fixed by the failed batch can be evicted again
+        frames = buffer_manager.fix_pages([3, 4], True)
+        buffer_manager.unfix_pages(frames, False)
+        buffer_manager.unfix_page(pinned_frame, False)
+        with self.assertRaises(ValueError):
+            buffer_manager.fix_pages([1, 1], False)
+
+    def test_scan_with_strategy_should_not_evict_other_pages(self):
+        frame_count = 8
+        file_manager = FileManager()
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       4096,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector)
+        for page_id in range(0, 5):
+            frame = buffer_manager.fix_page(page_id, False)
+            buffer_manager.unfix_page(frame, False)
+
+        strategy = BufferAccessStrategy(ring_size=2)
+        for page_id in range(100, 120):
+            frame = buffer_manager.fix_page(page_id, True, strategy=strategy)
+            struct.pack_into("Q", frame.data, 0, page_id)
+            buffer_manager.unfix_page(frame, True)
+        for page_id in range(0, 5):
+            self.assertTrue(buffer_manager.page_present(page_id))
+        self.assertEqual(strategy.frame_ids, [5, 6])
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_DIRTY_EVICTIONS), 18)
+
+        # A page of the ring that is used without the strategy leaves the ring
+        frame = buffer_manager.fix_page(119, False)
+        buffer_manager.unfix_page(frame, False)
+        buffer_manager.free_access_strategy(strategy)
+        self.assertTrue(buffer_manager.page_present(119))
+        self.assertFalse(buffer_manager.page_present(118))
+        self.assertEqual(strategy.frame_ids, [])
+
+        for page_id in range(100, 120):
+            frame = buffer_manager.fix_page(page_id, False)
+            self.assertEqual(struct.unpack_from("Q", frame.data, 0)[0], page_id)
+            buffer_manager.unfix_page(frame, False)
+
+    def test_should_write_back_dirty_sectors(self):
+        frame_count = 2
+        page_size = 4 * 4096
+        sector_writes = []
+        class RecordingFileManager(FileManager):
+            def write_sectors(self, file_name, page_id, src, ranges):
+                sector_writes.append((file_name, page_id, ranges))
+                super().write_sectors(file_name, page_id, src, ranges)
+        file_manager = RecordingFileManager(page_size=page_size)
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       page_size,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       sector_size=4096)
+
+        frame = buffer_manager.fix_page(make_page_id(0, 1), True)
+        struct.pack_into("Q", frame.data, 2 * 4096, 42)
+        frame.mark_dirty(2 * 4096, 8)
+        buffer_manager.unfix_page(frame, True)
+        # Pages unfixed dirty without marked ranges are written whole
+        frame = buffer_manager.fix_page(make_page_id(0, 2), True)
+        buffer_manager.unfix_page(frame, True)
+        for page in range(3, 5):
+            buffer_manager.unfix_page(buffer_manager.fix_page(make_page_id(0, page), False), False)
+
+        self.assertEqual(sector_writes, [("0", 1, [(2 * 4096, 4096)])])
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_BYTES_DIRTIED), 8 + page_size)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_BYTES_WRITTEN), 4096 + page_size)
+        frame = buffer_manager.fix_page(make_page_id(0, 1), False)
+        self.assertEqual(struct.unpack_from("Q", frame.data, 2 * 4096)[0], 42)
+        buffer_manager.unfix_page(frame, False)
+
+    def test_should_diff_pages_on_unfix(self):
+        frame_count = 2
+        page_size = 4 * 4096
+        file_manager = FileManager(page_size=page_size)
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       page_size,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       sector_size=4096,
+                                       diff_on_unfix=True)
+
+        frame = buffer_manager.fix_page(make_page_id(0, 0), True)
+        struct.pack_into("Q", frame.data, 3 * 4096, 7)
+        buffer_manager.unfix_page(frame, True)
+        self.assertEqual(frame.get_dirty_ranges(), [(3 * 4096, 4096)])
+        # A page that did not change stays clean
+        frame = buffer_manager.fix_page(make_page_id(0, 1), True)
+        buffer_manager.unfix_page(frame, True)
+        self.assertFalse(frame.dirty)
+        buffer_manager.close()
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_BYTES_WRITTEN), 4096)
+
+    def test_should_read_byte_range_of_page(self):
+        frame_count = 2
+        page_size = 4 * 4096
+        sector_reads = []
+        class RecordingFileManager(FileManager):
+            def read_sectors(self, file_name, page_id, dest, ranges):
+                sector_reads.append((file_name, page_id, ranges))
+                super().read_sectors(file_name, page_id, dest, ranges)
+        file_manager = RecordingFileManager(page_size=page_size)
+        file_manager.write_block("0", 1, b'\x01' * page_size)
+        metric_collector = MetricCollector()
+        buffer_manager = BufferManager(frame_count,
+                                       page_size,
+                                       LRUReplacer(frame_count),
+                                       file_manager,
+                                       metric_collector,
+                                       sector_size=4096)
+
+        frame = buffer_manager.fix_page(make_page_id(0, 1), True, byte_range=(4096 + 10, 100))
+        self.assertEqual(sector_reads, [("0", 1, [(4096, 4096)])])
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_BYTES_READ), 4096)
+        self.assertEqual(bytes(frame.read(4096, 8)), b'\x01' * 8)
+        frame.write(3 * 4096, b'\x02' * 8)
+        self.assertEqual(sector_reads[1:], [("0", 1, [(3 * 4096, 4096)])])
+        # Sectors that were never read are not written back
+        buffer_manager.unfix_page(frame, True)
+        self.assertEqual(frame.get_dirty_ranges(), [(3 * 4096, 4096)])
+
+        # A fix without a byte range reads the missing sectors
+        frame = buffer_manager.fix_page(make_page_id(0, 1), False)
+        self.assertEqual(sector_reads[2:], [("0", 1, [(0, 4096), (2 * 4096, 4096)])])
+        self.assertEqual(frame.data[:], b'\x01' * 3 * 4096 + b'\x02' * 8 + b'\x01' * (4096 - 8))
+        buffer_manager.unfix_page(frame, False)
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_BYTES_READ), page_size)
+        buffer_manager.close()
+        file_manager.remove_file("0")
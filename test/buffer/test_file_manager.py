@@ -1,6 +1,7 @@
 import unittest
 import struct
 import os, mmap
+import threading
 from src.util.constants import PAGE_SIZE
 
 from src.buffer.file_manager import FileManager
@@ -53,4 +54,151 @@ class FileManagerTest(unittest.TestCase):
             self.assertEqual(mm1_bytes, b'\x3f' * PAGE_SIZE)
             mm2.seek(0, os.SEEK_SET)
             mm2_bytes = mm2.read(PAGE_SIZE)
-            self.assertEqual(mm2_bytes, b'\x01' * PAGE_SIZE)
\ No newline at end of file
+            self.assertEqual(mm2_bytes, b'\x01' * PAGE_SIZE)
+    def test_write_read_unaligned_buffers(self):
+        file_manager = FileManager()
+        file_manager.create_file('0')
+
+        src = bytes(b'\x2a' * PAGE_SIZE)
+        file_manager.write_block('0', 3, src)
+        # A slice starting at an odd offset is never aligned
+        dest = memoryview(bytearray(PAGE_SIZE + 1))[1:]
+        file_manager.read_block('0', 3, dest)
+        self.assertEqual(bytes(dest), src)
+        file_manager.remove_file('0')
+
+    def test_read_past_end_of_file(self):
+        file_manager = FileManager()
+        file_manager.create_file('0')
+
+        with mmap.mmap(-1, PAGE_SIZE) as mm:
+            mm.write(b'\x01' * PAGE_SIZE)
+            file_manager.read_block('0', FileManager._initial_size // PAGE_SIZE + 10, mm)
+            mm.seek(0, os.SEEK_SET)
+            self.assertEqual(mm.read(PAGE_SIZE), b'\0' * PAGE_SIZE)
+        file_manager.remove_file('0')
+
+    def test_concurrent_write_read_same_file(self):
+        file_manager = FileManager()
+        file_manager.create_file('0')
+        pages_per_thread = 16
+        thread_count = 8
+        # Pages past the initial size make the writers grow the file concurrently
+        first_page = FileManager._initial_size // PAGE_SIZE - 8
+
+        def write_pages(thread_num: int):
+            with mmap.mmap(-1, PAGE_SIZE) as mm:
+                for i in range(0, pages_per_thread):
+                    page_id = first_page + i * thread_count + thread_num
+                    struct.pack_into("Q", mm, 0, page_id)
+                    file_manager.write_block('0', page_id, mm)
+
+        def read_pages(thread_num: int, results):
+            dest = bytearray(PAGE_SIZE)
+            for i in range(0, pages_per_thread):
+                page_id = first_page + i * thread_count + thread_num
+                file_manager.read_block('0', page_id, dest)
+                results.append(struct.unpack_from("Q", dest, 0)[0] == page_id)
+
+        threads = [threading.Thread(target=write_pages, args=(i,)) for i in range(0, thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results = []
+        threads = [threading.Thread(target=read_pages, args=(i, results)) for i in range(0, thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [True] * (pages_per_thread * thread_count))
+        # The file grows by whole extents
+        self.assertEqual(os.stat('data/0').st_size, 2 * FileManager._initial_size)
+        file_manager.remove_file('0')
+
+    def test_write_should_grow_file_by_extents(self):
+        extent_size = 4 * FileManager._initial_size
+        file_manager = FileManager(extent_size=extent_size)
+        file_manager.create_file('0')
+
+        with mmap.mmap(-1, PAGE_SIZE) as mm:
+            file_manager.write_block('0', FileManager._initial_size // PAGE_SIZE, mm)
+            self.assertEqual(os.stat('data/0').st_size, extent_size)
+            file_manager.write_block('0', extent_size // PAGE_SIZE, mm)
+            self.assertEqual(os.stat('data/0').st_size, 2 * extent_size)
+            self.assertEqual(file_manager._file_size('0'), 2 * extent_size)
+        file_manager.remove_file('0')
+
+    def test_write_read_blocks(self):
+        file_manager = FileManager()
+        file_manager.create_file('0')
+        page_count = 4
+        # The last page is past the end of the file
+        first_page = FileManager._initial_size // PAGE_SIZE - page_count + 1
+
+        with mmap.mmap(-1, PAGE_SIZE * page_count) as mm:
+            srcs = [memoryview(mm)[i * PAGE_SIZE:(i + 1) * PAGE_SIZE] for i in range(0, page_count - 1)]
+            for i, src in enumerate(srcs):
+                src[:] = bytes([i + 1]) * PAGE_SIZE
+            file_manager.write_blocks('0', first_page, srcs)
+            for src in srcs:
+                src.release()
+        with mmap.mmap(-1, PAGE_SIZE * page_count) as mm:
+            mm.write(b'\xff' * PAGE_SIZE * page_count)
+            dests = [memoryview(mm)[i * PAGE_SIZE:(i + 1) * PAGE_SIZE] for i in range(0, page_count)]
+            file_manager.read_blocks('0', first_page, dests)
+            for i in range(0, page_count - 1):
+                self.assertEqual(bytes(dests[i]), bytes([i + 1]) * PAGE_SIZE)
+            self.assertEqual(bytes(dests[-1]), b'\0' * PAGE_SIZE)
+            for dest in dests:
+                dest.release()
+        file_manager.remove_file('0')
+
+    def test_write_batch_should_merge_adjacent_pages(self):
+        file_manager = FileManager()
+        file_manager.create_file('0')
+        file_manager.create_file('1')
+        calls = []
+        file_manager.write_blocks = lambda file_name, page_id, srcs: \
+            calls.append((file_name, page_id, [src[0] for src in srcs]))
+
+        file_manager.write_batch([('0', 5, b'\x05'), ('1', 2, b'\x02'), ('0', 4, b'\x04'),
+                                  ('0', 7, b'\x07'), ('0', 5, b'\x06')])
+        self.assertEqual(calls, [('0', 4, [4, 5]), ('0', 5, [6]), ('0', 7, [7]), ('1', 2, [2])])
+        file_manager.remove_file('0')
+        file_manager.remove_file('1')
+
+    def test_write_sectors(self):
+        file_manager = FileManager(page_size=4 * PAGE_SIZE)
+        file_manager.create_file('0')
+
+        with mmap.mmap(-1, 4 * PAGE_SIZE) as mm:
+            mm.write(b'\x01' * 4 * PAGE_SIZE)
+            file_manager.write_block('0', 2, mm)
+            mm.seek(0, os.SEEK_SET)
+            mm.write(b'\x02' * 4 * PAGE_SIZE)
+            file_manager.write_sectors('0', 2, mm, [(PAGE_SIZE, PAGE_SIZE), (3 * PAGE_SIZE, PAGE_SIZE)])
+            # Unaligned buffers are written through the bounce buffer
+            file_manager.write_sectors('0', 2, bytes(b'\x03' * 4 * PAGE_SIZE), [(0, PAGE_SIZE)])
+            file_manager.read_block('0', 2, mm)
+            self.assertEqual(mm[:], b'\x03' * PAGE_SIZE + b'\x02' * PAGE_SIZE
+                                    + b'\x01' * PAGE_SIZE + b'\x02' * PAGE_SIZE)
+        file_manager.remove_file('0')
+
+    def test_read_sectors(self):
+        file_manager = FileManager(page_size=4 * PAGE_SIZE)
+        file_manager.create_file('0')
+
+        file_manager.write_block('0', 1, bytes(range(4)) * PAGE_SIZE)
+        with mmap.mmap(-1, 4 * PAGE_SIZE) as mm:
+            file_manager.read_sectors('0', 1, mm, [(PAGE_SIZE, PAGE_SIZE), (3 * PAGE_SIZE, PAGE_SIZE)])
+            self.assertEqual(mm[:], bytes(PAGE_SIZE) + (bytes(range(4)) * PAGE_SIZE)[PAGE_SIZE:2 * PAGE_SIZE]
+                                    + bytes(PAGE_SIZE) + (bytes(range(4)) * PAGE_SIZE)[3 * PAGE_SIZE:])
+        # Unaligned buffers are read through the bounce buffer, past the end reads zeros
+        dest = bytearray(b'\x05' * 4 * PAGE_SIZE)
+        file_manager.read_sectors('0', 1, dest, [(2 * PAGE_SIZE, PAGE_SIZE)])
+        self.assertEqual(dest[2 * PAGE_SIZE - 1:2 * PAGE_SIZE + 3], b'\x05\x00\x01\x02')
+        file_manager.read_sectors('0', 9, dest, [(0, PAGE_SIZE)])
+        self.assertEqual(dest[:PAGE_SIZE], bytes(PAGE_SIZE))
+        file_manager.remove_file('0')
@@ -0,0 +1,57 @@
+import unittest
+import ctypes
+import mmap
+import threading
+
+from src.buffer.frame_arena import FrameArena
+
+class FrameArenaTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_slots_should_be_page_aligned(self):
+        arena = FrameArena(4, 4096, spare_count=2)
+        self.assertEqual(arena.slot_count, 6)
+        for slot in range(0, arena.slot_count):
+            data = arena.get_slot(slot)
+            self.assertEqual(len(data), 4096)
+            self.assertEqual(ctypes.addressof(ctypes.c_char.from_buffer(data)) % mmap.PAGESIZE, 0)
+
+    def test_slots_should_not_overlap(self):
+        arena = FrameArena(4, 4096, spare_count=2)
+        for slot in range(0, arena.slot_count):
+            arena.get_slot(slot)[0] = slot
+        for slot in range(0, arena.slot_count):
+            self.assertEqual(arena.get_slot(slot)[0], slot)
+
+    def test_should_acquire_and_release_spares(self):
+        arena = FrameArena(4, 4096, spare_count=2)
+        self.assertEqual(arena.acquire_spare(), 4)
+        self.assertEqual(arena.acquire_spare(), 5)
+        self.assertEqual(arena.spare_count, 0)
+        arena.release_spare(1)
+        self.assertEqual(arena.acquire_spare(), 1)
+
+    def test_acquire_should_wait_for_release(self):
+        arena = FrameArena(4, 4096, spare_count=1)
+        arena.acquire_spare()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(arena.acquire_spare()))
+        waiter.start()
+        waiter.join(0.05)
+        self.assertEqual(acquired, [])
+        arena.release_spare(2)
+        waiter.join(5)
+        self.assertEqual(acquired, [2])
+
+    def test_wait_for_spare_should_not_take_slot(self):
+        arena = FrameArena(4, 4096, spare_count=1)
+        arena.acquire_spare()
+        waiter = threading.Thread(target=arena.wait_for_spare)
+        waiter.start()
+        waiter.join(0.05)
+        self.assertTrue(waiter.is_alive())
+        arena.release_spare(2)
+        waiter.join(5)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(arena.spare_count, 1)
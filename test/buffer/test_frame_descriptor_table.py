@@ -0,0 +1,57 @@
+import unittest
+import threading
+
+from src.buffer.frame_descriptor_table import FrameDescriptorTable
+from src.buffer.buffer_frame import BufferFrame
+from src.util.constants import INVALID_PAGE_ID
+
+class FrameDescriptorTableTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_should_initialize_descriptors(self):
+        table = FrameDescriptorTable(100)
+        self.assertEqual(table.frame_count, 100)
+        self.assertEqual(list(table.page_ids), [INVALID_PAGE_ID] * 100)
+        self.assertEqual(list(table.dirty), [0] * 100)
+        self.assertEqual(list(table.exclusive), [0] * 100)
+        self.assertEqual(list(table.pin_counts), [0] * 100)
+
+    def test_should_count_pins(self):
+        table = FrameDescriptorTable(4)
+        self.assertEqual(table.inc_pin(2), 1)
+        self.assertEqual(table.inc_pin(2), 2)
+        self.assertEqual(table.dec_pin(2), 1)
+        self.assertEqual(table.pin_counts[1], 0)
+
+    def test_should_count_pins_concurrently(self):
+        table = FrameDescriptorTable(4)
+        def pin_unpin():
+            for i in range(0, 1000):
+                table.inc_pin(1)
+                table.inc_pin(1)
+                table.dec_pin(1)
+        workers = [threading.Thread(target=pin_unpin) for i in range(0, 4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(table.pin_counts[1], 4000)
+
+    def test_frames_should_be_views_of_table(self):
+        table = FrameDescriptorTable(4)
+        frame = BufferFrame(3, 4096, descriptors=table)
+        frame.page_id = 1 << 50
+        frame.dirty = True
+        frame.exclusive = True
+
+        self.assertEqual(table.page_ids[3], 1 << 50)
+        self.assertEqual(table.dirty[3], 1)
+        self.assertEqual(table.exclusive[3], 1)
+        table.dirty[3] = 0
+        self.assertFalse(frame.dirty)
+
+        copy = frame.move()
+        copy.page_id = 7
+        self.assertEqual(frame.page_id, 1 << 50)
+        self.assertRaises(AttributeError, setattr, frame, 'other', 1)
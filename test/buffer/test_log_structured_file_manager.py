@@ -0,0 +1,78 @@
+import unittest
+import os
+import shutil
+from src.util.constants import PAGE_SIZE
+
+from src.buffer.log_structured_file_manager import LogStructuredFileManager
+
+DIRECTORY = 'data/log_structured'
+
+class LogStructuredFileManagerTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def setUp(self):
+        shutil.rmtree(DIRECTORY, ignore_errors=True)
+
+    def tearDown(self):
+        shutil.rmtree(DIRECTORY, ignore_errors=True)
+
+    def test_should_read_latest_version(self):
+        file_manager = LogStructuredFileManager(DIRECTORY, log_pages=4, background_cleaning=False)
+        file_manager.create_file('0')
+        for version in range(1, 4):
+            file_manager.write_block('0', 7, bytes([version]) * PAGE_SIZE)
+        file_manager.write_blocks('1', 0, [b'\x0a' * PAGE_SIZE, b'\x0b' * PAGE_SIZE])
+
+        dest = bytearray(PAGE_SIZE)
+        file_manager.read_block('0', 7, dest)
+        self.assertEqual(dest, b'\x03' * PAGE_SIZE)
+        dests = [bytearray(PAGE_SIZE), bytearray(PAGE_SIZE)]
+        file_manager.read_blocks('1', 0, dests)
+        self.assertEqual(dests, [b'\x0a' * PAGE_SIZE, b'\x0b' * PAGE_SIZE])
+        # Pages that were never written read as zeros
+        file_manager.read_block('0', 8, dest)
+        self.assertEqual(dest, b'\0' * PAGE_SIZE)
+        # Writes are appended to two logs of 4 pages
+        self.assertEqual(file_manager.log_count, 2)
+        self.assertEqual(file_manager.bytes_written, 5 * PAGE_SIZE)
+        file_manager.close()
+
+    def test_should_compact_stale_logs(self):
+        file_manager = LogStructuredFileManager(DIRECTORY, log_pages=4, background_cleaning=False)
+        for page_id in range(0, 4):
+            file_manager.write_block('0', page_id, bytes([page_id]) * PAGE_SIZE)
+        # Overwriting three pages leaves one live page in the first log
+        for page_id in range(0, 3):
+            file_manager.write_block('0', page_id, bytes([page_id + 10]) * PAGE_SIZE)
+        self.assertEqual(file_manager.clean(), 1)
+
+        self.assertFalse(os.path.exists(f"{DIRECTORY}/log_0"))
+        self.assertEqual(file_manager.log_count, 1)
+        self.assertEqual(file_manager.bytes_requested, 7 * PAGE_SIZE)
+        self.assertEqual(file_manager.bytes_written, 8 * PAGE_SIZE)
+        dest = bytearray(PAGE_SIZE)
+        for page_id in range(0, 4):
+            file_manager.read_block('0', page_id, dest)
+            self.assertEqual(dest, bytes([page_id + 10 if page_id < 3 else page_id]) * PAGE_SIZE)
+        file_manager.close()
+
+    def test_should_reopen_from_checkpoint(self):
+        file_manager = LogStructuredFileManager(DIRECTORY, log_pages=4)
+        for page_id in range(0, 6):
+            file_manager.write_block('0', page_id, bytes([page_id + 1]) * PAGE_SIZE)
+        file_manager.remove_file('0')
+        file_manager.write_block('1', 3, b'\x2a' * PAGE_SIZE)
+        file_manager.close()
+
+        reopened = LogStructuredFileManager(DIRECTORY, log_pages=4, background_cleaning=False)
+        dest = bytearray(PAGE_SIZE)
+        reopened.read_block('1', 3, dest)
+        self.assertEqual(dest, b'\x2a' * PAGE_SIZE)
+        reopened.read_block('0', 2, dest)
+        self.assertEqual(dest, b'\0' * PAGE_SIZE)
+        # New writes continue the active log
+        reopened.write_block('1', 4, b'\x2b' * PAGE_SIZE)
+        reopened.read_block('1', 4, dest)
+        self.assertEqual(dest, b'\x2b' * PAGE_SIZE)
+        reopened.close()
@@ -20,4 +20,16 @@ class MetricCollectorTest(unittest.TestCase):
     def test_get_empty_metric(self):
         collector = MetricCollector()
         self.assertEqual(collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES), 0)
-        
\ No newline at end of file
+        
+    def test_record_get_percentile(self):
+        collector = MetricCollector()
+        for value in range(1, 101):
+            collector.record(Metric.BUFFER_MANAGER_FIX_LATENCY, value)
+
+        self.assertEqual(collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 50), 50)
+        self.assertEqual(collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 99), 99)
+        self.assertEqual(collector.get_percentile(Metric.BUFFER_MANAGER_FIX_LATENCY, 100), 100)
+        self.assertEqual(collector.get_percentile(Metric.BUFFER_MANAGER_PENDING_WRITE_WAIT, 99), 0)
+
+        collector.reset()
+        self.assertEqual(collector.get_samples(Metric.BUFFER_MANAGER_FIX_LATENCY), [])
@@ -0,0 +1,55 @@
+import unittest
+import os
+from src.util.constants import PAGE_SIZE
+
+from src.buffer.file_manager import FileManager
+from src.buffer.mmap_file_manager import MmapFileManager
+
+class MmapFileManagerTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_write_read_file(self):
+        file_manager = MmapFileManager()
+        file_manager.create_file('0')
+
+        file_manager.write_block('0', 1, b'\x3f' * PAGE_SIZE)
+        file_manager.write_blocks('0', 2, [b'\x01' * PAGE_SIZE, b'\x02' * PAGE_SIZE])
+        dest = bytearray(PAGE_SIZE)
+        file_manager.read_block('0', 1, dest)
+        self.assertEqual(dest, b'\x3f' * PAGE_SIZE)
+        dests = [bytearray(PAGE_SIZE), bytearray(PAGE_SIZE)]
+        file_manager.read_blocks('0', 2, dests)
+        self.assertEqual(dests, [b'\x01' * PAGE_SIZE, b'\x02' * PAGE_SIZE])
+        view = file_manager.read_block_view('0', 3)
+        self.assertTrue(view.readonly)
+        self.assertEqual(bytes(view), b'\x02' * PAGE_SIZE)
+        view.release()
+        file_manager.remove_file('0')
+
+    def test_should_be_readable_by_file_manager(self):
+        file_manager = MmapFileManager()
+        file_manager.create_file('0')
+        file_manager.write_block('0', 5, b'\x07' * PAGE_SIZE)
+
+        dest = bytearray(PAGE_SIZE)
+        FileManager().read_block('0', 5, dest)
+        self.assertEqual(dest, b'\x07' * PAGE_SIZE)
+        file_manager.remove_file('0')
+
+    def test_should_remap_grown_file(self):
+        file_manager = MmapFileManager()
+        file_manager.create_file('0')
+        first_page_past_end = FileManager._initial_size // PAGE_SIZE
+        # Views of the old mapping stay valid after the file has grown
+        view = file_manager.read_block_view('0', 0)
+        self.assertEqual(bytes(file_manager.read_block_view('0', first_page_past_end)),
+                         b'\0' * PAGE_SIZE)
+
+        file_manager.write_block('0', first_page_past_end, b'\x09' * PAGE_SIZE)
+        self.assertEqual(os.stat('data/0').st_size, 2 * FileManager._initial_size)
+        self.assertEqual(bytes(file_manager.read_block_view('0', first_page_past_end)),
+                         b'\x09' * PAGE_SIZE)
+        self.assertEqual(bytes(view), b'\0' * PAGE_SIZE)
+        view.release()
+        file_manager.remove_file('0')
@@ -0,0 +1,95 @@
+import unittest
+import struct
+import os
+import glob
+
+from src.buffer.metric_collector import Metric, MetricCollector
+from src.buffer.file_manager import FileManager
+from src.buffer.partitioned_buffer_manager import PartitionedBufferManager
+from src.buffer.replacement.lru_replacer import LRUReplacer
+from src.util.page_id_utils import make_page_id
+
+class PartitionedBufferManagerTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def setUp(self):
+        files = glob.glob('data/*')
+        for f in files:
+            if os.path.isfile(f):
+                os.remove(f)
+
+    def test_should_split_frames_across_shards(self):
+        buffer_manager = PartitionedBufferManager(10,
+                                                  4096,
+                                                  LRUReplacer,
+                                                  FileManager(),
+                                                  MetricCollector(),
+                                                  shard_count=4)
+        self.assertEqual(buffer_manager.shard_count, 4)
+        self.assertEqual([shard._frame_count for shard in buffer_manager.shards], [3, 3, 2, 2])
+
+    def test_should_reject_invalid_shard_count(self):
+        self.assertRaises(ValueError, PartitionedBufferManager, 10, 4096, LRUReplacer,
+                          FileManager(), MetricCollector(), 0)
+        self.assertRaises(ValueError, PartitionedBufferManager, 2, 4096, LRUReplacer,
+                          FileManager(), MetricCollector(), 4)
+
+    def test_should_fix_pages_in_shards(self):
+        frame_count = 8
+        metric_collector = MetricCollector()
+        buffer_manager = PartitionedBufferManager(frame_count,
+                                                  4096,
+                                                  LRUReplacer,
+                                                  FileManager(),
+                                                  metric_collector,
+                                                  shard_count=4)
+
+        for seg in range(0, 2):
+            for page in range(0, 8):
+                page_id = make_page_id(seg, page)
+                frame = buffer_manager.fix_page(page_id, True)
+                struct.pack_into("Q", frame.data, 0, page_id)
+                buffer_manager.unfix_page(frame, True)
+
+        for seg in range(0, 2):
+            for page in range(0, 8):
+                page_id = make_page_id(seg, page)
+                frame = buffer_manager.fix_page(page_id, False)
+                value = struct.unpack_from("Q", frame.data, 0)[0]
+                self.assertEqual(page_id, value)
+                buffer_manager.unfix_page(frame, False)
+
+        self.assertEqual(metric_collector.get_metric(Metric.BUFFER_MANAGER_ACCESSES), 32)
+        for shard in buffer_manager.shards:
+            self.assertLessEqual(len(shard._page_to_frame), shard._frame_count)
+
+    def test_should_route_page_to_single_shard(self):
+        buffer_manager = PartitionedBufferManager(8,
+                                                  4096,
+                                                  LRUReplacer,
+                                                  FileManager(),
+                                                  MetricCollector(),
+                                                  shard_count=4)
+        frame = buffer_manager.fix_page(5, False)
+        self.assertTrue(buffer_manager.page_present(5))
+        self.assertEqual(sum(shard.page_present(5) for shard in buffer_manager.shards), 1)
+        buffer_manager.unfix_page(frame, False)
+
+    def test_should_fix_pages_across_shards(self):
+        buffer_manager = PartitionedBufferManager(8,
+                                                  4096,
+                                                  LRUReplacer,
+                                                  FileManager(),
+                                                  MetricCollector(),
+                                                  shard_count=2)
+        page_ids = [5, 2, 7, 0]
+        frames = buffer_manager.fix_pages(page_ids, True)
+        self.assertEqual([frame.page_id for frame in frames], page_ids)
+        for frame in frames:
+            struct.pack_into("Q", frame.data, 0, frame.page_id)
+        buffer_manager.unfix_pages(frames, True)
+
+        frames = buffer_manager.fix_pages(page_ids, False)
+        self.assertEqual([struct.unpack_from("Q", frame.data, 0)[0] for frame in frames], page_ids)
+        buffer_manager.unfix_pages(frames, False)
@@ -0,0 +1,57 @@
+import unittest
+import threading
+
+from src.buffer.prefetcher import Prefetcher
+from src.util.page_id_utils import make_page_id
+
+class PrefetcherTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def setUp(self):
+        self.prefetched = []
+        self.prefetched_lock = threading.Lock()
+
+    def _prefetch_page(self, page_id: int):
+        with self.prefetched_lock:
+            self.prefetched.append(page_id)
+
+    def test_should_prefetch_sequential_run(self):
+        prefetcher = Prefetcher(self._prefetch_page, max_depth=4, min_depth=2)
+        self.assertEqual(prefetcher.on_access(make_page_id(1, 10)), [])
+        self.assertEqual(prefetcher.on_access(make_page_id(1, 11)),
+                         [make_page_id(1, 12), make_page_id(1, 13)])
+        # Pages that were already read ahead are not issued again
+        self.assertEqual(prefetcher.on_access(make_page_id(1, 12)), [make_page_id(1, 14)])
+        prefetcher.shutdown()
+        self.assertEqual(sorted(self.prefetched),
+                         [make_page_id(1, 12), make_page_id(1, 13), make_page_id(1, 14)])
+
+    def test_should_not_prefetch_random_accesses(self):
+        prefetcher = Prefetcher(self._prefetch_page, max_depth=4)
+        for page in [5, 100, 3, 42, 7]:
+            self.assertEqual(prefetcher.on_access(make_page_id(0, page)), [])
+        prefetcher.shutdown()
+        self.assertEqual(self.prefetched, [])
+
+    def test_should_track_segments_separately(self):
+        prefetcher = Prefetcher(self._prefetch_page, max_depth=4)
+        prefetcher.on_access(make_page_id(0, 0))
+        prefetcher.on_access(make_page_id(1, 50))
+        self.assertEqual(prefetcher.on_access(make_page_id(0, 1)), [make_page_id(0, 2)])
+        self.assertEqual(prefetcher.on_access(make_page_id(1, 51)), [make_page_id(1, 52)])
+        prefetcher.shutdown()
+
+    def test_should_adapt_depth(self):
+        prefetcher = Prefetcher(self._prefetch_page, max_depth=8, min_depth=1)
+        prefetcher.on_access(make_page_id(2, 0))
+        self.assertEqual(prefetcher.get_depth(2), 1)
+        for i in range(0, 5):
+            prefetcher.on_prefetch_used(make_page_id(2, 1))
+        self.assertEqual(prefetcher.get_depth(2), 8)
+        prefetcher.on_prefetch_wasted(make_page_id(2, 1))
+        self.assertEqual(prefetcher.get_depth(2), 4)
+        for i in range(0, 5):
+            prefetcher.on_prefetch_wasted(make_page_id(2, 1))
+        self.assertEqual(prefetcher.get_depth(2), 1)
+        prefetcher.shutdown()
@@ -0,0 +1,66 @@
+import unittest
+import os
+import shutil
+from src.util.constants import PAGE_SIZE
+
+from src.buffer.striped_file_manager import StripedFileManager
+
+DIRECTORIES = ['data/striped_0', 'data/striped_1', 'data/striped_2']
+
+class StripedFileManagerTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def setUp(self):
+        for directory in DIRECTORIES:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def tearDown(self):
+        for directory in DIRECTORIES:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def test_should_place_segments_on_directories(self):
+        file_manager = StripedFileManager(DIRECTORIES)
+        for segment_id in range(0, 3):
+            file_manager.create_file(str(segment_id))
+            file_manager.write_block(str(segment_id), 2, bytes([segment_id + 1]) * PAGE_SIZE)
+        for segment_id in range(0, 3):
+            self.assertTrue(os.path.exists(f"{DIRECTORIES[segment_id]}/{segment_id}"))
+            dest = bytearray(PAGE_SIZE)
+            file_manager.read_block(str(segment_id), 2, dest)
+            self.assertEqual(dest, bytes([segment_id + 1]) * PAGE_SIZE)
+
+    def test_should_stripe_pages(self):
+        file_manager = StripedFileManager(DIRECTORIES, stripe_unit=2)
+        file_manager.create_file('1')
+        # Segment 1 starts on the second directory
+        self.assertEqual([file_manager._locate('1', page_id) for page_id in range(0, 7)],
+                         [(1, 0), (1, 1), (2, 0), (2, 1), (0, 0), (0, 1), (1, 2)])
+
+        srcs = [bytes([page_id + 1]) * PAGE_SIZE for page_id in range(0, 9)]
+        file_manager.write_blocks('1', 1, srcs)
+        dests = [bytearray(PAGE_SIZE) for page_id in range(0, 9)]
+        file_manager.read_blocks('1', 1, dests)
+        self.assertEqual(dests, srcs)
+        dest = bytearray(PAGE_SIZE)
+        file_manager.read_block('1', 4, dest)
+        self.assertEqual(dest, srcs[3])
+
+    def test_should_reopen_from_manifest(self):
+        file_manager = StripedFileManager(DIRECTORIES, stripe_unit=4)
+        file_manager.create_file('video')
+        placement = file_manager._get_placement('video')
+        file_manager.write_block('video', 5, b'\x05' * PAGE_SIZE)
+
+        reopened = StripedFileManager(DIRECTORIES, stripe_unit=4)
+        self.assertEqual(reopened._placements, {'video': placement})
+        dest = bytearray(PAGE_SIZE)
+        reopened.read_block('video', 5, dest)
+        self.assertEqual(dest, b'\x05' * PAGE_SIZE)
+        reopened.remove_file('video')
+        self.assertEqual(StripedFileManager(DIRECTORIES, stripe_unit=4)._placements, {})
+
+    def test_should_reject_different_layout(self):
+        StripedFileManager(DIRECTORIES, stripe_unit=4)
+        self.assertRaises(ValueError, StripedFileManager, DIRECTORIES, stripe_unit=8)
+        self.assertRaises(ValueError, StripedFileManager, DIRECTORIES[:2], stripe_unit=4)
@@ -0,0 +1,102 @@
+import unittest
+import threading
+
+from src.buffer.buffer_frame import BufferFrame
+from src.buffer.write_back_flusher import WriteBackFlusher
+
+class WriteBackFlusherTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_should_write_submitted_frames(self):
+        written = []
+        completed = []
+        flusher = WriteBackFlusher(lambda frame: written.append(frame.page_id),
+                                   lambda frame: completed.append(frame.page_id),
+                                   lambda: [],
+                                   thread_count=2,
+                                   queue_size=4)
+        for page_id in range(0, 20):
+            frame = BufferFrame(0, 4096)
+            frame.page_id = page_id
+            frame.dirty = True
+            flusher.submit(frame)
+        flusher.shutdown()
+
+        self.assertEqual(sorted(written), list(range(0, 20)))
+        self.assertEqual(sorted(completed), list(range(0, 20)))
+
+    def test_should_write_same_page_in_order(self):
+        written = []
+        flusher = WriteBackFlusher(lambda frame: written.append(frame.data[0]),
+                                   lambda frame: None,
+                                   lambda: [],
+                                   thread_count=4)
+        for version in range(0, 10):
+            frame = BufferFrame(0, 4096)
+            frame.page_id = 7
+            frame.data[0] = version
+            flusher.submit(frame)
+        flusher.shutdown()
+
+        self.assertEqual(written, list(range(0, 10)))
+
+    def test_should_complete_failed_writes(self):
+        completed = []
+        def fail(frame):
+            raise OSError()
+        flusher = WriteBackFlusher(fail,
+                                   lambda frame: completed.append(frame.page_id),
+                                   lambda: [],
+                                   thread_count=1)
+        frame = BufferFrame(0, 4096)
+        frame.page_id = 3
+        flusher.submit(frame)
+        flusher.shutdown()
+
+        self.assertEqual(completed, [3])
+
+    def test_should_write_cleaned_frames(self):
+        cleaned = threading.Event()
+        written = []
+        def clean_frames():
+            frame = BufferFrame(0, 4096)
+            frame.page_id = 42
+            cleaned.set()
+            return [frame]
+        flusher = WriteBackFlusher(lambda frame: written.append(frame.page_id),
+                                   lambda frame: None,
+                                   clean_frames,
+                                   thread_count=1)
+        flusher.request_cleaning()
+        self.assertTrue(cleaned.wait(5))
+        flusher.drain()
+        flusher.shutdown()
+
+        self.assertEqual(written, [42])
+
+    def test_should_write_queued_frames_in_batches(self):
+        batches = []
+        write_started = threading.Event()
+        resume_writes = threading.Event()
+        def write_frame(frame):
+            write_started.set()
+            resume_writes.wait(5)
+        flusher = WriteBackFlusher(write_frame,
+                                   lambda frame: None,
+                                   lambda: [],
+                                   thread_count=1,
+                                   queue_size=8,
+                                   write_frames=lambda frames: batches.append([frame.page_id for frame in frames]),
+                                   max_batch_size=4)
+        for page_id in range(0, 7):
+            frame = BufferFrame(0, 4096)
+            frame.page_id = page_id
+            flusher.submit(frame)
+            # The first write blocks the worker, so the other frames queue up
+            if page_id == 0:
+                self.assertTrue(write_started.wait(5))
+        resume_writes.set()
+        flusher.shutdown()
+
+        self.assertEqual(batches, [[1, 2, 3, 4], [5, 6]])
@@ -0,0 +1,25 @@
+import unittest
+
+from src.util.ReaderWriterLock import ReaderWriterLock
+
+class ReaderWriterLockTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def test_try_lock_shared_should_share_lock(self):
+        lock = ReaderWriterLock()
+        self.assertTrue(lock.try_lock_shared())
+        self.assertTrue(lock.try_lock_shared())
+        self.assertFalse(lock.try_lock_exclusive())
+        lock.release_shared()
+        lock.release_shared()
+        self.assertTrue(lock.try_lock_exclusive())
+
+    def test_try_lock_should_fail_while_locked_exclusive(self):
+        lock = ReaderWriterLock()
+        lock.lock_exclusive()
+        self.assertFalse(lock.try_lock_shared())
+        self.assertFalse(lock.try_lock_exclusive())
+        lock.release_exclusive()
+        self.assertTrue(lock.try_lock_shared())
+        lock.release_shared()